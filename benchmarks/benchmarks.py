@@ -0,0 +1,166 @@
+# Copyright (c) 2019,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY, DEPARTMENT OF
+# GEODESY AND GEOINFORMATION BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Benchmarks for pytileproj, run with airspeed velocity (asv).
+
+    asv run                       # benchmark the latest commit
+    asv continuous master HEAD    # compare two commits
+    asv compare <commit1> <commit2>
+
+The results are stored as JSON files in .asv/results.
+"""
+
+import numpy as np
+
+from pytileproj.utmgrid import UTMGrid
+from pytileproj.geometry import setup_test_geom_spitzbergen
+from pytileproj.geometry import setup_geom_kamchatka
+from pytileproj.geometry import setup_test_geom_siberia_antimeridian_180plus
+
+
+# grids are expensive to build, hence shared between the benchmarks
+_grids = dict()
+
+
+def get_grid(sampling):
+    """
+    returns a (cached) UTMGrid of the given sampling
+    """
+    if sampling not in _grids:
+        _grids[sampling] = UTMGrid(sampling)
+    return _grids[sampling]
+
+
+def random_lonlat(n_points, seed=42):
+    """
+    returns random lon-lat coordinates within the UTM zones
+    """
+    rng = np.random.RandomState(seed)
+    lon = rng.uniform(-179.9, 179.9, n_points)
+    lat = rng.uniform(-79.9, 83.9, n_points)
+    return lon, lat
+
+
+class GridConstruction(object):
+    """
+    Construction of the UTMGrid for the three tile codes
+    """
+
+    params = [500, 20, 10]
+    param_names = ['sampling']
+    timeout = 300
+
+    def time_construct_grid(self, sampling):
+        UTMGrid(sampling)
+
+
+class LonLat2XY(object):
+    """
+    Projection of lon-lat points to the grid
+    """
+
+    params = [1, 1000, 10000, 100000, 1000000]
+    param_names = ['n_points']
+    timeout = 1200
+
+    def setup(self, n_points):
+        self.grid = get_grid(500)
+        self.lon, self.lat = random_lonlat(n_points)
+
+    def time_lonlat2xy_scalar(self, n_points):
+        self.grid.lonlat2xy(14.1, 48.2)
+
+    def time_lonlat2xy(self, n_points):
+        self.grid.lonlat2xy(self.lon, self.lat)
+
+    def time_lonlat2xy_subgrid(self, n_points):
+        self.grid.lonlat2xy(self.lon, self.lat, subgrid='Z33N')
+
+    def time_lonlat2MGRS(self, n_points):
+        self.grid.lonlat2MGRS(self.lon, self.lat)
+
+
+class CreateTile(object):
+    """
+    Creation of tile objects
+    """
+
+    params = [('Z33N500M_E000N054T6', 500),
+              ('Z33N020M_E003N057T3', 20),
+              ('Z33N010M_E005N058T1', 10)]
+    param_names = ['tile']
+    timeout = 300
+
+    def setup(self, tile):
+        self.grid = get_grid(tile[1])
+
+    def time_create_tile(self, tile):
+        self.grid.create_tile(tile[0])
+
+    def time_create_tile_by_xy(self, tile):
+        self.grid.Z33N.tilesys.create_tile(x=559745, y=5852882)
+
+
+class SearchTilesInROI(object):
+    """
+    Search for tiles overlapping the test geometries
+    """
+
+    params = (['spitzbergen', 'kamchatka', 'siberia'], [500, 10])
+    param_names = ['roi', 'sampling']
+    timeout = 600
+
+    geometries = {'spitzbergen': setup_test_geom_spitzbergen,
+                  'kamchatka': setup_geom_kamchatka,
+                  'siberia': setup_test_geom_siberia_antimeridian_180plus}
+
+    def setup(self, roi, sampling):
+        self.grid = get_grid(sampling)
+        self.geometry = self.geometries[roi]()
+
+    def time_search_tiles_in_roi(self, roi, sampling):
+        self.grid.search_tiles_in_roi(self.geometry.Clone())
+
+    def track_n_tiles(self, roi, sampling):
+        return len(self.grid.search_tiles_in_roi(self.geometry.Clone()))
+
+
+class CongruentTiles(object):
+    """
+    Mapping of tiles between the tile codes
+    """
+
+    timeout = 300
+
+    def setup(self):
+        self.grid_500 = get_grid(500)
+        self.grid_10 = get_grid(10)
+        self.fine_tiles = self.grid_10.Z33N.tilesys.identify_tiles_overlapping_xybbox(
+            [0, 5400000, 600000, 6000000])
+
+    def time_congruent_tiles_to_finer(self):
+        self.grid_500.Z33N.tilesys.get_congruent_tiles_from_tilename(
+            'Z33N500M_E000N054T6', target_sampling=10)
+
+    def time_congruent_tiles_to_coarser(self):
+        self.grid_10.Z33N.tilesys.get_congruent_tiles_from_tilename(
+            'Z33N010M_E005N058T1', target_sampling=500)
+
+    def time_collect_congruent_tiles(self):
+        self.grid_10.Z33N.tilesys.collect_congruent_tiles(self.fine_tiles,
+                                                          target_sampling=500)
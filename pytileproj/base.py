@@ -34,14 +34,79 @@ Code for Tiled Projection Systems.
 
 import abc
 import math
+import operator
+import warnings
+from functools import lru_cache
 
 import numpy as np
 from osgeo import osr
 
 import pytileproj.geometry as ptpgeometry
+from pytileproj import cache
+from pytileproj.instrument import timed
+from pytileproj.tileset import TileSet
 import pyproj
 
 
+@lru_cache(maxsize=None)
+def get_transformer(src_crs, dst_crs):
+    """
+    Returns a (cached) pyproj transformer between two spatial references,
+    operating in the traditional lon-lat/x-y axis order.
+
+    Parameters
+    ----------
+    src_crs : str
+        spatial reference of the input coordinates,
+        e.g. a proj4-string or 'EPSG:4326'
+    dst_crs : str
+        spatial reference of the output coordinates,
+        e.g. a proj4-string or 'EPSG:4326'
+
+    Returns
+    -------
+    pyproj.Transformer
+        transformer from src_crs to dst_crs
+    """
+    return pyproj.Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
+
+# minimum number of tiles whose footprints are stored in the disk cache
+_FOOTPRINT_CACHE_MIN_TILES = 64
+
+# grids created by TiledProjectionSystem.get_cached(), by (class, sampling, tolerance)
+_grid_cache = dict()
+
+
+def _restore_grid(grid_class, sampling, tolerance):
+    """
+    Internal function: rebuilds a pickled grid (see TiledProjectionSystem.__reduce__)
+    """
+    return grid_class.get_cached(sampling, tolerance=tolerance)
+
+
+def _restore_subgrid(grid_class, sampling, tolerance, subgrid_id):
+    """
+    Internal function: rebuilds a pickled subgrid (see TiledProjection.__reduce__)
+    """
+    return grid_class.get_cached(sampling, tolerance=tolerance).subgrids[subgrid_id]
+
+
+def _restore_tilingsystem(grid_class, sampling, tolerance, subgrid_id):
+    """
+    Internal function: rebuilds a pickled tiling system (see TilingSystem.__reduce__)
+    """
+    return _restore_subgrid(grid_class, sampling, tolerance, subgrid_id).tilesys
+
+
+def _restore_tile(grid_class, sampling, tolerance, subgrid_id, name):
+    """
+    Internal function: rebuilds a pickled tile (see Tile.__reduce__)
+    """
+    tilesys = _restore_tilingsystem(grid_class, sampling, tolerance, subgrid_id)
+    return tilesys.create_tile(name=name)
+
+
 class TPSCoreProperty(object):
 
     """
@@ -50,8 +115,11 @@ class TPSCoreProperty(object):
     With this, core parameters are everywhere accessible via the same name.
     """
 
+    __slots__ = ('tag', 'projection', 'sampling', 'tiletype',
+                 'tile_xsize_m', 'tile_ysize_m', 'tolerance', 'grid_class')
+
     def __init__(self, tag, projection, sampling, tiletype,
-                 tile_xsize_m, tile_ysize_m):
+                 tile_xsize_m, tile_ysize_m, tolerance=None, grid_class=None):
         """
         Initialises a TPSCoreProperty.
 
@@ -70,6 +138,13 @@ class TPSCoreProperty(object):
             tile size in x direction defined for the grid's sampling
         tile_ysize_m :
             tile size in y direction defined for the grid's sampling
+        tolerance : float, optional
+            maximum deviation in metres of reprojected geometry edges
+            from their true course. if None, edges are segmentized
+            with fixed segment lengths.
+        grid_class : class, optional
+            class of the TiledProjectionSystem, used to rebuild the grid
+            e.g. when unpickling.
         """
 
         self.tag = tag
@@ -78,6 +153,35 @@ class TPSCoreProperty(object):
         self.tiletype = tiletype
         self.tile_xsize_m = tile_xsize_m
         self.tile_ysize_m = tile_ysize_m
+        self.tolerance = tolerance
+        self.grid_class = grid_class
+
+
+def _core_property(name):
+    """
+    Returns a read-only property giving access to an attribute of the core
+    properties of the owner, e.g. tile.sampling returns tile.core.sampling.
+    """
+    return property(operator.attrgetter('core.' + name),
+                    doc='{} of the core properties (read-only)'.format(name))
+
+
+class _CoreAccess(object):
+
+    """
+    Mixin providing read-only shortcuts to the core properties.
+    """
+
+    __slots__ = ()
+
+    tag = _core_property('tag')
+    projection = _core_property('projection')
+    sampling = _core_property('sampling')
+    tiletype = _core_property('tiletype')
+    tile_xsize_m = _core_property('tile_xsize_m')
+    tile_ysize_m = _core_property('tile_ysize_m')
+    tolerance = _core_property('tolerance')
+    grid_class = _core_property('grid_class')
 
 
 class TPSProjection():
@@ -169,7 +273,21 @@ class TPSProjection():
         return epsg
 
 
-class TiledProjectionSystem(object):
+def _merge_windows(windows, items):
+    """
+    Internal function: merges (tilename, window) items into the dictionary
+    of windows, with the union of the windows of the same tile.
+    """
+    for name, window in items:
+        if name in windows:
+            old = windows[name]
+            window = (min(old[0], window[0]), min(old[1], window[1]),
+                      max(old[2], window[2]), max(old[3], window[3]))
+        windows[name] = window
+    return windows
+
+
+class TiledProjectionSystem(_CoreAccess):
 
     __metaclass__ = abc.ABCMeta
 
@@ -183,7 +301,7 @@ class TiledProjectionSystem(object):
     # supported grid spacing ( = the pixel sampling)
     _static_sampling = [1]
 
-    def __init__(self, sampling, tag='TPS'):
+    def __init__(self, sampling, tag='TPS', tolerance=None):
         """
         Initialises a TiledProjectionSystem().
 
@@ -194,26 +312,85 @@ class TiledProjectionSystem(object):
         tag : str
             identifier of the object holding the TPSCoreProperty
             e.g. 'EU' or 'Equi7'.
+        tolerance : float, optional
+            maximum deviation in metres of reprojected geometry edges
+            from their true course, e.g. of the subgrid and tile polygons.
+            if None (default), fixed segment lengths are used.
         """
 
         tiletype = self.get_tiletype(sampling)
         tile_xsize_m, tile_ysize_m = self.get_tilesize(sampling)
 
         self.core = TPSCoreProperty(
-            tag, None, sampling, tiletype, tile_xsize_m, tile_ysize_m)
+            tag, None, sampling, tiletype, tile_xsize_m, tile_ysize_m,
+            tolerance=tolerance, grid_class=self.__class__)
 
         self.subgrids = self.define_subgrids()
 
+        # the subgrids and their tiling systems refer to their grid
+        for subgrid in self.subgrids.values():
+            subgrid.grid = self
+            if isinstance(subgrid.tilesys, TilingSystem):
+                subgrid.tilesys.grid = self
+
     def __getattr__(self, item):
         '''
-        short link for items of subgrids and core
+        short link for the subgrids, e.g. grid.Z33N
         '''
-        if item in self.subgrids:
-            return self.subgrids[item]
-        elif item in self.core.__dict__:
-            return self.core.__dict__[item]
+        # the instance's dictionary is used directly, as this is also called
+        # before subgrids are set (e.g. while unpickling)
+        subgrids = self.__dict__.get('subgrids', {})
+        if item in subgrids:
+            return subgrids[item]
         else:
-            return self.__dict__[item]
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, item))
+
+
+    def __reduce__(self):
+        """
+        pickles the grid by its definition, which is rebuilt (once per process)
+        by get_cached() when unpickled.
+        """
+        return (_restore_grid, (self.__class__, self.core.sampling, self.core.tolerance))
+
+
+    @classmethod
+    def get_cached(cls, sampling, tolerance=None):
+        """
+        Returns a grid of the given definition, which is created only once
+        per process and shared afterwards (see clear_cached()).
+
+        Parameters
+        ----------
+        sampling : int
+            the grid sampling = size of pixels; in metres.
+        tolerance : float, optional
+            see __init__()
+
+        Returns
+        -------
+        TiledProjectionSystem
+        """
+        key = (cls, sampling, tolerance)
+        if key not in _grid_cache:
+            # grids without a tolerance may not support the argument
+            if tolerance is None:
+                _grid_cache[key] = cls(sampling)
+            else:
+                _grid_cache[key] = cls(sampling, tolerance=tolerance)
+        return _grid_cache[key]
+
+
+    @classmethod
+    def clear_cached(cls):
+        """
+        Releases the grids of this class (and its subclasses)
+        created by get_cached().
+        """
+        for key in list(_grid_cache.keys()):
+            if issubclass(key[0], cls):
+                del _grid_cache[key]
 
 
     @abc.abstractmethod
@@ -221,6 +398,7 @@ class TiledProjectionSystem(object):
         pass
 
 
+    @timed('locate_geometry_in_subgrids', vertices='args')
     def locate_geometry_in_subgrids(self, geometry):
         """
         finds overlapping subgrids of given geometry.
@@ -251,6 +429,7 @@ class TiledProjectionSystem(object):
 
         return covering_subgrid
 
+    @timed('lonlat2xy', vertices=None)
     def lonlat2xy(self, lon, lat, subgrid=None):
         """
         converts latitude and longitude coordinates to TPS grid coordinates
@@ -338,15 +517,201 @@ class TiledProjectionSystem(object):
             TPS grid coordinates
         """
 
-        # set up spatial references
-        p_grid = pyproj.Proj(self.subgrids[subgrid].core.projection.proj4)
-        p_geo = pyproj.Proj(init="EPSG:4326")
-
-        x, y, = pyproj.transform(p_geo, p_grid, lon, lat)
+        proj4 = self.subgrids[subgrid].core.projection.proj4
+        x, y = get_transformer('EPSG:4326', proj4).transform(lon, lat)
 
         return subgrid, x, y
 
 
+    @timed('xy2lonlat', vertices=None)
+    def xy2lonlat(self, subgrid_ids, x, y):
+        """
+        converts TPS grid coordinates of (possibly) different subgrids
+        to longitude and latitude coordinates.
+        The coordinates are grouped by subgrid, transformed with one
+        (cached) transformer per subgrid and returned in the input order.
+
+        Parameters
+        ----------
+        subgrid_ids : str or list of str
+            subgrid ID(s) in which the coordinates are defined,
+            broadcast against x and y
+        x : number or list of numbers
+            projected x coordinate(s) in metres
+        y : number or list of numbers
+            projected y coordinate(s) in metres
+
+        Returns
+        -------
+        lon, lat : numpy.ndarray
+            longitude and latitude coordinates, in the broadcast shape
+            of the input
+
+        Raises
+        ------
+        ValueError
+            if a subgrid ID is not part of the grid
+        """
+        subgrid_ids, x, y = np.broadcast_arrays(np.asarray(subgrid_ids, dtype=str),
+                                                np.asarray(x, dtype=np.float64),
+                                                np.asarray(y, dtype=np.float64))
+        valid_ids = np.array(sorted(self.subgrids.keys()))
+        codes = np.searchsorted(valid_ids, subgrid_ids).clip(max=len(valid_ids) - 1)
+        unknown = valid_ids[codes] != subgrid_ids
+        if np.any(unknown):
+            raise ValueError('unknown subgrid IDs: {}'.format(
+                ', '.join(sorted(set(subgrid_ids[unknown].tolist())))))
+
+        lon, lat = self._transform_per_subgrid(valid_ids, codes, x, y, to_geog=True)
+        return lon, lat
+
+
+    def _transform_per_subgrid(self, subgrid_ids, codes, u, v, to_geog):
+        """
+        Internal function: transforms coordinates between lon-lat and
+        the projections of their subgrids, with one transformation per subgrid.
+
+        Parameters
+        ----------
+        subgrid_ids : list of str
+            subgrid IDs referenced by codes
+        codes : numpy.ndarray
+            index of the subgrid (in subgrid_ids) of each coordinate
+        u, v : numpy.ndarray
+            input coordinates, in the shape of codes
+        to_geog : bool
+            True for projected -> lon-lat, False for lon-lat -> projected
+
+        Returns
+        -------
+        u, v : numpy.ndarray
+            transformed coordinates, in the shape of codes
+        """
+        flat_codes = np.asarray(codes).reshape(-1)
+        u = np.asarray(u, dtype=np.float64).reshape(-1)
+        v = np.asarray(v, dtype=np.float64).reshape(-1)
+        out_u = np.empty(len(flat_codes), dtype=np.float64)
+        out_v = np.empty(len(flat_codes), dtype=np.float64)
+
+        order = np.argsort(flat_codes, kind='stable')
+        sorted_codes = flat_codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) \
+            if len(order) else np.array([], dtype=np.intp)
+        bounds = np.append(starts, len(order))
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            points = order[start:stop]
+            proj4 = self.subgrids[subgrid_ids[sorted_codes[start]]].core.projection.proj4
+            if to_geog:
+                transformer = get_transformer(proj4, 'EPSG:4326')
+            else:
+                transformer = get_transformer('EPSG:4326', proj4)
+            out_u[points], out_v[points] = transformer.transform(u[points], v[points])
+
+        shape = np.shape(codes)
+        return out_u.reshape(shape), out_v.reshape(shape)
+
+
+    def _check_subgrid_ids(self, *subgrid_ids):
+        """
+        Internal function: raises a ValueError for subgrid IDs not part of the grid.
+        """
+        unknown = [s for s in subgrid_ids if s not in self.subgrids]
+        if unknown:
+            raise ValueError('unknown subgrid IDs: {}'.format(', '.join(unknown)))
+
+
+    @timed('transfer_xy', vertices=None)
+    def transfer_xy(self, src_subgrid, dst_subgrid, x, y):
+        """
+        converts TPS grid coordinates of one subgrid to the projection of
+        another subgrid (e.g. of a neighbouring zone), with one direct and
+        (cached) transformation, i.e. without the detour via lon-lat.
+
+        Parameters
+        ----------
+        src_subgrid : str
+            subgrid ID in which the coordinates are defined
+        dst_subgrid : str
+            subgrid ID to which the coordinates are transferred
+        x : number or list of numbers
+            projected x coordinate(s) in metres
+        y : number or list of numbers
+            projected y coordinate(s) in metres
+
+        Returns
+        -------
+        x, y : numpy.ndarray
+            projected coordinates in the target subgrid
+            (can be outlying or negative!)
+
+        Raises
+        ------
+        ValueError
+            if a subgrid ID is not part of the grid
+        """
+        self._check_subgrid_ids(src_subgrid, dst_subgrid)
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64),
+                                   np.asarray(y, dtype=np.float64))
+        if src_subgrid == dst_subgrid:
+            return x.copy(), y.copy()
+
+        transformer = get_transformer(self.subgrids[src_subgrid].core.projection.proj4,
+                                      self.subgrids[dst_subgrid].core.projection.proj4)
+        x, y = transformer.transform(x, y)
+        return np.asarray(x), np.asarray(y)
+
+
+    def transfer_xy2ij_in_tile(self, src_subgrid, dst_subgrid, x, y, lowerleft=False):
+        """
+        converts TPS grid coordinates of one subgrid to the tiles of another
+        subgrid, and finds the tiles and the pixel indices (i, j) there,
+        vectorised over many coordinates.
+
+        columns go from left to right (easting)
+        rows go either
+            top to bottom (lowerleft=False)
+            bottom to top (lowerleft=True)
+
+        Parameters
+        ----------
+        src_subgrid : str
+            subgrid ID in which the coordinates are defined
+        dst_subgrid : str
+            subgrid ID to which the coordinates are transferred
+        x : number or list of numbers
+            projected x coordinate(s) in metres
+        y : number or list of numbers
+            projected y coordinate(s) in metres
+        lowerleft : bool, optional
+            should the row numbering start at the bottom?
+            If yes, it returns lowerleft indices.
+
+        Returns
+        -------
+        tilenames : numpy.ndarray
+            long form of the tilenames (in the target subgrid)
+            containing the coordinates. Tiles outside the subgrid's
+            coverage are not excluded.
+        i, j : numpy.ndarray
+            pixel column and row numbers; start with 0
+        """
+        x, y = self.transfer_xy(src_subgrid, dst_subgrid, x, y)
+        xsize, ysize = self.core.tile_xsize_m, self.core.tile_ysize_m
+        sampling = self.core.sampling
+
+        llx = np.floor(x / xsize).astype(np.int64) * xsize
+        lly = np.floor(y / ysize).astype(np.int64) * ysize
+        i = np.floor((x - llx) / sampling).astype(np.int64)
+        if lowerleft:
+            j = np.floor((y - lly) / sampling).astype(np.int64)
+        else:
+            j = np.floor((lly + ysize - y) / sampling).astype(np.int64)
+
+        tilenames = self.encode_tilenames(np.full(x.size, dst_subgrid),
+                                          llx.reshape(-1), lly.reshape(-1))
+        return np.array(tilenames, dtype=str).reshape(x.shape), i, j
+
+
     @abc.abstractmethod
     def create_tile(self, name):
         pass
@@ -390,6 +755,48 @@ class TiledProjectionSystem(object):
         return self.create_tile(tilename).bbox_proj
 
 
+    def decode_tilenames(self, tilenames):
+        """
+        returns the subgrid IDs and lower-left coordinates of tiles
+
+        Parameters
+        ----------
+        tilenames : list of str
+            names of the tiles in longform
+
+        Returns
+        -------
+        subgrid_ids : numpy.ndarray
+            subgrid IDs of the tiles
+        llx, lly : numpy.ndarray
+            lower-left coordinates of the tiles
+        """
+        tiles = [self.create_tile(name) for name in tilenames]
+        return (np.array([t.core.tag for t in tiles], dtype=str),
+                np.array([t.llx for t in tiles], dtype=np.int64),
+                np.array([t.lly for t in tiles], dtype=np.int64))
+
+
+    def encode_tilenames(self, subgrid_ids, llx, lly):
+        """
+        returns the names of tiles
+
+        Parameters
+        ----------
+        subgrid_ids : array_like of str
+            subgrid IDs of the tiles
+        llx, lly : array_like of int
+            lower-left coordinates of the tiles
+
+        Returns
+        -------
+        list of str
+            names of the tiles in longform
+        """
+        return [self.subgrids[s].tilesys._encode_tilename(int(x), int(y))
+                for s, x, y in zip(subgrid_ids, llx, lly)]
+
+
     @abc.abstractmethod
     def get_tiletype(self, sampling=None):
         pass
@@ -413,21 +820,126 @@ class TiledProjectionSystem(object):
         pass
 
 
+    def export_tiles(self, fname, format='flatgeobuf', subgrid_ids=None,
+                     batch_size=10000, spatial_index=False):
+        """
+        Writes the footprints (in the lon-lat-space) of all tiles of the grid
+        to a single layer of a vector file, with the attributes
+        name, subgrid, llx, lly, lonmin, latmin, lonmax, latmax, covers_land.
+        covers_land is -1 if the static data holds no land information.
+
+        The tiles are processed subgrid by subgrid in batches, and the
+        features are streamed to the file, hence the memory stays bounded.
+        This requires skipping the spatial index (the default), as e.g. the
+        FlatGeobuf driver holds all features in memory to build it.
+
+        Parameters
+        ----------
+        fname : str
+            full path of the output file name; an existing file is overwritten
+        format : str, optional
+            format name; one of 'flatgeobuf' (default), 'geoparquet',
+            'geopackage', 'geojson', 'shapefile'
+        subgrid_ids : string or list of strings, optional
+            subgrid IDs to export. default is None for all subgrids.
+        batch_size : int, optional
+            number of tiles for which the footprints are computed at once.
+            default is 10000.
+        spatial_index : bool, optional
+            if True, a spatial index is written (for the formats supporting
+            it, see geometry.write_features()), which needs memory for all
+            tiles. default is False.
+
+        Returns
+        -------
+        int
+            number of written tiles
+        """
+
+        if subgrid_ids is None:
+            subgrid_ids = self.subgrids.keys()
+        if isinstance(subgrid_ids, str):
+            subgrid_ids = [subgrid_ids]
+
+        fields = [('name', 'str'), ('subgrid', 'str'), ('llx', 'int'), ('lly', 'int'),
+                  ('lonmin', 'float'), ('latmin', 'float'),
+                  ('lonmax', 'float'), ('latmax', 'float'),
+                  ('covers_land', 'int')]
+
+        features = self._iter_tile_features(subgrid_ids, batch_size)
+
+        return ptpgeometry.write_features(fname, features, fields,
+                                          ptpgeometry.get_geog_spatial_ref(),
+                                          format=format, layer_name=self.core.tag,
+                                          spatial_index=spatial_index)
+
+
+    def _iter_tile_features(self, subgrid_ids, batch_size):
+        """
+        Internal generator: yields the footprints and attributes of all tiles
+        of the given subgrids, computed in batches.
+
+        Parameters
+        ----------
+        subgrid_ids : list of strings
+            subgrid IDs
+        batch_size : int
+            number of tiles for which the footprints are computed at once.
+
+        Returns
+        -------
+        generator
+            yielding tuples of (OGRGeometry, dict)
+        """
+
+        for sgrid_id in subgrid_ids:
+            tilesys = self.subgrids[sgrid_id].tilesys
+            llx, lly = tilesys.identify_tiles_in_subgrid()
+            has_land_data = tilesys.has_land_data
+
+            for start in range(0, len(llx), batch_size):
+                batch_llx = llx[start:start + batch_size]
+                batch_lly = lly[start:start + batch_size]
+                polygons, bboxes = tilesys.get_tiles_footprint_geog(
+                    batch_llx, batch_lly, as_geometry=True)
+
+                for x, y, polygon, bbox in zip(batch_llx, batch_lly, polygons, bboxes):
+                    name = tilesys._encode_tilename(x, y)
+                    attributes = {'name': name, 'subgrid': sgrid_id,
+                                  'llx': int(x), 'lly': int(y),
+                                  'lonmin': bbox[0], 'latmin': bbox[1],
+                                  'lonmax': bbox[2], 'latmax': bbox[3],
+                                  'covers_land': -1}
+                    if has_land_data:
+                        attributes['covers_land'] = int(tilesys.check_tile_covers_land(name))
+                    yield polygon, attributes
+
+
+    @timed('search_tiles_in_roi', vertices=None)
     def search_tiles_in_roi(self,
                             roi_geometry=None,
                             bbox=None,
                             points=None,
                             osr_spref=None,
                             subgrid_ids=None,
-                            coverland=False):
+                            coverland=False,
+                            batch_size=1000,
+                            min_coverage=None,
+                            as_tileset=False,
+                            sort=None,
+                            return_windows=False,
+                            rasterize=False,
+                            use_cache=False):
 
         """
         Search the tiles of the grid which intersect by the given area.
 
         Parameters
         ----------
-        roi_geometry : geometry
-            a polygon or multipolygon geometry object representing the ROI
+        roi_geometry : geometry or iterable
+            a polygon or multipolygon geometry object representing the ROI,
+            or an iterable of geometries or of tuples (geometry, attributes),
+            e.g. as yielded by geometry.iter_geometries()
         bbox : list
             a list of coordinate-tuples representing a rectangle-shape
             region-of-interest in the format of
@@ -443,10 +955,38 @@ class TiledProjectionSystem(object):
             Default value is None for searching all subgrids.
         coverland : Boolean
             option to search for tiles covering land at any point in the tile
+        batch_size : int, optional
+            if roi_geometry is an iterable: number of geometries that are
+            searched together. default is 1000.
+        min_coverage : float, optional
+            if given, only tiles with a land fraction of at least
+            min_coverage (0.0 ... 1.0) are returned. requires the land
+            information in the static data, raises a ValueError otherwise.
+        as_tileset : bool, optional
+            if True, the tiles are returned as TileSet. default is False.
+        sort : str, optional
+            'hilbert' or 'morton' to order the tiles per subgrid along the
+            space-filling curve, which keeps neighbouring tiles together
+            (see TileSet.partition()). default is None for an arbitrary order.
+        return_windows : bool, optional
+            if True, the tight pixel windows of the tiles covering the ROI
+            are computed, and returned as dictionary name -> window, with
+            window as (xmin, ymin, xmax, ymax) in pixels (see
+            Tile.active_subset_px), or as the subsets of the TileSet.
+            not available for an iterable of geometries. default is False.
+        rasterize : bool, optional
+            if True, the windows are fitted to the pixels (centres) within
+            the rasterized ROI, and tiles without such pixels are dropped.
+            default is False for windows from the ROI's envelope per tile.
+        use_cache : bool, optional
+            if True, the found tilenames are stored in the disk cache
+            (see pytileproj.cache) and taken from there when the same ROI
+            is searched again, e.g. by another process. not available for
+            an iterable of geometries and return_windows. default is False.
 
         Returns
         -------
-        list
+        list, dict or TileSet
             return a list of  the overlapped tiles' name.
             If not found, return empty list.
         """
@@ -467,6 +1007,18 @@ class TiledProjectionSystem(object):
                   "as the region-of-interest!")
             return list()
 
+        # switch for ROI defined by a stream of geometries
+        if roi_geometry is not None and not hasattr(roi_geometry, 'GetGeometryName'):
+            if return_windows:
+                raise ValueError('return_windows is not available for an '
+                                 'iterable of geometries!')
+            tiles = self._search_tiles_in_roi_iterable(roi_geometries=roi_geometry,
+                                                       subgrid_ids=subgrid_ids,
+                                                       coverland=coverland,
+                                                       batch_size=batch_size,
+                                                       min_coverage=min_coverage)
+            return self._finalize_search(tiles, as_tileset, sort)
+
 
         # obtain the ROI
         if roi_geometry is None:
@@ -479,19 +1031,33 @@ class TiledProjectionSystem(object):
                 roi_geometry = ptpgeometry.points2geometry(points, osr_spref)
 
             elif bbox is not None:
-                roi_geometry = ptpgeometry.bbox2polygon(bbox, osr_spref, segment=0.5)
+                # the adaptive reprojection does not need a pre-segmentized bbox
+                segment = 0.5 if self.core.tolerance is None else None
+                roi_geometry = ptpgeometry.bbox2polygon(bbox, osr_spref, segment=segment)
+
+        # recurring ROIs are taken from the disk cache
+        cache_name = None
+        if use_cache and not return_windows:
+            cache_name = self._get_roi_cache_name(roi_geometry, subgrid_ids,
+                                                  coverland, min_coverage)
+            tiles = cache.load_array(cache_name)
+            if tiles is not None:
+                return self._finalize_search(tiles.tolist(), as_tileset, sort)
 
         # switch for ROI defined by a single polygon or point(s)
         if roi_geometry.GetGeometryName() in ['POLYGON', 'MULTIPOINT', 'POINT']:
 
             tiles = self._search_tiles_in_roi(roi_geometry=roi_geometry,
                                               subgrid_ids=subgrid_ids,
-                                              coverland=coverland)
+                                              coverland=coverland,
+                                              min_coverage=min_coverage,
+                                              return_windows=return_windows,
+                                              rasterize=rasterize)
 
         # switch for ROI defined by multiple polygons
         if roi_geometry.GetGeometryName() == 'MULTIPOLYGON':
 
-            tiles = []
+            tiles = dict() if return_windows else []
 
             # search tiles for each polygon individually
             for i_polygon in list(range(roi_geometry.GetGeometryCount())):
@@ -500,20 +1066,68 @@ class TiledProjectionSystem(object):
 
                 i_tiles = self._search_tiles_in_roi(roi_geometry=geometry,
                                                     subgrid_ids=subgrid_ids,
-                                                    coverland=coverland)
+                                                    coverland=coverland,
+                                                    min_coverage=min_coverage,
+                                                    return_windows=return_windows,
+                                                    rasterize=rasterize)
 
-                tiles += i_tiles
+                if return_windows:
+                    _merge_windows(tiles, i_tiles.items())
+                else:
+                    tiles += i_tiles
 
             # reduce to unique list of tiles
-            tiles = list(set(tiles))
+            if not return_windows:
+                tiles = list(set(tiles))
+
+        if cache_name is not None:
+            cache.save_array(cache_name, np.array(tiles, dtype=str))
+
+        return self._finalize_search(tiles, as_tileset, sort)
 
-        return tiles
+
+    def _get_roi_cache_name(self, roi_geometry, subgrid_ids, coverland, min_coverage):
+        """
+        Internal function: returns the name of the search result for
+        an ROI in the disk cache, see search_tiles_in_roi().
+        """
+        osr_spref = roi_geometry.GetSpatialReference()
+        spref_wkt = '' if osr_spref is None else osr_spref.ExportToWkt()
+        return 'roi_{}{}_{}'.format(
+            self.core.tag, self.core.sampling,
+            cache.get_cache_key(bytes(roi_geometry.ExportToWkb()), spref_wkt,
+                                self.__class__.__name__, self.core.tolerance,
+                                ','.join(sorted(subgrid_ids)), coverland, min_coverage))
+
+
+    def _finalize_search(self, tiles, as_tileset, sort):
+        """
+        Internal function: orders the found tilenames (or the dictionary
+        name -> window) and converts them to a TileSet, if requested.
+        """
+        if not as_tileset and sort is None:
+            return tiles
+        if isinstance(tiles, dict):
+            tileset = TileSet.from_tilenames(self, list(tiles.keys()))
+            tileset.subsets[:] = np.array(list(tiles.values()), dtype=np.int32).reshape(-1, 4)
+        else:
+            tileset = TileSet.from_tilenames(self, tiles)
+        if sort is not None:
+            tileset = tileset.sort(curve=sort)
+        if as_tileset:
+            return tileset
+        if isinstance(tiles, dict):
+            return dict((name, tiles[name]) for name in tileset.tilenames)
+        return tileset.tilenames
 
 
     def _search_tiles_in_roi(self,
                              roi_geometry=None,
                              subgrid_ids=None,
-                             coverland=False):
+                             coverland=False,
+                             min_coverage=None,
+                             return_windows=False,
+                             rasterize=False):
         """
         Internal function: Search the tiles of the grid which intersect by the given area.
 
@@ -527,17 +1141,73 @@ class TiledProjectionSystem(object):
             Default value is None for searching all subgrids.
         coverland : Boolean
             option to search for tiles covering land at any point in the tile
+        min_coverage : float, optional
+            minimum land fraction of the returned tiles.
+        return_windows : bool, optional
+            if True, the pixel windows of the tiles covering the ROI
+            are returned as well.
+        rasterize : bool, optional
+            if True, the windows are fitted to the rasterized ROI.
 
         Returns
         -------
-        list
-            return a list of  the overlapped tiles' name.
+        list or dict
+            return a list of  the overlapped tiles' name,
+            or a dictionary name -> window if return_windows is True.
             If not found, return empty list.
         """
 
         # load lat-lon spatial reference as the default
         geog_sr = TPSProjection(epsg=4326).osr_spref
 
+        roi_geometry = self._transform_roi_to_geog(roi_geometry)
+
+        if roi_geometry.GetGeometryName() == 'MULTIPOLYGON':
+            roi_polygons = []
+            for i in range(roi_geometry.GetGeometryCount()):
+                poly = roi_geometry.GetGeometryRef(i).Clone()
+                poly.AssignSpatialReference(geog_sr)
+                roi_polygons.append(poly)
+        else:
+            roi_polygons = [roi_geometry]
+
+        overlapped_tiles = list()
+        for roi_polygon in roi_polygons:
+            # intersect the given grid ids and the overlapped ids
+            overlapped_grids = self.locate_geometry_in_subgrids(roi_polygon)
+            subgrid_ids = list(set(subgrid_ids) & set(overlapped_grids))
+
+            # finding tiles
+            for sgrid_id in subgrid_ids:
+                overlapped_tiles.extend(self.subgrids[sgrid_id].search_tiles_over_geometry(
+                                                                roi_polygon, coverland=coverland,
+                                                                min_coverage=min_coverage,
+                                                                return_windows=return_windows,
+                                                                rasterize=rasterize))
+        if return_windows:
+            return _merge_windows(dict(), overlapped_tiles)
+        return list(set(overlapped_tiles))
+
+
+    def _transform_roi_to_geog(self, roi_geometry):
+        """
+        Internal function: transforms a ROI geometry to the lon-lat-space.
+        A geometry without spatial reference is taken as given in lon-lat.
+
+        Parameters
+        ----------
+        roi_geometry : geometry
+            a point or polygon geometry object representing the ROI
+
+        Returns
+        -------
+        geometry
+            the ROI geometry in the lon-lat-space
+        """
+
+        # load lat-lon spatial reference as the default
+        geog_sr = TPSProjection(epsg=4326).osr_spref
+
         geom_sr = roi_geometry.GetSpatialReference()
         if geom_sr is None:
             roi_geometry.AssignSpatialReference(geog_sr)
@@ -549,31 +1219,112 @@ class TiledProjectionSystem(object):
                 max_segment = 50000
             else:
                 raise Warning('Please check unit of geometry before reprojection!')
-            roi_geometry = ptpgeometry.transform_geometry(roi_geometry, geog_sr, segment=max_segment)
+            roi_geometry = ptpgeometry.transform_geometry(roi_geometry, geog_sr,
+                                                          segment=max_segment,
+                                                          tolerance=self.core.tolerance)
 
-        if roi_geometry.GetGeometryName() == 'MULTIPOLYGON':
-            roi_polygons = []
-            for i in range(roi_geometry.GetGeometryCount()):
-                poly = roi_geometry.GetGeometryRef(i).Clone()
-                poly.AssignSpatialReference(geog_sr)
-                roi_polygons.append(poly)
+        return roi_geometry
+
+
+    def _search_tiles_in_roi_iterable(self,
+                                      roi_geometries,
+                                      subgrid_ids=None,
+                                      coverland=False,
+                                      batch_size=1000,
+                                      min_coverage=None):
+        """
+        Internal function: Search the tiles of the grid which intersect
+        with any of the given geometries, processing them in batches.
+
+        Parameters
+        ----------
+        roi_geometries : iterable
+            yielding point or polygon geometries, or tuples of
+            (geometry, attributes)
+        subgrid_ids : list of strings
+            subgrid IDs to search in.
+        coverland : Boolean
+            option to search for tiles covering land at any point in the tile
+        min_coverage : float, optional
+            minimum land fraction of the returned tiles.
+        batch_size : int, optional
+            number of geometries that are searched together. default is 1000.
+
+        Returns
+        -------
+        list
+            return a list of  the overlapped tiles' name.
+            If not found, return empty list.
+        """
+
+        tiles = set()
+        batch = list()
+
+        for item in roi_geometries:
+            geometry = item[0] if isinstance(item, tuple) else item
+            batch.append(self._transform_roi_to_geog(geometry))
+
+            if len(batch) == batch_size:
+                tiles.update(self._search_tiles_in_roi_batch(batch, subgrid_ids, coverland,
+                                                             min_coverage))
+                batch = list()
+
+        if len(batch) > 0:
+            tiles.update(self._search_tiles_in_roi_batch(batch, subgrid_ids, coverland,
+                                                         min_coverage))
+
+        return list(tiles)
+
+
+    def _search_tiles_in_roi_batch(self, geometries, subgrid_ids, coverland,
+                                   min_coverage=None):
+        """
+        Internal function: Search the tiles of the grid which intersect
+        with any of the given geometries. The subgrids overlapping the
+        batch are located only once, using the envelope of all polygons,
+        and each of them is searched once for the whole batch.
+
+        Parameters
+        ----------
+        geometries : list of geometries
+            point or polygon geometries in the lon-lat-space
+        subgrid_ids : list of strings
+            subgrid IDs to search in.
+        coverland : Boolean
+            option to search for tiles covering land at any point in the tile
+        min_coverage : float, optional
+            minimum land fraction of the returned tiles.
+
+        Returns
+        -------
+        set
+            names of the overlapped tiles.
+        """
+
+        polygonal = all([g.GetGeometryName() in ['POLYGON', 'MULTIPOLYGON']
+                         for g in geometries])
+
+        # reduce the subgrids to those overlapping the envelope of the batch
+        if polygonal:
+            envelopes = np.array([g.GetEnvelope() for g in geometries])
+            bbox = [(envelopes[:, 0].min(), envelopes[:, 2].min()),
+                    (envelopes[:, 1].max(), envelopes[:, 3].max())]
+            geog_sr = TPSProjection(epsg=4326).osr_spref
+            envelope = ptpgeometry.bbox2polygon(bbox, geog_sr, segment=0.5)
+            batch_subgrid_ids = list(set(subgrid_ids) &
+                                     set(self.locate_geometry_in_subgrids(envelope)))
         else:
-            roi_polygons = [roi_geometry]
+            batch_subgrid_ids = subgrid_ids
 
-        overlapped_tiles = list()
-        for roi_polygon in roi_polygons:
-            # intersect the given grid ids and the overlapped ids
-            overlapped_grids = self.locate_geometry_in_subgrids(roi_polygon)
-            subgrid_ids = list(set(subgrid_ids) & set(overlapped_grids))
+        tiles = set()
+        for sgrid_id in batch_subgrid_ids:
+            tiles.update(self.subgrids[sgrid_id]._search_tiles_over_geometries(
+                geometries, coverland=coverland, min_coverage=min_coverage))
 
-            # finding tiles
-            for sgrid_id in subgrid_ids:
-                overlapped_tiles.extend(self.subgrids[sgrid_id].search_tiles_over_geometry(
-                                                                roi_polygon, coverland=coverland))
-        return list(set(overlapped_tiles))
+        return tiles
 
 
-class TiledProjection(object):
+class TiledProjection(_CoreAccess):
 
     """
     Class holding the projection and tiling definition of a
@@ -609,9 +1360,9 @@ class TiledProjection(object):
         """
 
         self.core = core
-        self.polygon_geog = ptpgeometry.segmentize_geometry(polygon_geog, segment=0.5)
-        self.polygon_proj = ptpgeometry.transform_geometry(
-            self.polygon_geog, self.core.projection.osr_spref)
+        # the grid holding the subgrid, set by the grid
+        self.grid = None
+        self.polygon_geog, self.polygon_proj = self._load_polygons(polygon_geog)
         self.bbox_proj = ptpgeometry.get_geometry_envelope(
             self.polygon_proj, rounding=self.core.sampling)
 
@@ -624,14 +1375,52 @@ class TiledProjection(object):
             tilingsystem = GlobalTile(self.core, 'TG', self.get_bbox_proj())
         self.tilesys = tilingsystem
 
-    def __getattr__(self, item):
-        '''
-        short link for items of core
-        '''
-        if item in self.core.__dict__:
-            return self.core.__dict__[item]
+    def _load_polygons(self, polygon_geog):
+        """
+        Internal function: returns the (segmentized) extent of the subgrid
+        in the lon-lat-space and its projection, taken from the disk cache
+        (see pytileproj.cache) if computed before.
+
+        Parameters
+        ----------
+        polygon_geog : OGRGeometry
+            geometry defining the extent/outline of the subgrid
+
+        Returns
+        -------
+        polygon_geog, polygon_proj : OGRGeometry
+            extent of the subgrid in the lon-lat-space and in the projection
+        """
+        name = 'subgrid_{}_{}'.format(
+            self.core.tag, cache.get_cache_key(bytes(polygon_geog.ExportToWkb()),
+                                               self.core.projection.proj4,
+                                               self.core.tolerance))
+        geog_spref = polygon_geog.GetSpatialReference()
+        polygon_geog_cached = cache.load_geometry(name + '_geog', osr_spref=geog_spref)
+        polygon_proj = cache.load_geometry(name + '_proj',
+                                           osr_spref=self.core.projection.osr_spref)
+        if polygon_geog_cached is not None and polygon_proj is not None:
+            return polygon_geog_cached, polygon_proj
+
+        if self.core.tolerance is None:
+            polygon_geog = ptpgeometry.segmentize_geometry(polygon_geog, segment=0.5)
         else:
-            return self.__dict__[item]
+            polygon_geog = polygon_geog.Clone()
+        polygon_proj = ptpgeometry.transform_geometry(
+            polygon_geog, self.core.projection.osr_spref,
+            tolerance=self.core.tolerance)
+
+        cache.save_geometry(name + '_geog', polygon_geog)
+        cache.save_geometry(name + '_proj', polygon_proj)
+        return polygon_geog, polygon_proj
+
+    def __reduce__(self):
+        """
+        pickles the subgrid by its grid's definition and its ID (=tag),
+        the grid is rebuilt (once per process) when unpickled.
+        """
+        return (_restore_subgrid, (self.core.grid_class, self.core.sampling,
+                                   self.core.tolerance, self.core.tag))
 
 
     def get_bbox_geog(self):
@@ -681,16 +1470,14 @@ class TiledProjection(object):
             latitude coordinate(s)
 
         """
-        # set up spatial references
-        p_grid = pyproj.Proj(self.core.projection.proj4)
-        p_geo = pyproj.Proj(init="EPSG:4326")
-
-        lon, lat = pyproj.transform(p_grid, p_geo, x, y)
+        lon, lat = get_transformer(self.core.projection.proj4, 'EPSG:4326').transform(x, y)
 
         return lon, lat
 
 
-    def search_tiles_over_geometry(self, geometry, coverland=True):
+    @timed('search_tiles_over_geometry', vertices='args')
+    def search_tiles_over_geometry(self, geometry, coverland=False, min_coverage=None,
+                                   return_windows=False, rasterize=False):
         """
         Search tiles of the subgrid that are overlapping with the geometry.
 
@@ -699,17 +1486,34 @@ class TiledProjection(object):
         geometry : OGRGeometry
             A point or polygon geometry representing the region of interest.
         coverland : Boolean
-            option to search for tiles covering land at any point in the tile
+            option to search for tiles covering land at any point in the tile.
+            ignored with a warning if the static data holds no land information.
+            default is False.
+        min_coverage : float, optional
+            option to search only for tiles with a land fraction of at least
+            min_coverage (0.0 ... 1.0).
+            raises a ValueError if the static data holds no land information.
+        return_windows : bool, optional
+            if True, the pixel windows of the tiles covering the geometry
+            are returned as well. default is False.
+        rasterize : bool, optional
+            if True, the windows are fitted to the pixels (centres) covered by
+            the rasterized geometry, and tiles without such pixels are dropped.
+            default is False for windows from the geometry's envelope.
 
         Returns
         -------
         overlapped_tiles : list
-            Return a list of the overlapped tiles' name.
+            Return a list of the overlapped tiles' name, or a list of tuples
+            (name, window) if return_windows is True; with window being
+            (xmin, ymin, xmax, ymax) in pixels (see Tile.active_subset_px).
             If not found, return empty list.
 
         """
         overlapped_tiles = list()
 
+        coverland = self._check_land_options(coverland, min_coverage)
+
         if geometry.GetGeometryName() in ['MULTIPOINT', 'POINT']:
             if geometry.Intersects(self.polygon_geog):
                 # get intersect area with subgrid in latlon
@@ -728,43 +1532,157 @@ class TiledProjection(object):
             if intersect.Area() == 0.0:
                 return overlapped_tiles
 
-            # transform intersection geometry back to the spatial ref system of the subgrid.
-            # segmentise for high precision during reprojection.
-            projected = intersect.GetSpatialReference().IsProjected()
-            if projected == 0:
-                max_segment = 0.5
-            elif projected == 1:
-                max_segment = 50000
-            else:
-                raise Warning('Please check unit of geometry before reprojection!')
+            intersect_geometry = self._transform_intersection(intersect)
+
+        return self._search_tiles_over_projected(intersect_geometry, coverland=coverland,
+                                                 min_coverage=min_coverage,
+                                                 return_windows=return_windows,
+                                                 rasterize=rasterize)
+
+
+    @timed('search_tiles_over_geometries', vertices='args')
+    def _search_tiles_over_geometries(self, geometries, coverland=False, min_coverage=None):
+        """
+        Internal function: search tiles of the subgrid that are overlapping
+        with any of the geometries. The intersections of the geometries with
+        the subgrid are united, and the union is reprojected only once.
+
+        Parameters
+        ----------
+        geometries : list of OGRGeometry
+            point or polygon geometries in the lon-lat-space
+        coverland : Boolean
+            see search_tiles_over_geometry()
+        min_coverage : float, optional
+            see search_tiles_over_geometry()
+
+        Returns
+        -------
+        overlapped_tiles : list
+            Return a list of the overlapped tiles' name.
+            If not found, return empty list.
+        """
+        coverland = self._check_land_options(coverland, min_coverage)
+
+        points = list()
+        intersects = list()
+        for geometry in geometries:
+            name = geometry.GetGeometryName()
+            if name in ['MULTIPOINT', 'POINT']:
+                if geometry.Intersects(self.polygon_geog):
+                    points.append(geometry.Intersection(self.polygon_geog))
+            elif name == 'POLYGON':
+                intersects.append(ptpgeometry.get_lonlat_intersection(geometry,
+                                                                      self.polygon_geog))
+            elif name == 'MULTIPOLYGON':
+                for i in range(geometry.GetGeometryCount()):
+                    polygon = geometry.GetGeometryRef(i).Clone()
+                    polygon.AssignSpatialReference(geometry.GetSpatialReference())
+                    intersects.append(ptpgeometry.get_lonlat_intersection(polygon,
+                                                                          self.polygon_geog))
+        intersects = [i for i in intersects if i.Area() != 0.0]
+
+        projected = list()
+        if len(points) > 0:
+            projected.append(ptpgeometry.transform_geometry(
+                ptpgeometry.union_geometries(points), self.projection.osr_spref))
+        if len(intersects) > 0:
+            projected.append(self._transform_intersection(
+                ptpgeometry.union_geometries(intersects)))
+
+        overlapped_tiles = list()
+        for intersect_geometry in projected:
+            overlapped_tiles.extend(self._search_tiles_over_projected(
+                intersect_geometry, coverland=coverland, min_coverage=min_coverage))
+
+        return list(set(overlapped_tiles))
+
+
+    def _check_land_options(self, coverland, min_coverage):
+        """
+        Internal function: checks the land options of a search against the
+        land information of the subgrid, and returns the effective coverland.
+        """
+        if min_coverage is not None and not self.tilesys.has_land_data:
+            raise ValueError('No land information for subgrid {}, '
+                             '"min_coverage" cannot be applied!'.format(self.core.tag))
+
+        if coverland and not self.tilesys.has_land_data:
+            warnings.warn('No land information for subgrid {}, "coverland" '
+                          'is ignored!'.format(self.core.tag))
+            coverland = False
+
+        return coverland
+
+
+    def _transform_intersection(self, intersect):
+        """
+        Internal function: transforms the intersection of a polygon with
+        the subgrid (in the lon-lat-space) to the spatial reference of the
+        subgrid; segmentised for high precision during reprojection.
+        """
+        projected = intersect.GetSpatialReference().IsProjected()
+        if projected == 0:
+            max_segment = 0.5
+        elif projected == 1:
+            max_segment = 50000
+        else:
+            raise Warning('Please check unit of geometry before reprojection!')
+
+        return ptpgeometry.transform_geometry(intersect,
+                                              self.projection.osr_spref,
+                                              segment=max_segment,
+                                              tolerance=self.core.tolerance)
 
-            intersect_geometry = ptpgeometry.transform_geometry(intersect,
-                                                                self.projection.osr_spref,
-                                                                segment=max_segment)
+
+    def _search_tiles_over_projected(self, intersect_geometry, coverland=False,
+                                     min_coverage=None, return_windows=False,
+                                     rasterize=False):
+        """
+        Internal function: search tiles of the subgrid that are overlapping
+        with a geometry given in the spatial reference of the subgrid.
+        see search_tiles_over_geometry()
+        """
+        overlapped_tiles = list()
 
         # get envelope of the geometry
         envelope = ptpgeometry.get_geometry_envelope(intersect_geometry)
 
-        # get overlapped tiles
-        tiles = self.tilesys.identify_tiles_overlapping_xybbox(envelope)
+        # get overlapped tiles, starting from those intersecting the subgrid
+        llxs, llys = self.tilesys._get_lowerlefts_overlapping_xybbox(envelope)
+        llxs, llys = np.meshgrid(llxs, llys)
+        valid = self.tilesys.check_lowerleft_is_valid(llxs, llys)
 
-        for tile in tiles:
+        for llx, lly in zip(llxs[valid], llys[valid]):
 
             # get tile object
-            t = self.tilesys.create_tile(tile)
+            t = self.tilesys.create_tile(x=int(llx), y=int(lly))
 
             # get only tile that overlaps with intersect_geometry
             if t.polygon_proj.Intersects(intersect_geometry):
 
                 # get only tile if coverland is satisfied
-                if not coverland or self.tilesys.check_tile_covers_land(t.name):
-                    overlapped_tiles.append(t.name)
+                if coverland and not self.tilesys.check_tile_covers_land(t.name):
+                    continue
+
+                # get only tile if the land fraction is sufficient
+                if min_coverage is not None and \
+                        self.tilesys.get_tile_land_fraction(t.name) < min_coverage:
+                    continue
+
+                if return_windows:
+                    window = t.get_geometry_window(intersect_geometry, rasterize=rasterize)
+                    if window is not None:
+                        overlapped_tiles.append((t.name, window))
+                    continue
+
+                overlapped_tiles.append(t.name)
 
 
         return overlapped_tiles
 
 
-class TilingSystem(object):
+class TilingSystem(_CoreAccess):
 
     """
     Class defining the tiling system and providing methods for queries and handling.
@@ -805,17 +1723,132 @@ class TilingSystem(object):
         self.y0 = y0
         self.xstep = self.core.tile_xsize_m
         self.ystep = self.core.tile_ysize_m
-        self.polygon_proj = ptpgeometry.transform_geometry(polygon_geog, self.core.projection.osr_spref)
+        self.polygon_proj = ptpgeometry.transform_geometry(polygon_geog, self.core.projection.osr_spref,
+                                                           tolerance=self.core.tolerance)
         self.bbox_proj = ptpgeometry.get_geometry_envelope(self.polygon_proj, rounding=self.core.sampling)
+        # index of the tiles intersecting the subgrid, built on first use
+        self._valid_tiles = None
+        # the grid holding the tiling system, set by the grid
+        self.grid = None
 
-    def __getattr__(self, item):
-        '''
-        short link for items of core
-        '''
-        if item in self.core.__dict__:
-            return self.core.__dict__[item]
-        else:
-            return self.__dict__[item]
+    def __reduce__(self):
+        """
+        pickles the tiling system by its grid's definition and the subgrid ID,
+        the grid is rebuilt (once per process) when unpickled.
+        """
+        return (_restore_tilingsystem, (self.core.grid_class, self.core.sampling,
+                                        self.core.tolerance, self.core.tag))
+
+
+    @property
+    def has_land_data(self):
+        """
+        True if the tiling system holds the land information of the tiles.
+        """
+        return False
+
+
+    def _get_grid(self):
+        """
+        Internal function: returns the grid holding the tiling system, or
+        the shared grid of its definition for a standalone tiling system.
+        """
+        if self.grid is not None:
+            return self.grid
+        return self.core.grid_class.get_cached(self.core.sampling,
+                                               tolerance=self.core.tolerance)
+
+
+    @property
+    def valid_tiles(self):
+        """
+        boolean array marking the tiles intersecting the extent of the subgrid.
+        the tile with lower-left (llx, lly) is found at
+        [(lly - lly0) // tile_ysize_m, (llx - llx0) // tile_xsize_m],
+        with (llx0, lly0) being the lower-left of the subgrid's bounding box.
+        built on first use and cached on disk (see pytileproj.cache).
+
+        Returns
+        -------
+        numpy.ndarray
+            2D boolean array, rows from bottom to top
+        """
+        if self._valid_tiles is None:
+            self._valid_tiles = self._load_valid_tiles()
+        return self._valid_tiles
+
+
+    def _get_valid_tiles_layout(self):
+        """
+        Internal function: returns the layout of the valid-tile index.
+
+        Returns
+        -------
+        llx0, lly0 : int
+            lower-left coordinates of the lower-left tile of the index
+        n_rows, n_cols : int
+            shape of the index
+        """
+        llxs, llys = self._get_lowerlefts_overlapping_xybbox(self.bbox_proj)
+        return llxs[0], llys[-1], len(llys), len(llxs)
+
+
+    def _load_valid_tiles(self):
+        """
+        Internal function: loads the valid-tile index from the cache,
+        or builds (and caches) it if not available.
+
+        Returns
+        -------
+        numpy.ndarray
+            2D boolean array, rows from bottom to top
+        """
+        llx0, lly0, n_rows, n_cols = self._get_valid_tiles_layout()
+        name = 'validtiles_{}_{}'.format(
+            self.core.tag, cache.get_cache_key(bytes(self.polygon_proj.ExportToWkb()),
+                                               self.core.tile_xsize_m,
+                                               self.core.tile_ysize_m))
+
+        valid_tiles = cache.load_array(name)
+        if valid_tiles is None or valid_tiles.shape != (n_rows, n_cols):
+            valid_tiles = np.zeros((n_rows, n_cols), dtype=bool)
+            llx, lly = self.identify_tiles_in_subgrid()
+            valid_tiles[(lly - lly0) // self.core.tile_ysize_m,
+                        (llx - llx0) // self.core.tile_xsize_m] = True
+            cache.save_array(name, valid_tiles)
+
+        return valid_tiles
+
+
+    def check_lowerleft_is_valid(self, llx, lly):
+        """
+        checks if the tiles with the given lower-left coordinates
+        intersect the extent of the subgrid, using the valid-tile index.
+
+        Parameters
+        ----------
+        llx, lly : int or numpy.ndarray
+            lower-left coordinates of the tile(s)
+
+        Returns
+        -------
+        Boolean or numpy.ndarray of Boolean
+        """
+        valid_tiles = self.valid_tiles
+        llx0, lly0, n_rows, n_cols = self._get_valid_tiles_layout()
+
+        llx = np.asarray(llx)
+        lly = np.asarray(lly)
+        cols = (llx - llx0) // self.core.tile_xsize_m
+        rows = (lly - lly0) // self.core.tile_ysize_m
+        inside = (cols >= 0) & (cols < n_cols) & (rows >= 0) & (rows < n_rows)
+
+        valid = np.zeros(inside.shape, dtype=bool)
+        valid[inside] = valid_tiles[rows[inside], cols[inside]]
+
+        if valid.ndim == 0:
+            return bool(valid)
+        return valid
 
 
     @abc.abstractmethod
@@ -993,6 +2026,42 @@ class TilingSystem(object):
             tilenames overlapping the bounding box
         """
 
+        llxs, llys = self._get_lowerlefts_overlapping_xybbox(bbox)
+
+        nx = len(llxs)
+        ny = len(llys)
+
+        tilenames = np.zeros((ny, nx), dtype=object)
+
+        for x in range(nx):
+            for y in range(ny):
+                tilenames[y, x] = self._encode_tilename(llxs[x], llys[y])
+
+        if flatten:
+            return list(tilenames.flatten())
+        else:
+            return tilenames
+
+
+    def _get_lowerlefts_overlapping_xybbox(self, bbox):
+        """
+        Internal function: returns the lower-left coordinates of the tiles
+        overlapping the bounding box.
+
+        Parameters
+        ----------
+        bbox : list
+            list of projected coordinates limiting the bounding box.
+            scheme: [xmin, ymin, xmax, ymax]
+
+        Return
+        ------
+        llxs : list of int
+            lower-left x coordinates of the tile columns, from left to right
+        llys : list of int
+            lower-left y coordinates of the tile rows, from top to bottom
+        """
+
         xmin, ymin, xmax, ymax = [int(round(x)) for x in bbox]
         if (xmin > xmax) or (ymin > ymax):
             raise ValueError("Check order of coordinates of bbox! "
@@ -1008,19 +2077,35 @@ class TilingSystem(object):
         llys = list(reversed(
             range(ymin // tsize_y * factor_y, ymax // tsize_y * factor_y + 1, factor_y)))
 
-        nx = len(llxs)
-        ny = len(llys)
+        return llxs, llys
 
-        tilenames = np.zeros((ny, nx), dtype=object)
 
-        for x in range(nx):
-            for y in range(ny):
-                tilenames[y, x] = self._encode_tilename(llxs[x], llys[y])
+    def identify_tiles_in_subgrid(self):
+        """
+        Returns the lower-left coordinates of all tiles
+        intersecting the extent of the subgrid.
 
-        if flatten:
-            return list(tilenames.flatten())
-        else:
-            return tilenames
+        Return
+        ------
+        llx, lly : numpy.ndarray
+            lower-left coordinates of the tiles,
+            ordered from top to bottom and left to right
+        """
+
+        llxs, llys = self._get_lowerlefts_overlapping_xybbox(self.bbox_proj)
+
+        llx = list()
+        lly = list()
+        for y in llys:
+            for x in llxs:
+                extent = ptpgeometry.bbox2polygon(
+                    ((x, y), (x + self.core.tile_xsize_m, y + self.core.tile_ysize_m)),
+                    self.core.projection.osr_spref)
+                if self.polygon_proj.Intersects(extent):
+                    llx.append(x)
+                    lly.append(y)
+
+        return np.array(llx, dtype=np.int64), np.array(lly, dtype=np.int64)
 
 
     def create_tiles_overlapping_xybbox(self, bbox):
@@ -1070,6 +2155,253 @@ class TilingSystem(object):
 
         return tiles
 
+    def create_tileset_overlapping_xybbox(self, bbox):
+        """
+        Returns the tiles intersecting the bounding box as TileSet,
+        with the active subsets covering the bounding box,
+        as create_tiles_overlapping_xybbox() but without creating Tile() objects.
+
+        Parameters
+        ----------
+        bbox : list of numbers
+            list of projected coordinates limiting the bounding box.
+            scheme: [xmin, ymin, xmax, ymax]
+
+        Return
+        ------
+        TileSet
+            tiles ordered from top to bottom and left to right
+        """
+        llxs, llys = self._get_lowerlefts_overlapping_xybbox(bbox)
+        llx, lly = [a.ravel() for a in np.meshgrid(llxs, llys)]
+
+        sampling = self.core.sampling
+        xsize = self.core.tile_xsize_m
+        ysize = self.core.tile_ysize_m
+        subsets = np.empty((len(llx), 4), dtype=np.int64)
+        subsets[:, 0] = np.where(llx <= bbox[0], (bbox[0] - llx) // sampling, 0)
+        subsets[:, 1] = np.where(lly <= bbox[1], (bbox[1] - lly) // sampling, 0)
+        subsets[:, 2] = np.where(llx + xsize > bbox[2], (bbox[2] - llx) // sampling,
+                                 xsize // sampling)
+        subsets[:, 3] = np.where(lly + ysize > bbox[3], (bbox[3] - lly) // sampling,
+                                 ysize // sampling)
+
+        grid = self._get_grid()
+        codes = TileSet.encode_subgrid_ids(grid, [self.core.tag] * len(llx))
+        return TileSet(grid, codes, llx, lly, subsets=subsets)
+
+
+    def plan_halo_windows(self, halo, bbox=None, tilenames=None):
+        """
+        Plans the reading of windows with a pixel halo, e.g. for windowed
+        filters: for each output block (a tile, clipped to the bounding box),
+        the window extended by the halo is composed of pixel slices read from
+        the (up to 9) tiles it overlaps. Only the pixels within the window are
+        read, parts of the window outside the subgrid are not covered.
+
+        Parameters
+        ----------
+        halo : int
+            width of the halo in pixels
+        bbox : list of numbers, optional
+            projected coordinates limiting the output blocks,
+            scheme: [xmin, ymin, xmax, ymax]
+        tilenames : list of str, optional
+            tiles used as output blocks (with their full extent).
+            either bbox or tilenames must be given.
+
+        Returns
+        -------
+        list of dict
+            one dictionary per output block, holding
+                'tilename' : name of the tile of the block
+                'subset' : the block within the tile, as
+                    (xmin, ymin, xmax, ymax) in pixels (see Tile.active_subset_px)
+                'shape' : (rows, columns) of the window
+                'geotransform' : GDAL geotransform of the window
+                'reads' : list of (tilename, src, dst), with src and dst being
+                    (row slice, column slice) of the pixels to read from the
+                    tile and their position in the window; rows from top
+                    to bottom (numpy-style)
+        """
+        if halo < 0:
+            raise ValueError('halo must not be negative!')
+        if bbox is not None:
+            blocks = self.create_tileset_overlapping_xybbox(bbox)
+            names = blocks.tilenames
+            llx, lly, subsets = blocks.llx, blocks.lly, blocks.subsets
+        elif tilenames is not None:
+            tiles = [self.create_tile(name=n) for n in tilenames]
+            names = [t.name for t in tiles]
+            llx = [t.llx for t in tiles]
+            lly = [t.lly for t in tiles]
+            subsets = [t.active_subset_px for t in tiles]
+        else:
+            raise ValueError('Either bbox or tilenames must be given!')
+
+        sampling = self.core.sampling
+        xsize = self.core.tile_xsize_m
+        ysize = self.core.tile_ysize_m
+        margin = halo * sampling
+
+        plans = list()
+        for name, x, y, subset in zip(names, llx, lly, subsets):
+            # window in metres
+            wx0 = int(x) + int(subset[0]) * sampling - margin
+            wy0 = int(y) + int(subset[1]) * sampling - margin
+            wx1 = int(x) + int(subset[2]) * sampling + margin
+            wy1 = int(y) + int(subset[3]) * sampling + margin
+
+            # tiles overlapping the window
+            sllxs = np.arange(wx0 // xsize, (wx1 - 1) // xsize + 1) * xsize
+            sllys = np.arange(wy0 // ysize, (wy1 - 1) // ysize + 1) * ysize
+            sllxs, sllys = np.meshgrid(sllxs, sllys[::-1])
+            valid = self.check_lowerleft_is_valid(sllxs, sllys)
+
+            reads = list()
+            for sllx, slly in zip(sllxs[valid], sllys[valid]):
+                sllx, slly = int(sllx), int(slly)
+                ix0, ix1 = max(wx0, sllx), min(wx1, sllx + xsize)
+                iy0, iy1 = max(wy0, slly), min(wy1, slly + ysize)
+                src = (slice((slly + ysize - iy1) // sampling, (slly + ysize - iy0) // sampling),
+                       slice((ix0 - sllx) // sampling, (ix1 - sllx) // sampling))
+                dst = (slice((wy1 - iy1) // sampling, (wy1 - iy0) // sampling),
+                       slice((ix0 - wx0) // sampling, (ix1 - wx0) // sampling))
+                reads.append((self._encode_tilename(sllx, slly), src, dst))
+
+            plans.append({'tilename': name,
+                          'subset': tuple(int(v) for v in subset),
+                          'shape': ((wy1 - wy0) // sampling, (wx1 - wx0) // sampling),
+                          'geotransform': [wx0, sampling, 0, wy1, 0, -sampling],
+                          'reads': reads})
+
+        return plans
+
+
+    @timed('tiles_footprint', vertices=None)
+    def get_tiles_footprint_geog(self, llx, lly, segment=25000, as_geometry=False):
+        """
+        Fast path to the extent of many tiles in the lon-lat-space, without
+        creating Tile() objects: the tile edges are sampled as arrays and
+        reprojected with one call.
+
+        Parameters
+        ----------
+        llx : array_like of int
+            lower-left x coordinates of the tiles
+        lly : array_like of int
+            lower-left y coordinates of the tiles
+        segment : number, optional
+            distance in metres between the sampled points along the tile
+            edges. default is 25000, as used by Tile.get_extent_geometry_geog()
+        as_geometry : bool, optional
+            if True, the footprints are returned as OGRGeometry objects,
+            split at the antimeridian. default is False.
+
+        Returns
+        -------
+        polygon_geog : tuple of numpy.ndarray, or list of OGRGeometry
+            lon and lat arrays of shape (n_tiles, n_points), holding the
+            closed outlines of the tiles. Longitudes of tiles crossing the
+            antimeridian are unwrapped to values beyond 180 degrees.
+        bbox_geog : numpy.ndarray
+            array of shape (n_tiles, 4) holding the bounding boxes as
+            (lonmin, latmin, lonmax, latmax); lonmin > lonmax for tiles
+            crossing the antimeridian.
+        """
+
+        llx = np.atleast_1d(np.asarray(llx, dtype=np.float64))
+        lly = np.atleast_1d(np.asarray(lly, dtype=np.float64))
+
+        # footprints of many tiles, e.g. of all tiles of the subgrid,
+        # are taken from the disk cache if computed before
+        name = None
+        if len(llx) >= _FOOTPRINT_CACHE_MIN_TILES:
+            name = 'footprints_{}_{}'.format(
+                self.core.tag, cache.get_cache_key(llx.tobytes(), lly.tobytes(), segment,
+                                                   self.core.projection.proj4,
+                                                   self.core.tile_xsize_m,
+                                                   self.core.tile_ysize_m))
+            footprints = cache.load_array(name, mmap_mode='r')
+            if footprints is not None and footprints.shape[0] == len(llx):
+                n_points = (footprints.shape[1] - 4) // 2
+                lon = footprints[:, :n_points]
+                lat = footprints[:, n_points:2 * n_points]
+                bbox = footprints[:, 2 * n_points:]
+                return self._footprints2geometries(lon, lat, bbox, as_geometry)
+
+        (lon, lat), bbox = self._compute_tiles_footprint_geog(llx, lly, segment)
+        if name is not None:
+            cache.save_array(name, np.concatenate((lon, lat, bbox), axis=1))
+        return self._footprints2geometries(lon, lat, bbox, as_geometry)
+
+
+    def _compute_tiles_footprint_geog(self, llx, lly, segment):
+        """
+        Internal function: computes the footprints of tiles in the
+        lon-lat-space, see get_tiles_footprint_geog().
+        """
+        # sample the tile edges, clockwise from the lower-left corner
+        xsize = self.core.tile_xsize_m
+        ysize = self.core.tile_ysize_m
+        n = max(int(math.ceil(max(xsize, ysize) / segment)), 1)
+        t = np.arange(n) / float(n)
+        edge_x = np.concatenate((np.zeros(n), t * xsize, np.full(n, xsize), (1 - t) * xsize, [0]))
+        edge_y = np.concatenate((t * ysize, np.full(n, ysize), (1 - t) * ysize, np.zeros(n), [0]))
+
+        x = llx[:, np.newaxis] + edge_x
+        y = lly[:, np.newaxis] + edge_y
+
+        proj4 = self.core.projection.proj4
+        lon, lat = get_transformer(proj4, 'EPSG:4326').transform(x, y)
+
+        # unwrap the longitudes of tiles crossing the antimeridian
+        crossing = (lon.max(axis=1) - lon.min(axis=1)) > 180.0
+        lon[crossing] = np.where(lon[crossing] < 0, lon[crossing] + 360.0, lon[crossing])
+
+        bbox = np.stack((lon.min(axis=1), lat.min(axis=1),
+                         lon.max(axis=1), lat.max(axis=1)), axis=1)
+        bbox[bbox[:, 2] > 180.0, 2] -= 360.0
+
+        # tiles covering a pole span all longitudes
+        pole_x, pole_y = get_transformer('EPSG:4326', proj4).transform([0.0, 0.0], [90.0, -90.0])
+        for px, py, pole_lat in zip(pole_x, pole_y, [90.0, -90.0]):
+            covers_pole = (llx <= px) & (px < llx + xsize) & (lly <= py) & (py < lly + ysize)
+            bbox[covers_pole, 0] = -180.0
+            bbox[covers_pole, 2] = 180.0
+            if pole_lat > 0:
+                bbox[covers_pole, 3] = pole_lat
+            else:
+                bbox[covers_pole, 1] = pole_lat
+
+        # same rounding as in Tile()
+        bbox = np.trunc(bbox / 0.000001) * 0.000001
+
+        return (lon, lat), bbox
+
+
+    def _footprints2geometries(self, lon, lat, bbox, as_geometry):
+        """
+        Internal function: returns the footprints of tiles as arrays or
+        as geometries, see get_tiles_footprint_geog().
+        """
+        if not as_geometry:
+            return (lon, lat), bbox
+
+        # the longitudes of tiles crossing the antimeridian are unwrapped
+        crossing = lon.max(axis=1) > 180.0
+
+        geo_sr = ptpgeometry.get_geog_spatial_ref()
+        polygons = list()
+        for i in range(lon.shape[0]):
+            polygon = ptpgeometry.create_polygon_geometry(list(zip(lon[i], lat[i])), geo_sr)
+            if crossing[i]:
+                polygon = ptpgeometry.split_polygon_by_antimeridian(polygon)
+            polygons.append(polygon)
+
+        return polygons, bbox
+
+
     @abc.abstractmethod
     def get_congruent_tiles_from_tilename(self, tilename,
                                           target_sampling=None,
@@ -1137,13 +2469,16 @@ class TilingSystem(object):
         return list(set(cover_tiles))
 
 
-class Tile(object):
+class Tile(_CoreAccess):
     """
     A tile in the TiledProjectedSystem, holding characteristics of the tile.
     """
 
     __metaclass__ = abc.ABCMeta
 
+    __slots__ = ('core', 'name', 'typename', 'llx', 'lly', 'x_size_px', 'y_size_px',
+                 '_subset_px', 'polygon_proj', 'bbox_proj', '_polygon_geog', '_bbox_geog')
+
     def __init__(self, core, name, xll, yll):
         """
         Initialises a Tile().
@@ -1171,21 +2506,56 @@ class Tile(object):
         self._subset_px = (0, 0, self.x_size_px, self.y_size_px)
 
         self.polygon_proj = self.get_extent_geometry_proj()
-        self.polygon_geog = self.get_extent_geometry_geog()
         self.bbox_proj = ptpgeometry.get_geometry_envelope(self.polygon_proj,
                                                            rounding=self.core.sampling)
-        self.bbox_geog = ptpgeometry.get_geometry_envelope(self.polygon_geog,
-                                                           rounding=0.000001)
+        # the extent in the lonlat-space is computed on first use
+        self._polygon_geog = None
+        self._bbox_geog = None
 
 
-    def __getattr__(self, item):
-        '''
-        short link for items of core
-        '''
-        if item in self.core.__dict__:
-            return self.core.__dict__[item]
-        else:
-            return self.__dict__[item]
+    @property
+    def polygon_geog(self):
+        """
+        extent geometry of the tile in the lonlat-space
+
+        Returns
+        -------
+        OGRGeometry
+        """
+        if self._polygon_geog is None:
+            self._polygon_geog = self.get_extent_geometry_geog()
+        return self._polygon_geog
+
+
+    @property
+    def bbox_geog(self):
+        """
+        envelope of the tile in the lonlat-space
+
+        Returns
+        -------
+        tuple
+            as (lonmin, latmin, lonmax, latmax)
+        """
+        if self._bbox_geog is None:
+            self._bbox_geog = ptpgeometry.get_geometry_envelope(self.polygon_geog,
+                                                                rounding=0.000001)
+        return self._bbox_geog
+
+
+    def __reduce__(self):
+        """
+        pickles the tile by its grid's definition, the subgrid ID and its name,
+        the tile is recreated from the (once per process rebuilt) grid when
+        unpickled. the active subset is kept.
+        """
+        return (_restore_tile, (self.core.grid_class, self.core.sampling,
+                                self.core.tolerance, self.core.tag, self.name),
+                {'_subset_px': self._subset_px})
+
+
+    def __setstate__(self, state):
+        self._subset_px = state['_subset_px']
 
 
     def shape_px(self):
@@ -1226,9 +2596,16 @@ class Tile(object):
         OGRGeometry
 
         """
+        # the rectangle is exact in the projected space; the adaptive
+        # reprojection inserts vertices only when transforming it
+        if self.core.tolerance is None:
+            segment = self.x_size_px * self.core.sampling / 4
+        else:
+            segment = None
+
         return ptpgeometry.bbox2polygon((self._limits_m()[0:2], self._limits_m()[2:4]),
                                         self.core.projection.osr_spref,
-                                        segment=self.x_size_px * self.core.sampling / 4)
+                                        segment=segment)
 
 
     def get_extent_geometry_geog(self):
@@ -1244,7 +2621,8 @@ class Tile(object):
 
         geo_sr = ptpgeometry.get_geog_spatial_ref()
 
-        return ptpgeometry.transform_geometry(tile_geom, geo_sr, segment=25000)
+        return ptpgeometry.transform_geometry(tile_geom, geo_sr, segment=25000,
+                                              tolerance=self.core.tolerance)
 
 
     @property
@@ -1309,6 +2687,53 @@ class Tile(object):
         return tuple((x[0], self.y_size_px - x[1], x[2], self.y_size_px - x[3]))
 
 
+    def get_geometry_window(self, geometry, rasterize=False):
+        """
+        returns the tight pixel window of the tile covering a geometry,
+        e.g. for setting .active_subset_px
+
+        Parameters
+        ----------
+        geometry : OGRGeometry
+            point or polygon geometry, in the projection of the tile
+        rasterize : bool, optional
+            if True, the window is fitted to the pixels whose centre is within
+            the rasterized geometry. default is False for the window from
+            the envelope of the geometry within the tile.
+
+        Returns
+        -------
+        tuple or None
+            window as (xmin, ymin, xmax, ymax) in pixels (see active_subset_px),
+            None if the geometry covers no pixel of the tile
+        """
+        intersection = self.polygon_proj.Intersection(geometry)
+        if intersection is None or intersection.IsEmpty():
+            return None
+
+        sampling = self.core.sampling
+        minx, maxx, miny, maxy = intersection.GetEnvelope()
+        xmin = min(max(int(math.floor((minx - self.llx) / sampling)), 0), self.x_size_px - 1)
+        ymin = min(max(int(math.floor((miny - self.lly) / sampling)), 0), self.y_size_px - 1)
+        xmax = min(max(int(math.ceil((maxx - self.llx) / sampling)), xmin + 1), self.x_size_px)
+        ymax = min(max(int(math.ceil((maxy - self.lly) / sampling)), ymin + 1), self.y_size_px)
+
+        if rasterize and intersection.GetGeometryName() in ['POLYGON', 'MULTIPOLYGON']:
+            geot = [self.llx + xmin * sampling, sampling, 0,
+                    self.lly + ymax * sampling, 0, -sampling]
+            mask = ptpgeometry.rasterize_geometry(intersection, geot,
+                                                  (ymax - ymin, xmax - xmin))
+            rows = np.nonzero(mask.any(axis=1))[0]
+            cols = np.nonzero(mask.any(axis=0))[0]
+            if len(rows) == 0:
+                return None
+            # rows of the mask run from top to bottom
+            xmin, xmax = xmin + cols[0], xmin + cols[-1] + 1
+            ymin, ymax = ymax - rows[-1] - 1, ymax - rows[0]
+
+        return int(xmin), int(ymin), int(xmax), int(ymax)
+
+
     def geotransform(self):
         """
         returns the GDAL geotransform list
@@ -1497,6 +2922,8 @@ class GlobalTile(Tile):
 
     __metaclass__ = abc.ABCMeta
 
+    __slots__ = ()
+
     def __init__(self, core, name, bbox_polygon_proj):
         """
         Initialising a GlobalTile(), covering the whole extent of the subgrid
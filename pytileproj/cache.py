@@ -0,0 +1,363 @@
+# Copyright (c) 2018, Vienna University of Technology (TU Wien), Department of
+# Geodesy and Geoinformation (GEO).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation are
+# those of the authors and should not be interpreted as representing official
+# policies, either expressed or implied, of the FreeBSD Project.
+
+
+
+"""
+On-disk cache for arrays derived from the grid definitions, which are
+expensive to compute but do not change (e.g. the indices of valid tiles,
+the projected zone polygons or the tile footprints).
+
+The cache is opt-in: it is only used if the environment variable
+PYTILEPROJ_CACHE_DIR names the cache directory. The arrays are stored in a
+subdirectory per library version and hash of the library's code and data,
+hence arrays of other versions or of a modified checkout are never read.
+The size of the cache directory is bounded by the environment variable
+PYTILEPROJ_CACHE_SIZE_MB (default 1024), by evicting the least recently
+used arrays.
+Writing to the cache is best-effort: if the directory is not writable,
+the arrays are simply recomputed next time.
+"""
+
+import os
+import glob
+import hashlib
+import tempfile
+import time
+import warnings
+from functools import lru_cache
+
+import numpy as np
+from osgeo import ogr
+
+from pytileproj import __version__
+
+# default bound of the size of the cache directory, in megabytes
+DEFAULT_MAX_SIZE_MB = 1024
+
+# age in seconds after which temporary files are considered orphaned,
+# i.e. left behind by killed writers
+TMP_MAX_AGE = 3600
+
+# pattern of the version subdirectories (see get_version_dir()), which hold
+# all files of pytileproj in the cache directory
+_VERSION_DIR_PATTERN = 'v*_*'
+
+# estimated size in bytes of the version subdirectories (by path of the
+# cache directory) written to by this process, to run the eviction only when the bound is exceeded
+_cache_sizes = dict()
+
+
+def get_cache_dir():
+    """
+    Returns the path of the cache directory.
+
+    Returns
+    -------
+    str
+        path of the cache directory, or None if the cache is disabled
+    """
+    return os.environ.get('PYTILEPROJ_CACHE_DIR') or None
+
+
+def is_enabled():
+    """
+    Returns True if the cache is enabled.
+    """
+    return get_cache_dir() is not None
+
+
+@lru_cache(maxsize=None)
+def get_code_hash():
+    """
+    Returns the hash of the library's modules and static data,
+    identifying the format of the cached arrays.
+
+    Returns
+    -------
+    str
+        hexadecimal digest
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    fnames = sorted(glob.glob(os.path.join(package_dir, '*.py')) +
+                    glob.glob(os.path.join(package_dir, 'data', '*', '*.dat')))
+    digest = hashlib.sha1()
+    for fname in fnames:
+        digest.update(os.path.relpath(fname, package_dir).encode('utf-8'))
+        with open(fname, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def get_version_dir():
+    """
+    Returns the path of the subdirectory holding the arrays of the
+    installed library version.
+
+    Returns
+    -------
+    str
+        path of the version's cache directory
+    """
+    return os.path.join(get_cache_dir(), 'v{}_{}'.format(__version__, get_code_hash()))
+
+
+def get_max_size():
+    """
+    Returns the bound of the size of the cache directory.
+
+    Returns
+    -------
+    int
+        maximum size in bytes
+    """
+    max_size_mb = os.environ.get('PYTILEPROJ_CACHE_SIZE_MB', DEFAULT_MAX_SIZE_MB)
+    return int(float(max_size_mb) * 1024 ** 2)
+
+
+def get_cache_key(*items):
+    """
+    Creates a short, file-name safe key from the given items.
+
+    Parameters
+    ----------
+    items : str or bytes
+        items identifying the cached data, e.g. the WKB of a geometry
+
+    Returns
+    -------
+    str
+        hexadecimal digest of the items
+    """
+    digest = hashlib.sha1()
+    for item in items:
+        if not isinstance(item, (bytes, bytearray)):
+            item = str(item).encode('utf-8')
+        digest.update(item)
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def load_array(name, mmap_mode=None):
+    """
+    Loads an array from the cache.
+
+    Parameters
+    ----------
+    name : str
+        name of the array in the cache (without suffix)
+    mmap_mode : str, optional
+        if given (e.g. 'r'), the array is memory-mapped instead of read,
+        see numpy.load()
+
+    Returns
+    -------
+    numpy.ndarray
+        the cached array, or None if not in the cache
+    """
+    if not is_enabled():
+        return None
+    fname = os.path.join(get_version_dir(), name + '.npy')
+    if not os.path.isfile(fname):
+        return None
+    try:
+        array = np.load(fname, mmap_mode=mmap_mode, allow_pickle=False)
+    except (IOError, ValueError):
+        # e.g. a truncated file; it is overwritten by the next save_array()
+        return None
+
+    # mark as recently used for the eviction
+    try:
+        os.utime(fname)
+    except OSError:
+        pass
+    return array
+
+
+def save_array(name, array):
+    """
+    Saves an array to the cache. The file is written atomically,
+    so that concurrent processes never read a partial file.
+
+    Parameters
+    ----------
+    name : str
+        name of the array in the cache (without suffix)
+    array : numpy.ndarray
+        array to be cached
+
+    Returns
+    -------
+    bool
+        True if the array was written, False e.g. if it is larger than
+        the bound of the cache size
+    """
+    if not is_enabled() or array.nbytes > get_max_size():
+        return False
+    cache_dir = get_version_dir()
+    fname = os.path.join(cache_dir, name + '.npy')
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_fname = tempfile.mkstemp(suffix='.npy.tmp', dir=cache_dir)
+    except OSError as e:
+        warnings.warn('pytileproj cache not writable: {}'.format(e))
+        return False
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(tmp_fname, fname)
+    except OSError as e:
+        warnings.warn('pytileproj cache not writable: {}'.format(e))
+        if os.path.exists(tmp_fname):
+            os.remove(tmp_fname)
+        return False
+
+    # the cache directory is scanned once per process, afterwards only
+    # when the written arrays exceed the bound
+    cache_root = get_cache_dir()
+    if cache_root not in _cache_sizes:
+        evict(keep=fname)
+    else:
+        _cache_sizes[cache_root] += array.nbytes
+        if _cache_sizes[cache_root] > get_max_size():
+            evict(keep=fname)
+    return True
+
+
+def load_geometry(name, osr_spref=None):
+    """
+    Loads a geometry from the cache.
+
+    Parameters
+    ----------
+    name : str
+        name of the geometry in the cache (without suffix)
+    osr_spref : OGRSpatialReference, optional
+        spatial reference assigned to the geometry
+
+    Returns
+    -------
+    OGRGeometry
+        the cached geometry, or None if not in the cache
+    """
+    wkb = load_array(name)
+    if wkb is None:
+        return None
+    geometry = ogr.CreateGeometryFromWkb(wkb.tobytes())
+    if geometry is None:
+        return None
+    if osr_spref is not None:
+        geometry.AssignSpatialReference(osr_spref)
+    return geometry
+
+
+def save_geometry(name, geometry):
+    """
+    Saves a geometry (as WKB) to the cache.
+
+    Parameters
+    ----------
+    name : str
+        name of the geometry in the cache (without suffix)
+    geometry : OGRGeometry
+        geometry to be cached
+
+    Returns
+    -------
+    bool
+        True if the geometry was written
+    """
+    wkb = np.frombuffer(bytes(geometry.ExportToWkb()), dtype=np.uint8)
+    return save_array(name, wkb)
+
+
+def evict(max_size=None, keep=None):
+    """
+    Removes the least recently used arrays (of all library versions)
+    until the cache directory is not larger than the given size,
+    and temporary files orphaned by killed writers. Only the version
+    subdirectories of pytileproj are considered, hence other files in
+    the cache directory (e.g. a shared one) are never removed.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        maximum size in bytes. default is given by get_max_size().
+    keep : str, optional
+        path of a file never removed, e.g. the array just written.
+
+    Returns
+    -------
+    int
+        number of removed arrays
+    """
+    if not is_enabled():
+        return 0
+    if max_size is None:
+        max_size = get_max_size()
+
+    cache_root = get_cache_dir()
+    version_dirs = os.path.join(cache_root, _VERSION_DIR_PATTERN)
+    now = time.time()
+    for fname in glob.glob(os.path.join(version_dirs, '*.npy.tmp')):
+        try:
+            if now - os.stat(fname).st_mtime > TMP_MAX_AGE:
+                os.remove(fname)
+        except OSError:
+            # removed by a concurrent process
+            continue
+
+    files = []
+    for fname in glob.glob(os.path.join(version_dirs, '*.npy')):
+        if fname == keep:
+            continue
+        try:
+            stat = os.stat(fname)
+        except OSError:
+            # removed by a concurrent process
+            continue
+        files.append((stat.st_mtime, stat.st_size, fname))
+
+    size = sum(f[1] for f in files)
+    if keep is not None and os.path.isfile(keep):
+        size += os.path.getsize(keep)
+    n_removed = 0
+    for _, fsize, fname in sorted(files):
+        if size <= max_size:
+            break
+        try:
+            os.remove(fname)
+        except OSError:
+            continue
+        size -= fsize
+        n_removed += 1
+
+    _cache_sizes[cache_root] = size
+    return n_removed
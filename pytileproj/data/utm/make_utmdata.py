@@ -39,19 +39,28 @@ make utmgrid.dat file for UTMGrid class
 
 
 import os
+import math
 import argparse
 import pickle
+import numpy as np
 from osgeo import ogr, osr
 from pytileproj import geometry
 from pytileproj.utmgrid import create_UTM_zone_names
 
-def make_utmdata(outpath, version="V10"):
+# tile sizes in metres of the tilecodes
+TILESIZES = {'T6': 600000, 'T3': 300000, 'T1': 100000}
+
+def make_utmdata(outpath, version="V10", landmask=None):
     """ Make the utmgrid.dat file
 
     Parameters
     ----------
     outpath : string
         output file directory path.
+    landmask : string, optional
+        path to a vector file with land polygons in lonlat-space
+        (e.g. Natural Earth's ne_10m_land). if given, the tiles' land
+        fractions are stored as well.
     
     Returns
     -------
@@ -65,9 +74,17 @@ def make_utmdata(outpath, version="V10"):
     { ...
       "14S": { "projection": "projection in wkt format",
                "zone_extent": "zone geometry of subgrid with ID=14S
-                                in wkt format" }
+                                in wkt format",
+               "landfraction": { "T6": { "shape": (n_rows, n_cols),
+                                         "fraction": uint8 array (bytes) },
+                                 "T3": { ... },
+                                 "T1": { ... } } }
       "15N": { ... }
     }
+    the land fraction of the tile with lower-left (llx, lly) is found at
+    index (lly // tilesize) * n_cols + (llx // tilesize), scaled from
+    0.0 ... 1.0 to 0 ... 255 and rounded up, i.e. a tile covering any land
+    has a fraction > 0 (which defines coverland).
 
     """
     
@@ -90,6 +107,11 @@ def make_utmdata(outpath, version="V10"):
         str_proj4 = load_spatial_reference(subgrid)
         subgrid_data["proj4"] = str_proj4
 
+        if landmask is not None:
+            subgrid_data["landfraction"] = load_land_coverage(zone_extent,
+                                                              str_proj4,
+                                                              landmask)
+
         utm_data[subgrid] = subgrid_data
     
     # Serialize utm_data by pickle with protocal=2
@@ -127,21 +149,123 @@ def load_spatial_reference(subgrid):
     return str_proj4
 
 
-def load_coverland_tiles(tile_fpath):
-    tiles_coversland = None
+def compute_land_fractions(zone_proj, land_parts, tilesize):
+    """ Computes the fractions of the valid part of the tiles (the part
+    within the zone) covered by land.
+
+    Parameters
+    ----------
+    zone_proj : OGRGeometry
+        zone geometry of the subgrid in the projection of the subgrid
+    land_parts : list of OGRGeometry
+        land areas within the zone, in the projection of the subgrid
+    tilesize : number
+        size of the tiles in the units of the projection
+
+    Returns
+    -------
+    fraction : numpy.ndarray
+        land fractions of the tiles as uint8 (0...255), shape (n_rows, n_cols)
+        with rows from bottom to top. Tiles without valid part are 0.
+    """
+    zone_sr = zone_proj.GetSpatialReference()
+    land_envelopes = [part.GetEnvelope() for part in land_parts]
+    _, xmax, _, ymax = zone_proj.GetEnvelope()
+
+    n_cols = int(math.ceil(xmax / tilesize))
+    n_rows = int(math.ceil(ymax / tilesize))
+    mask = np.zeros((n_rows, n_cols), dtype=bool)
+    land_area = np.zeros((n_rows, n_cols), dtype=np.float64)
+    valid_area = np.zeros((n_rows, n_cols), dtype=np.float64)
+    for row in range(n_rows):
+        for col in range(n_cols):
+            llx, lly = col * tilesize, row * tilesize
+            tile = geometry.bbox2polygon([(llx, lly),
+                                          (llx + tilesize, lly + tilesize)],
+                                         zone_sr)
+            if not tile.Intersects(zone_proj):
+                continue
+            valid_area[row, col] = tile.Intersection(zone_proj).Area()
+            for part, (pxmin, pxmax, pymin, pymax) in zip(land_parts,
+                                                          land_envelopes):
+                # cheap envelope test before the exact one
+                if pxmax < llx or pxmin > llx + tilesize or \
+                        pymax < lly or pymin > lly + tilesize:
+                    continue
+                if tile.Intersects(part):
+                    mask[row, col] = True
+                    land_area[row, col] += tile.Intersection(part).Area()
+
+    # the land is clipped to the zone, so relate it to the valid part only
+    valid = valid_area > 0
+    fraction = np.zeros((n_rows, n_cols), dtype=np.float64)
+    fraction[valid] = land_area[valid] / valid_area[valid]
+    fraction = np.ceil(np.clip(fraction, 0.0, 1.0) * 255).astype(np.uint8)
+    # touching land counts as covering land
+    fraction[mask & valid & (fraction == 0)] = 1
+
+    return fraction
+
+
+def load_land_coverage(zone_extent, str_proj4, landmask):
+    """ Creates the fractions of the tiles' valid area (the part within the
+    zone) covered by land in a subgrid.
+
+    Parameters
+    ----------
+    zone_extent : OGRGeometry
+        zone geometry of the subgrid in lonlat-space
+    str_proj4 : string
+        projection of the subgrid
+    landmask : string
+        path to a vector file with land polygons in lonlat-space
+
+    Returns
+    -------
+    landfraction : dict
+        for each tilecode, the land fractions of the tiles as uint8 (0...255)
+        and their shape (n_rows, n_cols)
+    """
+    zone_sr = osr.SpatialReference()
+    zone_sr.ImportFromProj4(str_proj4)
+    geog_sr = geometry.get_geog_spatial_ref()
+    zone_extent.AssignSpatialReference(geog_sr)
+
+    # land areas within the zone, in the projection of the zone
+    lonmin, lonmax, latmin, latmax = zone_extent.GetEnvelope()
+    land_parts = []
+    for land in geometry.iter_geometries(landmask,
+                                         bbox=[lonmin, latmin, lonmax, latmax],
+                                         attributes=False):
+        land_in_zone = zone_extent.Intersection(land)
+        if land_in_zone is None or land_in_zone.IsEmpty():
+            continue
+        land_in_zone.AssignSpatialReference(geog_sr)
+        land_parts.append(geometry.transform_geometry(land_in_zone, zone_sr,
+                                                      segment=0.1))
+
+    zone_proj = geometry.transform_geometry(zone_extent, zone_sr, segment=0.5)
+
+    landfraction = dict()
+    for tilecode, tilesize in TILESIZES.items():
+        fraction = compute_land_fractions(zone_proj, land_parts, tilesize)
+        landfraction[tilecode] = {'shape': fraction.shape,
+                                  'fraction': fraction.tobytes()}
 
-    return tiles_coversland
+    return landfraction
 
 
 def main():
     parser = argparse.ArgumentParser(description='Make UTMgrid Data File')
     parser.add_argument("outpath", help="output folder")
     parser.add_argument("-v", "--version", dest="version", nargs=1, metavar="", help="UTM Grid Version. Default is V10.")
+    parser.add_argument("-l", "--landmask", dest="landmask", nargs=1, metavar="", help="Vector file with land polygons for the land fractions of the tiles.")
     args = parser.parse_args()
     
     outpath = os.path.abspath(args.outpath)
     version = args.version[0] if args.version else "V10"
-    return make_utmdata(outpath, version)
+    landmask = os.path.abspath(args.landmask[0]) if args.landmask else None
+    return make_utmdata(outpath, version, landmask=landmask)
 
 
 if __name__ == "__main__":
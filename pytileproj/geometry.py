@@ -32,9 +32,11 @@
 Code for osgeo geometry operations.
 """
 
+import os
 from copy import deepcopy
 import numpy as np
 
+from osgeo import gdal
 from osgeo import ogr
 from osgeo import osr
 from osgeo.gdal import __version__ as gdal_version
@@ -45,6 +47,33 @@ from shapely.ops import linemerge
 from shapely.ops import unary_union
 from shapely.ops import polygonize
 
+from pytileproj.instrument import timed
+
+
+# names of the OGR drivers of the supported vector formats
+OGR_DRIVERS = {'shapefile': 'ESRI Shapefile',
+               'geopackage': 'GPKG',
+               'flatgeobuf': 'FlatGeobuf',
+               'geoparquet': 'Parquet',
+               'geojson': 'GeoJSON'}
+
+# vector formats whose OGR drivers take the layer creation option SPATIAL_INDEX
+SPATIAL_INDEX_FORMATS = ['flatgeobuf', 'geopackage', 'shapefile']
+
+# OGR geometry types of the geometry names
+OGR_GEOMETRY_TYPES = {None: ogr.wkbUnknown,
+                      'POINT': ogr.wkbPoint,
+                      'MULTIPOINT': ogr.wkbMultiPoint,
+                      'LINESTRING': ogr.wkbLineString,
+                      'MULTILINESTRING': ogr.wkbMultiLineString,
+                      'POLYGON': ogr.wkbPolygon,
+                      'MULTIPOLYGON': ogr.wkbMultiPolygon}
+
+# OGR field types of the attribute types
+OGR_FIELD_TYPES = {'str': ogr.OFTString,
+                   'int': ogr.OFTInteger64,
+                   'float': ogr.OFTReal}
+
 
 def get_geog_spatial_ref():
     """
@@ -207,9 +236,9 @@ def open_geometry(fname, feature=0, format='shapefile'):
         optional; order number of feature that should be returned;
         default is 0 for the first feature/object/geometry.
     format : str
-        optional; format name. currently only shapefile is supported
-    def __getitem__(key):
-        return geoms[key]
+        optional; format name, one of 'shapefile' (default), 'geopackage',
+        'flatgeobuf', 'geoparquet', 'geojson'.
+        if None, the format is detected by OGR.
 
     Returns
     -------
@@ -217,11 +246,7 @@ def open_geometry(fname, feature=0, format='shapefile'):
         a geometry from the input file as indexed by the feature number
     '''
 
-    if format == 'shapefile':
-        drivername = "ESRI Shapefile"
-
-    driver = ogr.GetDriverByName(drivername)
-    ds = driver.Open(fname, 0)
+    ds = _open_vector_file(fname, format=format)
     feature = ds.GetLayer(0).GetFeature(feature)
     geom = feature.GetGeometryRef()
 
@@ -230,6 +255,84 @@ def open_geometry(fname, feature=0, format='shapefile'):
     return out
 
 
+def iter_geometries(fname, layer=0, bbox=None, format=None, attributes=True):
+    '''
+    streams the geometries of all features of a layer in a vector file,
+    without loading the whole layer.
+
+    fname : str
+        full path of the input file name
+    layer : int or str
+        optional; index or name of the layer. default is the first layer.
+    bbox : list
+        optional; only features intersecting the bounding box are returned,
+        using the spatial filter (and index) of the layer.
+        scheme: [xmin, ymin, xmax, ymax], in units of the layer's spatial reference.
+    format : str
+        optional; format name, one of 'shapefile', 'geopackage', 'flatgeobuf',
+        'geoparquet', 'geojson'. default is None for detection by OGR.
+    attributes : bool
+        optional; if True (default), the attributes are returned as well.
+
+    Returns
+    -------
+    generator
+        yielding OGRGeometry with assigned spatial reference,
+        or tuples of (OGRGeometry, dict) if attributes is True.
+    '''
+
+    ds = _open_vector_file(fname, format=format)
+    lyr = ds.GetLayer(layer)
+    osr_spref = lyr.GetSpatialRef()
+
+    if bbox is not None:
+        lyr.SetSpatialFilterRect(*bbox)
+
+    for feature in lyr:
+        geom = feature.GetGeometryRef()
+        if geom is None:
+            continue
+
+        geom = geom.Clone()
+        if geom.GetSpatialReference() is None and osr_spref is not None:
+            geom.AssignSpatialReference(osr_spref)
+
+        if attributes:
+            yield geom, feature.items()
+        else:
+            yield geom
+
+    ds, lyr, feature = None, None, None
+
+
+def _open_vector_file(fname, format=None):
+    '''
+    Internal function: opens a vector file for reading.
+
+    fname : str
+        full path of the input file name
+    format : str
+        optional; format name as in OGR_DRIVERS.
+        default is None for detection by OGR.
+
+    Returns
+    -------
+    DataSource
+        the opened OGR data source
+    '''
+
+    if format is None:
+        ds = ogr.Open(fname, 0)
+    else:
+        driver = ogr.GetDriverByName(OGR_DRIVERS[format])
+        ds = driver.Open(fname, 0)
+
+    if ds is None:
+        raise IOError('Cannot open vector file {}!'.format(fname))
+
+    return ds
+
+
 def write_geometry(geom, fname, format="shapefile", segment=None):
     """
     writes a geometry to a vector file.
@@ -247,10 +350,9 @@ def write_geometry(geom, fname, format="shapefile", segment=None):
         in units of input osr_spref
     """
 
-    if format == 'shapefile':
-        drivername = "ESRI Shapefile"
+    drivername = OGR_DRIVERS[format]
 
-    drv = ogr.GetDriverByName("ESRI Shapefile")
+    drv = ogr.GetDriverByName(drivername)
     dst_ds = drv.CreateDataSource(fname)
     srs = geom.GetSpatialReference()
 
@@ -272,6 +374,87 @@ def write_geometry(geom, fname, format="shapefile", segment=None):
     return
 
 
+def write_features(fname, features, fields, osr_spref, format='flatgeobuf',
+                   layer_name='out', geometry_type='MULTIPOLYGON', spatial_index=False):
+    """
+    writes many features (geometries with attributes) to a single layer
+    of a vector file. the features are consumed one by one and written
+    in one transaction (if supported by the format), hence also large
+    numbers of features can be streamed with bounded memory.
+    the memory is bounded only without spatial index: e.g. the FlatGeobuf
+    driver holds all features in memory to build the index when closing
+    the file.
+
+    parameters
+    ----------
+    fname : str
+        full path of the output file name; an existing file is overwritten
+    features : iterable
+        yields tuples of (OGRGeometry, dict), with the dict holding the
+        attribute values by field name
+    fields : list of tuples
+        definition of the attribute fields as [(name, type), ...],
+        with type being one of 'str', 'int', 'float'
+    osr_spref : OGRSpatialReference
+        spatial reference of the geometries
+    format : str, optional
+        format name; one of 'flatgeobuf' (default), 'geoparquet',
+        'geopackage', 'geojson', 'shapefile'
+    layer_name : str, optional
+        name of the layer. default is 'out'
+    geometry_type : str, optional
+        geometry type of the layer, e.g. 'POLYGON' or 'MULTIPOLYGON' (default).
+        for 'MULTIPOLYGON', polygons are promoted to multipolygons.
+        if None, mixed geometry types are allowed.
+    spatial_index : bool, optional
+        if True, a spatial index is created by the formats supporting it
+        ('flatgeobuf', 'geopackage', 'shapefile'), at the cost of the
+        bounded memory. default is False.
+
+    Returns
+    -------
+    int
+        number of written features
+    """
+
+    drv = ogr.GetDriverByName(OGR_DRIVERS[format])
+    if os.path.exists(fname):
+        drv.DeleteDataSource(fname)
+    dst_ds = drv.CreateDataSource(fname)
+
+    options = []
+    if format in SPATIAL_INDEX_FORMATS:
+        options.append('SPATIAL_INDEX={}'.format('YES' if spatial_index else 'NO'))
+    dst_layer = dst_ds.CreateLayer(layer_name, srs=osr_spref,
+                                   geom_type=OGR_GEOMETRY_TYPES[geometry_type],
+                                   options=options)
+    for name, field_type in fields:
+        dst_layer.CreateField(ogr.FieldDefn(name, OGR_FIELD_TYPES[field_type]))
+    layer_defn = dst_layer.GetLayerDefn()
+
+    use_transaction = dst_ds.TestCapability(ogr.ODsCTransactions)
+    if use_transaction:
+        dst_ds.StartTransaction()
+
+    n_features = 0
+    for geom, attributes in features:
+        if geometry_type == 'MULTIPOLYGON' and geom.GetGeometryName() == 'POLYGON':
+            geom = ogr.ForceToMultiPolygon(geom)
+
+        feature = ogr.Feature(layer_defn)
+        for name, value in attributes.items():
+            feature.SetField(name, value)
+        feature.SetGeometry(geom)
+        dst_layer.CreateFeature(feature)
+        n_features += 1
+
+    if use_transaction:
+        dst_ds.CommitTransaction()
+
+    dst_ds, dst_layer, feature, geom = None, None, None, None
+    return n_features
+
+
 def bbox2polygon(bbox, osr_spref, segment=None):
     """
     create a polygon geometry from bounding-box bbox, given by
@@ -352,7 +535,8 @@ def create_polygon_geometry(points, osr_spref, segment=None):
     return polygon_geometry
 
 
-def transform_geometry(geometry, osr_spref, segment=None):
+@timed('transform_geometry')
+def transform_geometry(geometry, osr_spref, segment=None, tolerance=None):
     """
     returns the reprojected geometry - in the specified spatial reference
 
@@ -365,6 +549,11 @@ def transform_geometry(geometry, osr_spref, segment=None):
     segment : float, optional
         for precision: distance in units of input osr_spref of longest
         segment of the geometry polygon
+    tolerance : float, optional
+        for precision: maximum deviation in metres between the reprojected
+        edges and their true course. if given, vertices are inserted only
+        where needed (see segmentize_geometry_adaptive()) and segment is
+        ignored.
 
     Returns
     -------
@@ -377,8 +566,14 @@ def transform_geometry(geometry, osr_spref, segment=None):
 
     geometry_out = geometry.Clone()
 
+    # modify the geometry such that its reprojected edges deviate less
+    # than the given tolerance from their true course
+    if tolerance is not None:
+        geometry_out = segmentize_geometry_adaptive(geometry_out, osr_spref,
+                                                    tolerance=tolerance)
+
     # modify the geometry such it has no segment longer then the given distance
-    if segment is not None:
+    elif segment is not None:
         geometry_out = segmentize_geometry(geometry_out, segment=segment)
 
     # transform geometry to new spatial reference system.
@@ -393,6 +588,7 @@ def transform_geometry(geometry, osr_spref, segment=None):
     return geometry_out
 
 
+@timed('segmentize')
 def segmentize_geometry(geometry, segment=0.5):
     """
     segmentizes the lines of a geometry
@@ -419,6 +615,153 @@ def segmentize_geometry(geometry, segment=0.5):
     return geometry_out
 
 
+@timed('segmentize')
+def segmentize_geometry_adaptive(geometry, osr_spref, tolerance=100.0, max_depth=16):
+    """
+    segmentizes the lines of a geometry adaptively with respect to a
+    reprojection: an edge is bisected only if the reprojected midpoint
+    deviates more than the tolerance from the reprojected straight edge.
+
+    Parameters
+    ----------
+    geometry : OGRGeometry
+        geometry object, with assigned spatial reference
+    osr_spref : OGRSpatialReference
+        spatial reference to what the geometry will be transformed to
+    tolerance : float, optional
+        maximum deviation in metres; measured in the projected one of the
+        two spatial references. default is 100 metres.
+    max_depth : int, optional
+        maximum number of bisections per edge. default is 16.
+
+    Returns
+    -------
+    OGRGeometry
+        a congruent geometry (still in its input spatial reference),
+        with vertices inserted only where the reprojection bends the edges
+    """
+
+    geometry_out = geometry.Clone()
+
+    src_spref = geometry_out.GetSpatialReference()
+    tx = osr.CoordinateTransformation(src_spref, osr_spref)
+
+    # the deviation is measured in metres, hence in the projected space
+    inv_tx = None
+    if not osr_spref.IsProjected():
+        if src_spref.IsProjected():
+            inv_tx = osr.CoordinateTransformation(osr_spref, src_spref)
+        else:
+            # between two lonlat-spaces; approximate metres by degrees
+            tolerance = tolerance / 111319.49
+
+    _segmentize_curves_adaptive(geometry_out, tx, inv_tx, tolerance, max_depth)
+
+    geometry = None
+    return geometry_out
+
+
+def _segmentize_curves_adaptive(geometry, tx, inv_tx, tolerance, max_depth):
+    """
+    Internal function: recursively densifies all curves (linestrings and
+    rings) of a geometry in place.
+
+    Parameters
+    ----------
+    geometry : OGRGeometry
+        geometry object; is modified in place
+    tx : CoordinateTransformation
+        transformation from the geometry's to the target spatial reference
+    inv_tx : CoordinateTransformation or None
+        inverse transformation; if given, deviations are measured in the
+        geometry's spatial reference, else in the target spatial reference
+    tolerance : float
+        maximum deviation in units of the measuring spatial reference
+    max_depth : int
+        maximum number of bisections per edge
+    """
+
+    for g in range(geometry.GetGeometryCount()):
+        _segmentize_curves_adaptive(geometry.GetGeometryRef(g), tx, inv_tx,
+                                    tolerance, max_depth)
+
+    if geometry.GetGeometryCount() > 0 or geometry.GetPointCount() < 2:
+        return
+
+    points = densify_points_adaptive(geometry.GetPoints(), tx, tolerance,
+                                     inv_tx=inv_tx, max_depth=max_depth)
+
+    # only points are added, hence all old points are overwritten
+    if geometry.GetCoordinateDimension() == 3:
+        for p, point in enumerate(points):
+            geometry.SetPoint(p, point[0], point[1], point[2])
+    else:
+        for p, point in enumerate(points):
+            geometry.SetPoint_2D(p, point[0], point[1])
+
+
+def densify_points_adaptive(points, tx, tolerance, inv_tx=None, max_depth=16):
+    """
+    densifies a line of points by bisecting its edges until the
+    reprojected midpoints deviate less than the tolerance from
+    the reprojected straight edges.
+
+    Parameters
+    ----------
+    points : list of tuples
+        the vertices of the line as [(x1, y1), (x2, y2), ...]
+        or [(x1, y1, z1), (x2, y2, z2), ...]
+    tx : CoordinateTransformation
+        transformation from the points' to the target spatial reference
+    tolerance : float
+        maximum deviation in units of the measuring spatial reference
+    inv_tx : CoordinateTransformation, optional
+        inverse transformation; if given, deviations are measured in the
+        points' spatial reference, else in the target spatial reference
+    max_depth : int, optional
+        maximum number of bisections per edge. default is 16.
+
+    Returns
+    -------
+    numpy.ndarray
+        the densified vertices; still in the points' spatial reference
+    """
+
+    src = np.array(points, dtype=np.float64)
+    dst = np.array(tx.TransformPoints(src[:, 0:2].tolist()))[:, 0:2]
+
+    # edges that still need to be checked
+    active = np.arange(len(src) - 1)
+
+    for _ in range(max_depth):
+        if active.size == 0:
+            break
+
+        mid_src = (src[active] + src[active + 1]) / 2.0
+        mid_dst = np.array(tx.TransformPoints(mid_src[:, 0:2].tolist()))[:, 0:2]
+        chord_dst = (dst[active] + dst[active + 1]) / 2.0
+
+        if inv_tx is None:
+            deviation = np.hypot(*(mid_dst - chord_dst).T)
+        else:
+            chord_src = np.array(inv_tx.TransformPoints(chord_dst.tolist()))[:, 0:2]
+            deviation = np.hypot(*(chord_src - mid_src[:, 0:2]).T)
+
+        split = deviation > tolerance
+        if not split.any():
+            break
+
+        # insert the midpoints; both halves of a split edge are checked again
+        edges = active[split]
+        src = np.insert(src, edges + 1, mid_src[split], axis=0)
+        dst = np.insert(dst, edges + 1, mid_dst[split], axis=0)
+        first_halves = edges + np.arange(edges.size)
+        active = np.sort(np.concatenate((first_halves, first_halves + 1)))
+
+    return src
+
+
+@timed('intersection', vertices='args')
 def intersect_geometry(geometry1, geometry2):
     """
     returns the intersection of two point or polygon geometries
@@ -444,6 +787,33 @@ def intersect_geometry(geometry1, geometry2):
     return intersection
 
 
+def union_geometries(geometries):
+    """
+    returns the union of many geometries of the same spatial reference,
+    computed at once
+
+    Parameters
+    ----------
+    geometries : list of OGRGeometry
+        geometry objects
+
+    Returns
+    -------
+    union : OGRGeometry
+        a geometry representing the united area, in the spatial reference
+        of the first geometry
+    """
+
+    collection = ogr.Geometry(ogr.wkbGeometryCollection)
+    for geometry in geometries:
+        collection.AddGeometry(geometry)
+
+    union = collection.UnaryUnion()
+    union.AssignSpatialReference(geometries[0].GetSpatialReference())
+
+    return union
+
+
 def check_lonlat_intersection(geometry1, geometry2):
     """
     checks if two polygon geometries intersect in lonlat space.
@@ -473,6 +843,7 @@ def check_lonlat_intersection(geometry1, geometry2):
         return True
 
 
+@timed('intersection', vertices='args')
 def get_lonlat_intersection(geometry1, geometry2):
     """
     gets the intersect in lonlat space.
@@ -508,6 +879,7 @@ def get_lonlat_intersection(geometry1, geometry2):
     return polygons.Intersection(geometry2c)
 
 
+@timed('split_antimeridian')
 def split_polygon_by_antimeridian(lonlat_polygon, split_limit=150.0):
     """
     Function that splits a polygon at the antimeridian
@@ -641,6 +1013,101 @@ def get_geometry_envelope(geometry, rounding=1.0):
     return out
 
 
+def rasterize_geometry(geometry, geotransform, shape, all_touched=False):
+    """
+    rasterizes a geometry onto a pixel grid
+
+    Parameters
+    ----------
+    geometry : OGRGeometry
+        polygon geometry, in the spatial reference of the pixel grid
+    geotransform : list
+        GDAL geotransform of the pixel grid
+        as (ulx, x pixel spacing, 0, uly, 0, y pixel spacing)
+    shape : tuple
+        (n_rows, n_cols) of the pixel grid
+    all_touched : bool, optional
+        if True, all pixels touched by the geometry are set, otherwise
+        (default) only those whose centre is within the geometry.
+
+    Returns
+    -------
+    numpy.ndarray
+        boolean mask of the pixels covered by the geometry
+    """
+
+    n_rows, n_cols = shape
+    raster = gdal.GetDriverByName('MEM').Create('', n_cols, n_rows, 1, gdal.GDT_Byte)
+    raster.SetGeoTransform(list(geotransform))
+
+    osr_spref = geometry.GetSpatialReference()
+    if osr_spref is not None:
+        raster.SetProjection(osr_spref.ExportToWkt())
+
+    ds = ogr.GetDriverByName('Memory').CreateDataSource('')
+    lyr = ds.CreateLayer('mask', srs=osr_spref)
+    feature = ogr.Feature(lyr.GetLayerDefn())
+    feature.SetGeometry(geometry)
+    lyr.CreateFeature(feature)
+
+    options = ['ALL_TOUCHED=TRUE'] if all_touched else []
+    gdal.RasterizeLayer(raster, [1], lyr, burn_values=[1], options=options)
+    mask = raster.GetRasterBand(1).ReadAsArray().astype(bool)
+
+    feature = None
+    ds = None
+    raster = None
+
+    return mask
+
+
+def rle_encode(mask):
+    """
+    run-length encodes a boolean mask (in C-order)
+
+    Parameters
+    ----------
+    mask : numpy.ndarray
+        boolean mask
+
+    Returns
+    -------
+    numpy.ndarray
+        lengths of the alternating runs, starting with a (possibly empty)
+        run of False
+    """
+
+    flat = np.asarray(mask, dtype=bool).ravel()
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    bounds = np.concatenate(([0], changes, [flat.size]))
+    runs = np.diff(bounds)
+    if flat.size > 0 and flat[0]:
+        runs = np.concatenate(([0], runs))
+    return runs.astype(np.int64)
+
+
+def rle_decode(runs, shape):
+    """
+    decodes a run-length encoded boolean mask
+
+    Parameters
+    ----------
+    runs : numpy.ndarray
+        lengths of the alternating runs, starting with a run of False,
+        as returned by rle_encode()
+    shape : tuple
+        shape of the mask
+
+    Returns
+    -------
+    numpy.ndarray
+        boolean mask
+    """
+
+    values = np.arange(len(runs)) % 2 == 1
+    return np.repeat(values, runs).reshape(shape)
+
+
 def round_vertices_of_polygon(geometry, decimals=0):
     """
     'Cleans' the vertices of a polygon, so that it has rounded coordinates.
@@ -0,0 +1,943 @@
+# Copyright (c) 2018, Vienna University of Technology (TU Wien), Department of
+# Geodesy and Geoinformation (GEO).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation are
+# those of the authors and should not be interpreted as representing official
+# policies, either expressed or implied, of the FreeBSD Project.
+
+
+
+"""
+Columnar container for many tiles of a grid, and vectorized set operations
+on integer footprint IDs of tiles.
+
+Footprint IDs
+-------------
+A footprint ID packs the subgrid code, the tilecode and the position of a
+tile into one int64, with the position measured in units of the smallest
+tile size of the grid (e.g. 100 km for the UTMGrid). Hence, the IDs do not
+depend on the sampling, and tiles of the nested tilecodes (e.g. T6, T3, T1)
+can be compared by converting them to a common tilecode, which expands
+coarse tiles to the fine tiles they contain.
+
+    bits 55-62: sampling code (index in grid._static_sampling, plus 1),
+                0 in footprint IDs
+    bits 47-54: subgrid code
+    bits 44-46: tilecode index (in grid._static_tilecodes)
+    bits 22-43: column, offset by 2**21
+    bits  0-21: row, offset by 2**21
+
+The sampling code extends a footprint ID to the ID of a tile of a specific
+grid (see UTMGrid.tilenames2ids()); the footprint operations ignore it.
+
+Ordering
+--------
+TileSet.sort() orders the tiles per subgrid along a space-filling curve
+(Hilbert or Morton/Z-order), so that tiles close in the sequence are close
+in space, and TileSet.partition() splits the ordered tiles into spatially
+compact chunks, e.g. for distributing them to workers.
+"""
+
+import numpy as np
+
+
+# bit layout of the footprint IDs
+_ROW_BITS = 22
+_COL_SHIFT = _ROW_BITS
+_TILECODE_SHIFT = 2 * _ROW_BITS
+_SUBGRID_SHIFT = _TILECODE_SHIFT + 3
+_SUBGRID_MASK = 2 ** 8 - 1
+_SAMPLING_SHIFT = _SUBGRID_SHIFT + 8
+_POS_OFFSET = 2 ** (_ROW_BITS - 1)
+_POS_MASK = 2 ** _ROW_BITS - 1
+
+# tile sizes of the tilecodes per grid class
+_tilecode_sizes = dict()
+
+
+def get_tilecode_sizes(grid):
+    """
+    Returns the tile sizes of the tilecodes of a grid, in units of
+    the smallest tile size.
+
+    Parameters
+    ----------
+    grid : TiledProjectionSystem
+        the grid
+
+    Returns
+    -------
+    sizes : numpy.ndarray
+        tile sizes (in units) of the tilecodes, in the order of
+        grid._static_tilecodes
+    unit : int
+        the smallest tile size in metres
+    """
+    key = grid.__class__
+    if key not in _tilecode_sizes:
+        size_m = dict()
+        for sampling in grid._static_sampling:
+            size_m[grid.get_tiletype(sampling)] = grid.get_tilesize(sampling)[0]
+        sizes_m = [size_m[t] for t in grid._static_tilecodes]
+        unit = min(sizes_m)
+        if any(s % unit for s in sizes_m):
+            raise ValueError('The tile sizes of the grid are not nested!')
+        _tilecode_sizes[key] = (np.array([s // unit for s in sizes_m],
+                                         dtype=np.int64), unit)
+    return _tilecode_sizes[key]
+
+
+def encode_footprint_ids(subgrid_codes, tilecode_index, cols, rows, sampling_codes=0):
+    """
+    Packs footprint IDs.
+
+    Parameters
+    ----------
+    subgrid_codes : array_like of int
+        subgrid codes of the tiles
+    tilecode_index : int or array_like of int
+        index of the tilecode in grid._static_tilecodes
+    cols, rows : array_like of int
+        lower-left coordinates of the tiles in units of
+        the smallest tile size
+    sampling_codes : int or array_like of int, optional
+        index of the sampling in grid._static_sampling, plus 1.
+        default is 0 for the sampling-independent footprint IDs.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 footprint IDs
+    """
+    return ((np.asarray(sampling_codes, dtype=np.int64) << _SAMPLING_SHIFT) |
+            (np.asarray(subgrid_codes, dtype=np.int64) << _SUBGRID_SHIFT) |
+            (np.asarray(tilecode_index, dtype=np.int64) << _TILECODE_SHIFT) |
+            ((np.asarray(cols, dtype=np.int64) + _POS_OFFSET) << _COL_SHIFT) |
+            (np.asarray(rows, dtype=np.int64) + _POS_OFFSET))
+
+
+def decode_footprint_ids(ids):
+    """
+    Unpacks footprint IDs. The sampling code is ignored,
+    see decode_sampling_codes().
+
+    Parameters
+    ----------
+    ids : array_like of int64
+        footprint IDs
+
+    Returns
+    -------
+    subgrid_codes, tilecode_index, cols, rows : numpy.ndarray
+        see encode_footprint_ids()
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    subgrid_codes = (ids >> _SUBGRID_SHIFT) & _SUBGRID_MASK
+    tilecode_index = (ids >> _TILECODE_SHIFT) & 7
+    cols = ((ids >> _COL_SHIFT) & _POS_MASK) - _POS_OFFSET
+    rows = (ids & _POS_MASK) - _POS_OFFSET
+    return subgrid_codes, tilecode_index, cols, rows
+
+
+def decode_sampling_codes(ids):
+    """
+    Unpacks the sampling codes of footprint IDs.
+
+    Parameters
+    ----------
+    ids : array_like of int64
+        footprint IDs
+
+    Returns
+    -------
+    numpy.ndarray
+        sampling codes (0 for footprint IDs without sampling),
+        see encode_footprint_ids()
+    """
+    return np.asarray(ids, dtype=np.int64) >> _SAMPLING_SHIFT
+
+
+def normalize_footprint_ids(ids, sizes, tilecode_index):
+    """
+    Converts footprint IDs (of mixed tilecodes) to the given tilecode:
+    coarser tiles are expanded to the finer tiles they contain,
+    finer tiles are replaced by the coarser tile containing them.
+
+    Parameters
+    ----------
+    ids : array_like of int64
+        footprint IDs
+    sizes : numpy.ndarray
+        tile sizes of the tilecodes, see get_tilecode_sizes()
+    tilecode_index : int
+        index of the target tilecode
+
+    Returns
+    -------
+    numpy.ndarray
+        sorted, unique footprint IDs of the target tilecode
+    """
+    codes, tc, cols, rows = decode_footprint_ids(_unique(ids))
+    target = sizes[tilecode_index]
+    tile_sizes = sizes[tc]
+    if np.any((tile_sizes % target != 0) & (target % tile_sizes != 0)):
+        raise ValueError('The tilecodes are not nested!')
+
+    # finer tiles -> containing tile
+    finer = tile_sizes < target
+    cols = np.where(finer, cols // target * target, cols)
+    rows = np.where(finer, rows // target * target, rows)
+
+    # coarser tiles -> contained tiles
+    ratio = np.maximum(tile_sizes // target, 1)
+    counts = ratio ** 2
+    if len(counts) and np.all(counts == counts[0]) and counts[0] > 1:
+        # same tilecode: the offsets are broadcasted
+        r = int(ratio[0])
+        k = np.arange(r * r, dtype=np.int64)
+        codes = np.repeat(codes, r * r)
+        cols = (cols[:, np.newaxis] + (k % r) * target).ravel()
+        rows = (rows[:, np.newaxis] + (k // r) * target).ravel()
+    elif np.any(counts > 1):
+        codes = np.repeat(codes, counts)
+        cols = np.repeat(cols, counts)
+        rows = np.repeat(rows, counts)
+        ratio = np.repeat(ratio, counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        k = np.arange(len(cols), dtype=np.int64) - starts
+        cols = cols + (k % ratio) * target
+        rows = rows + (k // ratio) * target
+
+    return _unique(encode_footprint_ids(codes, tilecode_index, cols, rows))
+
+
+def _unique(ids):
+    """
+    sorted unique values of an int64 array
+    (np.unique() is considerably slower for large arrays)
+    """
+    ids = np.sort(np.asarray(ids, dtype=np.int64).reshape(-1))
+    mask = np.empty(len(ids), dtype=bool)
+    mask[:1] = True
+    np.not_equal(ids[1:], ids[:-1], out=mask[1:])
+    return ids[mask]
+
+
+def _isin_sorted(ids, sorted_ids):
+    """
+    membership of ids in the sorted array sorted_ids, which is fast for
+    sorted ids as well, as the lookups are then local in memory
+    """
+    if len(sorted_ids) == 0:
+        return np.zeros(len(ids), dtype=bool)
+    index = np.searchsorted(sorted_ids, ids)
+    index[index == len(sorted_ids)] = 0
+    return sorted_ids[index] == ids
+
+
+def morton_index(cols, rows):
+    """
+    Returns the position of grid cells along the Morton curve (Z-order),
+    by interleaving the bits of the column and row indexes.
+
+    Parameters
+    ----------
+    cols, rows : array_like of int
+        non-negative column and row indexes, below 2**31
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 positions along the curve
+    """
+    def spread(v):
+        v = np.asarray(v, dtype=np.int64) & 0x7FFFFFFF
+        v = (v | (v << 16)) & 0x0000FFFF0000FFFF
+        v = (v | (v << 8)) & 0x00FF00FF00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F0F0F0F0F
+        v = (v | (v << 2)) & 0x3333333333333333
+        v = (v | (v << 1)) & 0x5555555555555555
+        return v
+
+    return spread(cols) | (spread(rows) << 1)
+
+
+def hilbert_index(cols, rows, order=None):
+    """
+    Returns the position of grid cells along the Hilbert curve.
+
+    Parameters
+    ----------
+    cols, rows : array_like of int
+        non-negative column and row indexes
+    order : int, optional
+        order of the curve, i.e. the curve fills a square of 2**order cells.
+        default is None for the smallest order covering the indexes.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 positions along the curve
+    """
+    x = np.array(cols, dtype=np.int64).reshape(-1)
+    y = np.array(rows, dtype=np.int64).reshape(-1)
+    if order is None:
+        order = int(max(x.max(initial=0), y.max(initial=0))).bit_length()
+    n = 1 << order
+
+    d = np.zeros(len(x), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # rotate the quadrant
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return d
+
+
+def get_curve_order(subgrid_codes, cols, rows, curve='hilbert'):
+    """
+    Returns the indexes sorting cells by subgrid, and within each subgrid
+    along a space-filling curve.
+
+    Parameters
+    ----------
+    subgrid_codes : array_like of int
+        subgrid codes of the cells
+    cols, rows : array_like of int
+        column and row indexes of the cells
+    curve : str, optional
+        'hilbert' (default) or 'morton'
+
+    Returns
+    -------
+    numpy.ndarray
+        indexes sorting the cells
+    """
+    cols = np.asarray(cols, dtype=np.int64).reshape(-1)
+    rows = np.asarray(rows, dtype=np.int64).reshape(-1)
+    if len(cols) == 0:
+        return np.array([], dtype=np.int64)
+    cols = cols - cols.min()
+    rows = rows - rows.min()
+    if curve == 'hilbert':
+        position = hilbert_index(cols, rows)
+    elif curve == 'morton':
+        position = morton_index(cols, rows)
+    else:
+        raise ValueError('curve must be one of "hilbert", "morton"!')
+    return np.lexsort((position, np.asarray(subgrid_codes).reshape(-1)))
+
+
+def _finest_tilecode_index(sizes, *ids):
+    indexes = np.concatenate([decode_footprint_ids(i)[1] for i in ids])
+    if len(indexes) == 0:
+        return int(np.argmin(sizes))
+    indexes = np.unique(indexes)
+    return int(indexes[np.argmin(sizes[indexes])])
+
+
+def union_footprint_ids(ids1, ids2, sizes, tilecode_index=None):
+    """
+    Returns the footprint IDs covered by any of the two inputs.
+
+    Parameters
+    ----------
+    ids1, ids2 : array_like of int64
+        footprint IDs, of any tilecodes
+    sizes : numpy.ndarray
+        tile sizes of the tilecodes, see get_tilecode_sizes()
+    tilecode_index : int, optional
+        tilecode of the result. default is the finest tilecode of the inputs.
+
+    Returns
+    -------
+    numpy.ndarray
+        sorted, unique footprint IDs
+    """
+    if tilecode_index is None:
+        tilecode_index = _finest_tilecode_index(sizes, ids1, ids2)
+    return _unique(np.concatenate((normalize_footprint_ids(ids1, sizes, tilecode_index),
+                                   normalize_footprint_ids(ids2, sizes, tilecode_index))))
+
+
+def intersect_footprint_ids(ids1, ids2, sizes, tilecode_index=None):
+    """
+    Returns the footprint IDs covered by both inputs.
+
+    Parameters
+    ----------
+    ids1, ids2 : array_like of int64
+        footprint IDs, of any tilecodes
+    sizes : numpy.ndarray
+        tile sizes of the tilecodes, see get_tilecode_sizes()
+    tilecode_index : int, optional
+        tilecode of the result. default is the finest tilecode of the inputs.
+
+    Returns
+    -------
+    numpy.ndarray
+        sorted, unique footprint IDs
+    """
+    if tilecode_index is None:
+        tilecode_index = _finest_tilecode_index(sizes, ids1, ids2)
+    ids1 = normalize_footprint_ids(ids1, sizes, tilecode_index)
+    ids2 = normalize_footprint_ids(ids2, sizes, tilecode_index)
+    return ids1[_isin_sorted(ids1, ids2)]
+
+
+def difference_footprint_ids(ids1, ids2, sizes, tilecode_index=None):
+    """
+    Returns the footprint IDs covered by the first, but not by the second input.
+
+    Parameters
+    ----------
+    ids1, ids2 : array_like of int64
+        footprint IDs, of any tilecodes
+    sizes : numpy.ndarray
+        tile sizes of the tilecodes, see get_tilecode_sizes()
+    tilecode_index : int, optional
+        tilecode of the result. default is the finest tilecode of the inputs.
+
+    Returns
+    -------
+    numpy.ndarray
+        sorted, unique footprint IDs
+    """
+    if tilecode_index is None:
+        tilecode_index = _finest_tilecode_index(sizes, ids1, ids2)
+    ids1 = normalize_footprint_ids(ids1, sizes, tilecode_index)
+    ids2 = normalize_footprint_ids(ids2, sizes, tilecode_index)
+    return ids1[~_isin_sorted(ids1, ids2)]
+
+
+class TileSet(object):
+    """
+    A set of tiles of a TiledProjectionSystem, held as NumPy arrays of
+    subgrid codes, lower-left coordinates and active subsets, instead of
+    Tile() objects. Tile() objects are created only on request.
+
+    The subgrid code of a tile is the index of its subgrid ID in
+    list(grid.subgrids.keys()).
+    """
+
+    __slots__ = ('grid', 'subgrid_codes', 'llx', 'lly', 'subsets')
+
+    def __init__(self, grid, subgrid_codes, llx, lly, subsets=None):
+        """
+        Initialises a TileSet().
+
+        Parameters
+        ----------
+        grid : TiledProjectionSystem
+            the grid the tiles belong to
+        subgrid_codes : array_like of int
+            subgrid codes of the tiles
+        llx, lly : array_like of int
+            lower-left coordinates of the tiles
+        subsets : array_like of int, optional
+            active subsets of the tiles, shape (n, 4), as
+            (xmin, ymin, xmax, ymax) in pixels.
+            default is None for the full tiles.
+        """
+        self.grid = grid
+        self.subgrid_codes = np.asarray(subgrid_codes, dtype=np.int16).reshape(-1)
+        self.llx = np.asarray(llx, dtype=np.int32).reshape(-1)
+        self.lly = np.asarray(lly, dtype=np.int32).reshape(-1)
+        if subsets is None:
+            subsets = np.empty((len(self.llx), 4), dtype=np.int32)
+            subsets[:] = self.full_subset
+        self.subsets = np.asarray(subsets, dtype=np.int32).reshape(-1, 4)
+
+        if not (len(self.subgrid_codes) == len(self.llx) == len(self.lly) ==
+                len(self.subsets)):
+            raise ValueError('The arrays of the TileSet must have the same length!')
+
+
+    @classmethod
+    def from_tilenames(cls, grid, tilenames):
+        """
+        Creates a TileSet from tilenames in longform.
+
+        Parameters
+        ----------
+        grid : TiledProjectionSystem
+            the grid the tiles belong to
+        tilenames : list of str
+            tilenames in longform, e.g. 'Z33N500M_E000N054T6'
+
+        Returns
+        -------
+        TileSet
+        """
+        subgrid_ids, llx, lly = grid.decode_tilenames(tilenames)
+        return cls(grid, cls.encode_subgrid_ids(grid, subgrid_ids), llx, lly)
+
+
+    @classmethod
+    def from_tiles(cls, grid, tiles):
+        """
+        Creates a TileSet from Tile() objects, keeping their active subsets.
+
+        Parameters
+        ----------
+        grid : TiledProjectionSystem
+            the grid the tiles belong to
+        tiles : iterable of Tile
+            the tiles
+
+        Returns
+        -------
+        TileSet
+        """
+        tiles = list(tiles)
+        subgrid_ids = [t.core.tag for t in tiles]
+        return cls(grid, cls.encode_subgrid_ids(grid, subgrid_ids),
+                   [t.llx for t in tiles], [t.lly for t in tiles],
+                   subsets=np.array([t.active_subset_px for t in tiles],
+                                    dtype=np.int32).reshape(-1, 4))
+
+
+    @staticmethod
+    def encode_subgrid_ids(grid, subgrid_ids):
+        """
+        Converts subgrid IDs to subgrid codes.
+
+        Parameters
+        ----------
+        grid : TiledProjectionSystem
+            the grid
+        subgrid_ids : array_like of str
+            subgrid IDs, e.g. 'Z33N'
+
+        Returns
+        -------
+        numpy.ndarray
+            subgrid codes
+        """
+        all_ids = list(grid.subgrids.keys())
+        if len(all_ids) > _SUBGRID_MASK + 1:
+            raise ValueError('Footprint IDs support up to {} subgrids!'.format(
+                _SUBGRID_MASK + 1))
+        lookup = dict(zip(all_ids, range(len(all_ids))))
+        try:
+            return np.array([lookup[s] for s in np.asarray(subgrid_ids, dtype=str).reshape(-1)],
+                            dtype=np.int16)
+        except KeyError as e:
+            raise ValueError('Unknown subgrid ID: {}'.format(e))
+
+
+    @property
+    def full_subset(self):
+        """
+        active subset of a full tile, as (0, 0, x_size_px, y_size_px)
+        """
+        core = self.grid.core
+        return (0, 0, int(core.tile_xsize_m // core.sampling),
+                int(core.tile_ysize_m // core.sampling))
+
+
+    @property
+    def subgrid_ids(self):
+        """
+        subgrid IDs of the tiles
+
+        Returns
+        -------
+        numpy.ndarray
+            array of str
+        """
+        return np.array(list(self.grid.subgrids.keys()))[self.subgrid_codes]
+
+
+    @property
+    def tilenames(self):
+        """
+        tilenames in longform
+
+        Returns
+        -------
+        list of str
+        """
+        return self.grid.encode_tilenames(self.subgrid_ids, self.llx, self.lly)
+
+
+    @property
+    def tilecode_index(self):
+        """
+        index of the tilecode of the tiles in grid._static_tilecodes
+        """
+        return self.grid._static_tilecodes.index(self.grid.core.tiletype)
+
+
+    @property
+    def footprint_ids(self):
+        """
+        int64 footprint IDs of the tiles (see the module documentation),
+        which are unique and independent of the sampling.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        sizes, unit = get_tilecode_sizes(self.grid)
+        return encode_footprint_ids(self.subgrid_codes, self.tilecode_index,
+                                    self.llx.astype(np.int64) // unit,
+                                    self.lly.astype(np.int64) // unit)
+
+
+    @classmethod
+    def from_footprint_ids(cls, grid, ids):
+        """
+        Creates a TileSet from footprint IDs. IDs of other tilecodes than
+        the one of the grid are converted to the tiles of the grid covering
+        the same area.
+
+        Parameters
+        ----------
+        grid : TiledProjectionSystem
+            the grid the tiles belong to
+        ids : array_like of int64
+            footprint IDs
+
+        Returns
+        -------
+        TileSet
+            the tiles, sorted by their footprint IDs
+        """
+        sizes, unit = get_tilecode_sizes(grid)
+        tilecode_index = grid._static_tilecodes.index(grid.core.tiletype)
+        codes, _, cols, rows = decode_footprint_ids(
+            normalize_footprint_ids(ids, sizes, tilecode_index))
+        return cls(grid, codes, cols * unit, rows * unit)
+
+
+    def convert(self, grid):
+        """
+        Returns the tiles of another grid (of the same class, but with another
+        sampling) covering the area of this set; e.g. the T1 tiles contained
+        in T6 tiles, or the T6 tiles containing T1 tiles.
+
+        Parameters
+        ----------
+        grid : TiledProjectionSystem
+            the target grid
+
+        Returns
+        -------
+        TileSet
+        """
+        if grid.__class__ is not self.grid.__class__:
+            raise ValueError('TileSets must belong to grids of the same kind!')
+        return self.__class__.from_footprint_ids(grid, self.footprint_ids)
+
+
+    def __len__(self):
+        return len(self.llx)
+
+
+    def __repr__(self):
+        return '{}({} tiles, sampling={})'.format(self.__class__.__name__,
+                                                  len(self), self.grid.core.sampling)
+
+
+    def __getitem__(self, item):
+        """
+        returns a Tile() for an integer index, or a TileSet for a slice,
+        boolean mask or array of indices.
+        """
+        if isinstance(item, (int, np.integer)):
+            return self.get_tile(item)
+        return self.__class__(self.grid, self.subgrid_codes[item], self.llx[item],
+                              self.lly[item], subsets=self.subsets[item])
+
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_tile(i)
+
+
+    def __contains__(self, tilename):
+        other = self.__class__.from_tilenames(self.grid, [tilename])
+        return bool(np.isin(other.footprint_ids, self.footprint_ids)[0])
+
+
+    def get_tile(self, index):
+        """
+        creates the Tile() object of a tile of the set
+
+        Parameters
+        ----------
+        index : int
+            index of the tile in the set
+
+        Returns
+        -------
+        Tile
+        """
+        subgrid_id = self.subgrid_ids[index]
+        tile = self.grid.subgrids[subgrid_id].tilesys.create_tile(
+            x=int(self.llx[index]), y=int(self.lly[index]))
+        subset = tuple(int(x) for x in self.subsets[index])
+        if subset != self.full_subset:
+            tile.active_subset_px = subset
+        return tile
+
+
+    def to_tiles(self):
+        """
+        creates the Tile() objects of all tiles of the set
+
+        Returns
+        -------
+        list of Tile
+        """
+        return list(self)
+
+
+    def geotransforms(self):
+        """
+        returns the GDAL geotransforms of all tiles (see Tile.geotransform())
+
+        Returns
+        -------
+        numpy.ndarray
+            array of shape (n, 6), as
+            (llx, x pixel spacing, 0, lly + tile_ysize_m, 0, -y pixel spacing)
+        """
+        core = self.grid.core
+        geot = np.zeros((len(self), 6), dtype=np.float64)
+        geot[:, 0] = self.llx
+        geot[:, 1] = core.sampling
+        geot[:, 3] = self.lly.astype(np.float64) + core.tile_ysize_m
+        geot[:, 5] = -core.sampling
+        return geot
+
+
+    def filter(self, mask):
+        """
+        returns the tiles selected by a boolean mask
+
+        Parameters
+        ----------
+        mask : numpy.ndarray
+            boolean mask of the same length as the set
+
+        Returns
+        -------
+        TileSet
+        """
+        return self[np.asarray(mask, dtype=bool)]
+
+
+    def filter_subgrids(self, subgrid_ids):
+        """
+        returns the tiles located in the given subgrids
+
+        Parameters
+        ----------
+        subgrid_ids : str or list of str
+            subgrid IDs, e.g. 'Z33N'
+
+        Returns
+        -------
+        TileSet
+        """
+        if isinstance(subgrid_ids, str):
+            subgrid_ids = [subgrid_ids]
+        codes = self.encode_subgrid_ids(self.grid, subgrid_ids)
+        return self.filter(np.isin(self.subgrid_codes, codes))
+
+
+    def sort(self, curve=None):
+        """
+        returns the tiles sorted by subgrid, and within each subgrid by
+        column and row, or along a space-filling curve
+
+        Parameters
+        ----------
+        curve : str, optional
+            'hilbert' or 'morton' for the order along the curve.
+            default is None for the order by column and row.
+
+        Returns
+        -------
+        TileSet
+        """
+        if curve is None:
+            return self[np.argsort(self.footprint_ids, kind='stable')]
+        core = self.grid.core
+        return self[get_curve_order(self.subgrid_codes,
+                                    self.llx // core.tile_xsize_m,
+                                    self.lly // core.tile_ysize_m, curve=curve)]
+
+
+    def partition(self, n_chunks, curve='hilbert'):
+        """
+        splits the tiles into spatially compact chunks of (almost) equal size,
+        by cutting the tiles ordered along a space-filling curve
+
+        Parameters
+        ----------
+        n_chunks : int
+            number of chunks, e.g. the number of workers
+        curve : str, optional
+            'hilbert' (default) or 'morton'
+
+        Returns
+        -------
+        list of TileSet
+            the chunks; empty chunks are dropped
+        """
+        if n_chunks < 1:
+            raise ValueError('n_chunks must be at least 1!')
+        ordered = self.sort(curve=curve)
+        bounds = np.linspace(0, len(ordered), n_chunks + 1).round().astype(np.int64)
+        return [ordered[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])
+                if stop > start]
+
+
+    def unique(self):
+        """
+        returns the set without duplicate tiles (keeping the first occurrence),
+        sorted by subgrid, column and row
+
+        Returns
+        -------
+        TileSet
+        """
+        ids = self.footprint_ids
+        index = np.argsort(ids, kind='stable')
+        ids = ids[index]
+        first = np.empty(len(ids), dtype=bool)
+        first[:1] = True
+        np.not_equal(ids[1:], ids[:-1], out=first[1:])
+        return self[index[first]]
+
+
+    def _check_grid(self, other):
+        """
+        Checks if the other set belongs to a grid of the same kind, and
+        returns True if it has the same sampling.
+        """
+        if other.grid.__class__ is not self.grid.__class__:
+            raise ValueError('TileSets must belong to grids of the same kind!')
+        return other.grid.core.sampling == self.grid.core.sampling
+
+
+    def _mixed_operation(self, other, operation):
+        """
+        Applies a set operation to the footprint IDs of sets of different
+        samplings; the result is given in the grid with the finer tiles.
+        """
+        sizes, _ = get_tilecode_sizes(self.grid)
+        if sizes[other.tilecode_index] < sizes[self.tilecode_index]:
+            grid = other.grid
+        else:
+            grid = self.grid
+        tilecode_index = grid._static_tilecodes.index(grid.core.tiletype)
+        ids = operation(self.footprint_ids, other.footprint_ids, sizes,
+                        tilecode_index=tilecode_index)
+        return self.__class__.from_footprint_ids(grid, ids)
+
+
+    def union(self, other):
+        """
+        returns the tiles in this or the other set
+        (with the active subsets of this set for tiles in both).
+
+        If the sets have different samplings, the result is given as the tiles
+        of the grid with the finer tiles covering the union, with full subsets.
+
+        Parameters
+        ----------
+        other : TileSet
+
+        Returns
+        -------
+        TileSet
+        """
+        if not self._check_grid(other):
+            return self._mixed_operation(other, union_footprint_ids)
+        both = self.__class__(self.grid,
+                              np.concatenate((self.subgrid_codes, other.subgrid_codes)),
+                              np.concatenate((self.llx, other.llx)),
+                              np.concatenate((self.lly, other.lly)),
+                              subsets=np.concatenate((self.subsets, other.subsets)))
+        return both.unique()
+
+
+    def intersection(self, other):
+        """
+        returns the tiles in both sets (with the active subsets of this set).
+
+        If the sets have different samplings, the result is given as the tiles
+        of the grid with the finer tiles covering the intersection,
+        with full subsets.
+
+        Parameters
+        ----------
+        other : TileSet
+
+        Returns
+        -------
+        TileSet
+        """
+        if not self._check_grid(other):
+            return self._mixed_operation(other, intersect_footprint_ids)
+        return self.filter(_isin_sorted(self.footprint_ids,
+                                        _unique(other.footprint_ids))).unique()
+
+
+    def difference(self, other):
+        """
+        returns the tiles in this set, but not in the other set.
+
+        If the sets have different samplings, the result is given as the tiles
+        of the grid with the finer tiles covering the difference,
+        with full subsets.
+
+        Parameters
+        ----------
+        other : TileSet
+
+        Returns
+        -------
+        TileSet
+        """
+        if not self._check_grid(other):
+            return self._mixed_operation(other, difference_footprint_ids)
+        return self.filter(~_isin_sorted(self.footprint_ids,
+                                         _unique(other.footprint_ids))).unique()
+
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
@@ -39,6 +39,7 @@ Code for the Universal Transverse Mercator / Universal Polar Stereographic
 '''
 
 import os
+import math
 import pickle
 import copy
 import itertools
@@ -51,7 +52,15 @@ from pytileproj.base import TiledProjection
 from pytileproj.base import TPSProjection
 from pytileproj.base import TilingSystem
 from pytileproj.base import Tile
+from pytileproj.base import get_transformer
+from pytileproj import cache
 from pytileproj.geometry import create_geometry_from_wkt
+from pytileproj.geometry import rasterize_geometry
+from pytileproj.geometry import rle_encode
+from pytileproj.geometry import rle_decode
+from pytileproj.instrument import timed
+from pytileproj import tileset
+from pytileproj.tileset import TileSet
 
 
 def _load_static_data(module_path):
@@ -101,6 +110,27 @@ def create_UTM_zone_names():
     return subgrids
 
 
+# MGRS latitude bands and their southern edges (band X spans 12 degrees)
+_MGRS_BANDS = 'CDEFGHJKLMNPQRSTUVWX'
+_MGRS_BAND_EDGES = np.arange(-80.0, 80.0, 8.0)
+
+# 100 km square column letters and first column index of the UPS bands A, B, Y, Z
+_UPS_COLUMNS = [(b'JKLPQRSTUXYZ', 8), (b'ABCFGHJKLPQR', 20),
+                (b'RSTUXYZ', 13), (b'ABCFGHJ', 20)]
+# 100 km square row letters and first row index of the southern and northern UPS
+_UPS_ROWS = [(b'ABCDEFGHJKLMNPQRSTUVWXYZ', 8), (b'ABCDEFGHJKLMNP', 13)]
+
+
+def _letter_lookup(letters):
+    """
+    returns a lookup table from the byte value of a character to its index
+    in the string of letters (-1 for characters not in the string)
+    """
+    table = np.full(256, -1, dtype=np.int64)
+    table[np.frombuffer(letters.encode(), dtype=np.uint8)] = np.arange(len(letters))
+    return table
+
+
 class UTMGrid(TiledProjectionSystem):
     """
     UTMGrid class object, inheriting TiledProjectionSystem() from pytileproj.
@@ -130,7 +160,7 @@ class UTMGrid(TiledProjectionSystem):
                         150, 125, 100, 96, 80, 75, 64, 60, 50, 48, 40,
                         32, 30, 25, 24, 20, 16, 10, 8, 5, 4, 2, 1]
 
-    def __init__(self, sampling):
+    def __init__(self, sampling, tolerance=None):
         """
         Initialises an UTMGrid class for a specified sampling.
 
@@ -138,6 +168,10 @@ class UTMGrid(TiledProjectionSystem):
         ----------
         sampling : int
             the grid sampling = size of pixels; in metres.
+        tolerance : float, optional
+            maximum deviation in metres of reprojected geometry edges
+            from their true course. if None (default), the zone and tile
+            polygons are segmentized with fixed segment lengths.
 
         """
         # check if the utmgrid.data have been loaded successfully
@@ -148,7 +182,7 @@ class UTMGrid(TiledProjectionSystem):
             raise ValueError("Sampling {}m is not supported!".format(sampling))
 
         # initializing
-        super(UTMGrid, self).__init__(sampling, tag='UTM')
+        super(UTMGrid, self).__init__(sampling, tag='UTM', tolerance=tolerance)
         self.core.projection = 'multiple'
 
 
@@ -294,7 +328,356 @@ class UTMGrid(TiledProjectionSystem):
             object containing info of the specified tile
 
         """
-        return self.subgrids[name[0:2]].tilesys.create_tile(name)
+        return self.subgrids[name[0:4]].tilesys.create_tile(name)
+
+
+    def decode_tilenames(self, tilenames):
+        """
+        returns the subgrid IDs and lower-left coordinates of tiles,
+        vectorised over many tilenames
+
+        Parameters
+        ----------
+        tilenames : list of str
+            names of the tiles in longform, e.g. 'Z33N500M_E000N054T6'
+
+        Returns
+        -------
+        subgrid_ids : numpy.ndarray
+            subgrid IDs of the tiles
+        llx, lly : numpy.ndarray
+            lower-left coordinates of the tiles
+        """
+        names = np.asarray(tilenames, dtype=str).reshape(-1)
+        if names.size == 0:
+            return (np.array([], dtype=str), np.array([], dtype=np.int64),
+                    np.array([], dtype=np.int64))
+        if np.any(np.char.str_len(names) != 19):
+            raise ValueError('Tilenames must be given in longform, '
+                             'e.g. "Z33N500M_E000N054T6"!')
+
+        chars = names.astype('S19').view(np.uint8).reshape(-1, 19)
+        subgrid_ids = chars[:, 0:4].copy().view('S4').ravel().astype(str)
+        prefix = ''.join((UTMGrid.encode_sampling(self.core.sampling), 'M_E'))
+        suffix = self.core.tiletype
+
+        digits = chars[:, [10, 11, 12, 14, 15, 16]].astype(np.int64) - ord('0')
+        valid = np.all((digits >= 0) & (digits <= 9), axis=1)
+        valid &= np.all(chars[:, 4:10] == np.frombuffer(prefix.encode(), dtype=np.uint8), axis=1)
+        valid &= chars[:, 13] == ord('N')
+        valid &= np.all(chars[:, 17:19] == np.frombuffer(suffix.encode(), dtype=np.uint8), axis=1)
+        valid &= np.isin(subgrid_ids, self._static_subgrid_ids)
+
+        llx = (digits[:, 0] * 100 + digits[:, 1] * 10 + digits[:, 2]) * 100000
+        lly = (digits[:, 3] * 100 + digits[:, 4] * 10 + digits[:, 5]) * 100000
+        valid &= (llx % self.core.tile_xsize_m == 0) & (lly % self.core.tile_ysize_m == 0)
+
+        if not np.all(valid):
+            raise ValueError('"{}" is not a tilename of the grid!'.format(
+                names[~valid][0]))
+
+        return subgrid_ids, llx, lly
+
+
+    def encode_tilenames(self, subgrid_ids, llx, lly):
+        """
+        returns the names of tiles, vectorised over many tiles
+
+        Parameters
+        ----------
+        subgrid_ids : array_like of str
+            subgrid IDs of the tiles
+        llx, lly : array_like of int
+            lower-left coordinates of the tiles
+
+        Returns
+        -------
+        list of str
+            names of the tiles in longform
+        """
+        subgrid_ids = np.asarray(subgrid_ids, dtype=str).reshape(-1)
+        if subgrid_ids.size == 0:
+            return []
+        east = np.char.zfill((np.asarray(llx, dtype=np.int64) // 100000).astype(str), 3)
+        north = np.char.zfill((np.asarray(lly, dtype=np.int64) // 100000).astype(str), 3)
+        prefix = ''.join((UTMGrid.encode_sampling(self.core.sampling), 'M_E'))
+
+        names = np.char.add(subgrid_ids, prefix)
+        names = np.char.add(names, east)
+        names = np.char.add(names, 'N')
+        names = np.char.add(names, north)
+        names = np.char.add(names, self.core.tiletype)
+        return names.tolist()
+
+
+    def _get_tile_id_tables(self):
+        """
+        Internal function: returns the lookup tables of the tile IDs,
+        i.e. the zone names, the sampling strings, the tilecode indexes
+        of the samplings and the tile sizes of the tilecodes (in units of
+        the smallest tile size, see tileset.get_tilecode_sizes()).
+        """
+        zones = np.array(self._static_subgrid_ids, dtype='S4')
+        samplings = np.array([UTMGrid.encode_sampling(s) for s in self._static_sampling],
+                             dtype='S3')
+        tilecodes = np.array([self._static_tilecodes.index(self.get_tiletype(s))
+                              for s in self._static_sampling], dtype=np.int64)
+        sizes, unit = tileset.get_tilecode_sizes(self)
+        return zones, samplings, tilecodes, sizes, unit
+
+
+    def tilenames2ids(self, tilenames):
+        """
+        Converts tilenames (of any sampling) to canonical 64-bit tile IDs,
+        vectorised over many tilenames.
+
+        A tile ID is the footprint ID of the tile (see pytileproj.tileset),
+        extended by the sampling code (index in _static_sampling, plus 1);
+        hence the IDs sort by sampling, zone and position, are never 0,
+        and can be passed to TileSet.from_footprint_ids() and the footprint
+        operations, which ignore the sampling.
+
+        Parameters
+        ----------
+        tilenames : list of str
+            names of the tiles in longform, e.g. 'Z33N010M_E004N052T1'
+
+        Returns
+        -------
+        numpy.ndarray
+            int64 tile IDs
+        """
+        names = np.asarray(tilenames, dtype=str).reshape(-1)
+        if names.size == 0:
+            return np.array([], dtype=np.int64)
+        if np.any(np.char.str_len(names) != 19):
+            raise ValueError('Tilenames must be given in longform, '
+                             'e.g. "Z33N500M_E000N054T6"!')
+
+        zones, samplings, tilecodes, sizes, unit = self._get_tile_id_tables()
+        chars = names.astype('S19').view(np.uint8).reshape(-1, 19)
+
+        zone = np.searchsorted(zones, chars[:, 0:4].copy().view('S4').ravel())
+        zone = np.minimum(zone, len(zones) - 1)
+        valid = zones[zone] == chars[:, 0:4].copy().view('S4').ravel()
+
+        sampling_strs = chars[:, 4:7].copy().view('S3').ravel()
+        sorter = np.argsort(samplings)
+        sampling = sorter[np.minimum(np.searchsorted(samplings, sampling_strs, sorter=sorter),
+                                     len(samplings) - 1)]
+        valid &= samplings[sampling] == sampling_strs
+
+        tilecode = tilecodes[sampling]
+        tilecode_strs = np.array(self._static_tilecodes, dtype='S2')[tilecode]
+        valid &= chars[:, 17:19].copy().view('S2').ravel() == tilecode_strs
+        valid &= np.all(chars[:, 7:10] == np.frombuffer(b'M_E', dtype=np.uint8), axis=1)
+        valid &= chars[:, 13] == ord('N')
+
+        digits = chars[:, [10, 11, 12, 14, 15, 16]].astype(np.int64) - ord('0')
+        valid &= np.all((digits >= 0) & (digits <= 9), axis=1)
+        cols = (digits[:, 0] * 100 + digits[:, 1] * 10 + digits[:, 2]) * 100000 // unit
+        rows = (digits[:, 3] * 100 + digits[:, 4] * 10 + digits[:, 5]) * 100000 // unit
+        valid &= (cols % sizes[tilecode] == 0) & (rows % sizes[tilecode] == 0)
+
+        if not np.all(valid):
+            raise ValueError('"{}" is not a valid tilename!'.format(names[~valid][0]))
+
+        return tileset.encode_footprint_ids(zone, tilecode, cols, rows,
+                                            sampling_codes=sampling + 1)
+
+
+    def ids2tilenames(self, ids):
+        """
+        Converts canonical 64-bit tile IDs to tilenames, vectorised over many IDs.
+        see tilenames2ids()
+
+        Parameters
+        ----------
+        ids : array_like of int
+            tile IDs
+
+        Returns
+        -------
+        list of str
+            names of the tiles in longform
+        """
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        if ids.size == 0:
+            return []
+
+        zones, samplings, tilecodes, sizes, unit = self._get_tile_id_tables()
+        zone, tilecode, cols, rows = tileset.decode_footprint_ids(ids)
+        sampling = tileset.decode_sampling_codes(ids) - 1
+
+        valid = (zone < len(zones))
+        valid &= (sampling >= 0) & (sampling < len(samplings))
+        valid &= tilecode == tilecodes[np.clip(sampling, 0, len(samplings) - 1)]
+        east = cols * unit // 100000
+        north = rows * unit // 100000
+        valid &= (east >= 0) & (east < 1000) & (north >= 0) & (north < 1000)
+        if not np.all(valid):
+            raise ValueError('{} is not a valid tile ID!'.format(ids[~valid][0]))
+
+        names = np.char.add(zones[zone].astype(str), samplings[sampling].astype(str))
+        names = np.char.add(names, 'M_E')
+        names = np.char.add(names, np.char.zfill(east.astype(str), 3))
+        names = np.char.add(names, 'N')
+        names = np.char.add(names, np.char.zfill(north.astype(str), 3))
+        names = np.char.add(names, np.array(self._static_tilecodes)[tilecode])
+        return names.tolist()
+
+
+    def get_tiles_footprint_geog(self, tilenames, segment=25000, as_geometry=False):
+        """
+        Fast path to the extent of many tiles in the lon-lat-space,
+        without creating UTMTile objects.
+        see TilingSystem.get_tiles_footprint_geog()
+
+        Parameters
+        ----------
+        tilenames : list of str
+            names of the tiles in longform, e.g. ['Z17S500M_E012N018T6', ...]
+        segment : number, optional
+            distance in metres between the sampled points along the tile
+            edges. default is 25000.
+        as_geometry : bool, optional
+            if True, the footprints are returned as OGRGeometry objects,
+            split at the antimeridian. default is False.
+
+        Returns
+        -------
+        polygon_geog : tuple of numpy.ndarray, or list of OGRGeometry
+            lon and lat arrays of shape (n_tiles, n_points), holding the
+            closed outlines of the tiles, in the order of tilenames.
+        bbox_geog : numpy.ndarray
+            array of shape (n_tiles, 4) holding the bounding boxes as
+            (lonmin, latmin, lonmax, latmax)
+        """
+
+        zones = np.array([name[0:4] for name in tilenames])
+
+        polygons = [None] * len(tilenames)
+        bboxes = np.zeros((len(tilenames), 4))
+        lons, lats = None, None
+
+        for zone in np.unique(zones):
+            idx = np.nonzero(zones == zone)[0]
+            tilesys = self.subgrids[zone].tilesys
+            lowerlefts = [tilesys.tilename2lowerleft(tilenames[i]) for i in idx]
+            llx, lly = np.array(lowerlefts).reshape(-1, 2).T
+
+            polygon_geog, bboxes[idx] = tilesys.get_tiles_footprint_geog(
+                llx, lly, segment=segment, as_geometry=as_geometry)
+
+            if as_geometry:
+                for i, polygon in zip(idx, polygon_geog):
+                    polygons[i] = polygon
+            else:
+                if lons is None:
+                    lons = np.zeros((len(tilenames), polygon_geog[0].shape[1]))
+                    lats = np.zeros_like(lons)
+                lons[idx], lats[idx] = polygon_geog
+
+        if as_geometry:
+            return polygons, bboxes
+        else:
+            return (lons, lats), bboxes
+
+
+    def lonlat2zone(self, lon, lat):
+        """
+        Returns the UTM/UPS zones of lon-lat coordinates, computed
+        arithmetically (including the zone exceptions around Norway
+        and Svalbard), as defined by the zone extents. Points on the edge
+        between zones are assigned to the zone east or north of the edge
+        (to the polar zones at the latitudes -80 and 84 only beyond them).
+
+        Parameters
+        ----------
+        lon : number or array_like
+            longitude coordinates
+        lat : number or array_like
+            latitude coordinates
+
+        Returns
+        -------
+        numpy.ndarray
+            subgrid IDs, e.g. 'Z33N'
+        """
+        return np.array(self._static_subgrid_ids)[self._lonlat2zone_index(lon, lat)]
+
+
+    def _lonlat2zone_index(self, lon, lat):
+        """
+        Internal function: returns the index of the zones (in
+        _static_subgrid_ids) of lon-lat coordinates. see lonlat2zone()
+        """
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64),
+                                       np.asarray(lat, dtype=np.float64))
+        lon = (lon + 180.0) % 360.0 - 180.0
+
+        number = np.clip(np.floor((lon + 180.0) / 6.0).astype(np.int64) + 1, 1, 60)
+        # south-western Norway
+        number = np.where((lat >= 56.0) & (lat < 64.0) & (lon >= 3.0) & (lon < 12.0),
+                          32, number)
+        # Svalbard
+        svalbard = (lat >= 72.0) & (lat <= 84.0) & (lon >= 0.0) & (lon < 42.0)
+        number = np.where(svalbard,
+                          np.array([31, 33, 35, 37])[np.searchsorted([9.0, 21.0, 33.0], lon,
+                                                                     side='right').clip(0, 3)],
+                          number)
+
+        zones = np.array(['Z{:02d}{}'.format(n, h) for h in 'NS' for n in range(1, 61)])
+        lookup = np.searchsorted(self._static_subgrid_ids, zones)
+        index = lookup[np.where(lat >= 0.0, 0, 60) + number - 1]
+
+        # polar zones (UPS)
+        polar = np.array([self._static_subgrid_ids.index(z)
+                          for z in ['Z00A', 'Z00B', 'Z00Y', 'Z00Z']])
+        index = np.where(lat < -80.0, polar[(lon >= 0.0).astype(np.int64)], index)
+        index = np.where(lat > 84.0, polar[2 + (lon >= 0.0).astype(np.int64)], index)
+        return index
+
+
+    @timed('lonlat2xy', vertices=None)
+    def lonlat2xy(self, lon, lat, subgrid=None):
+        """
+        converts latitude and longitude coordinates to TPS grid coordinates.
+        the zones are found arithmetically, and the coordinates are
+        projected in bulk per zone.
+
+        Parameters
+        ----------
+        lon : list of numbers
+            longitude coordinates
+        lat : list of numbers
+            latitude coordinates
+        subgrid : str, optional
+             acronym / subgrid ID to search within (speeding up)
+             forces to find coordinates in given subgrid
+             --> can return outlying or negative coordinates!
+
+        Returns
+        -------
+        subgrid : numpy.ndarray of str
+            subgrid ID in which the returned x, y coordinates are defined
+        x, y : numpy.ndarray of float
+            TPS grid coordinates; 0-d arrays for scalar input, as returned
+            by the former per-point lookup (through np.vectorize)
+        """
+        if subgrid is not None:
+            return self._lonlat2xy_subgrid(lon, lat, subgrid)
+
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64),
+                                       np.asarray(lat, dtype=np.float64))
+        index = self._lonlat2zone_index(lon, lat)
+
+        # project the points per zone
+        x, y = self._transform_per_subgrid(self._static_subgrid_ids, index, lon, lat,
+                                           to_geog=False)
+
+        # indexing with a 0-d index gives a str, keep the 0-d array instead
+        return np.asarray(np.array(self._static_subgrid_ids)[index]), x, y
 
 
     def lonlat2xy_MGRS(self, lon, lat, subgrid=None):
@@ -309,9 +692,6 @@ class UTMGrid(TiledProjectionSystem):
             latitude coordinates
         subgrid : str
             optional: acronym / subgrid ID to search within (speeding up)
-        return_lat_band : bool
-            optional: if set to True, the zone code with the latitude letter
-            is returned (used e.g. for the MGRS coordinates)
 
         Returns
         -------
@@ -321,14 +701,41 @@ class UTMGrid(TiledProjectionSystem):
             TPS grid coordinates
         """
 
-        zone, x, y = super(UTMGrid, self).lonlat2xy(lon, lat, subgrid=subgrid)
-
-        vfunc = np.vectorize(self._return_latitude_band)
-        zone = vfunc(zone, lon, lat)
+        zone, x, y = self.lonlat2xy(lon, lat, subgrid=subgrid)
+        bands = self.get_latitude_bands(lon, lat)
+        zone = np.char.add(np.broadcast_to(zone, bands.shape).astype('U3'), bands)
 
         return zone, x, y
 
 
+    def get_latitude_bands(self, lon, lat):
+        """
+        Returns the MGRS latitude band letters of lon-lat coordinates
+        (A/B and Y/Z for the polar regions)
+
+        Parameters
+        ----------
+        lon : number or array_like
+            longitude coordinates
+        lat : number or array_like
+            latitude coordinates
+
+        Returns
+        -------
+        numpy.ndarray
+            latitude band letters
+        """
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64),
+                                       np.asarray(lat, dtype=np.float64))
+        bands = np.array(list(_MGRS_BANDS))[
+            np.clip(np.searchsorted(_MGRS_BAND_EDGES, lat, side='right') - 1,
+                    0, len(_MGRS_BANDS) - 1)]
+        east = lon >= 0.0
+        bands = np.where(lat < -80.0, np.where(east, 'B', 'A'), bands)
+        bands = np.where(lat > 84.0, np.where(east, 'Z', 'Y'), bands)
+        return bands
+
+
     def _return_latitude_band(self, subgrid, lon, lat):
         """
         Returns the UTM zone code with the latitude letter
@@ -349,21 +756,292 @@ class UTMGrid(TiledProjectionSystem):
         zone : str
             zone identifier with latitudinal band letter
         """
+        return subgrid[0:3] + str(self.get_latitude_bands(lon, lat))
+
+
+    def lonlat2MGRS(self, lon, lat, precision=5):
+        """
+        Returns the MGRS coordinate strings of lon-lat coordinates,
+        e.g. '31UDQ4825211954' for (2.2945, 48.8584), computed in bulk.
+
+        The string is composed of the zone number and latitude band
+        (only the band for the polar regions), the 100 km square letters,
+        and the easting and northing within the square, truncated to
+        the given number of digits.
+
+        Parameters
+        ----------
+        lon : number or array_like
+            longitude coordinates
+        lat : number or array_like
+            latitude coordinates
+        precision : int, optional
+            number of digits of easting and northing (0 ... 5), i.e.
+            5 (default) for 1 m, 4 for 10 m, ..., 0 for the 100 km square.
+
+        Returns
+        -------
+        str or numpy.ndarray
+            MGRS strings, a str for scalar input
+        """
+        if precision not in range(6):
+            raise ValueError('precision must be within 0 ... 5!')
+
+        scalar = np.ndim(lon) == 0 and np.ndim(lat) == 0
+        lon, lat = np.broadcast_arrays(np.atleast_1d(np.asarray(lon, dtype=np.float64)),
+                                       np.atleast_1d(np.asarray(lat, dtype=np.float64)))
+        shape = lon.shape
+        lon, lat = lon.reshape(-1), lat.reshape(-1)
+
+        zones, x, y = self.lonlat2xy(lon, lat)
+        bands = self.get_latitude_bands(lon, lat)
+        ix = np.floor(x).astype(np.int64)
+        iy = np.floor(y).astype(np.int64)
+        col = ix // 100000
+        row = iy // 100000
+
+        n = len(lon)
+        width = 5 + 2 * precision
+        chars = np.zeros((n, width), dtype=np.uint8)
+        polar = np.char.startswith(zones, 'Z00')
+        utm = ~polar
+
+        # UTM: zone number, band, column and row letter of the 100 km square
+        if np.any(utm):
+            number = zones[utm].astype('S4').view(np.uint8).reshape(-1, 4)[:, 1:3]
+            chars[utm, 0:2] = number
+            chars[utm, 2] = bands[utm].astype('S1').view(np.uint8)
+            group = ((number[:, 0] - 48) * 10 + number[:, 1] - 48 - 1) % 6
+            cols = np.frombuffer(b'ABCDEFGHJKLMNPQRSTUVWXYZ', dtype=np.uint8)
+            rows = np.frombuffer(b'ABCDEFGHJKLMNPQRSTUV', dtype=np.uint8)
+            chars[utm, 3] = cols[(group % 3) * 8 + np.clip(col[utm] - 1, 0, 7)]
+            chars[utm, 4] = rows[(row[utm] + np.where(group % 2 == 1, 5, 0)) % 20]
+            self._add_mgrs_digits(chars[:, 5:], utm, ix, iy, precision)
+
+        # UPS: band, column and row letter of the 100 km square
+        if np.any(polar):
+            chars[polar, 0] = bands[polar].astype('S1').view(np.uint8)
+            band = np.searchsorted(np.array(['A', 'B', 'Y', 'Z']), bands[polar])
+            for i, (letters, min_col) in enumerate(_UPS_COLUMNS):
+                sel = np.nonzero(polar)[0][band == i]
+                letters = np.frombuffer(letters, dtype=np.uint8)
+                chars[sel, 1] = letters[np.clip(col[sel] - min_col, 0, len(letters) - 1)]
+                row_letters, min_row = _UPS_ROWS[i // 2]
+                row_letters = np.frombuffer(row_letters, dtype=np.uint8)
+                chars[sel, 2] = row_letters[np.clip(row[sel] - min_row, 0, len(row_letters) - 1)]
+            self._add_mgrs_digits(chars[:, 3:], polar, ix, iy, precision)
+
+        mgrs = chars.view('S{}'.format(width)).reshape(-1).astype(str)
+        if scalar:
+            return str(mgrs[0])
+        return mgrs.reshape(shape)
+
+
+    @staticmethod
+    def _add_mgrs_digits(chars, selection, ix, iy, precision):
+        """
+        Internal function: writes the easting and northing digits within
+        the 100 km square to the character array (in place).
+        """
+        if precision == 0:
+            return
+        powers = 10 ** np.arange(precision - 1, -1, -1, dtype=np.int64)
+        easting = (ix[selection] % 100000) // 10 ** (5 - precision)
+        northing = (iy[selection] % 100000) // 10 ** (5 - precision)
+        rows = np.nonzero(selection)[0]
+        chars[rows[:, np.newaxis], np.arange(precision)] = \
+            (easting[:, np.newaxis] // powers) % 10 + 48
+        chars[rows[:, np.newaxis], np.arange(precision, 2 * precision)] = \
+            (northing[:, np.newaxis] // powers) % 10 + 48
+
+
+    def _xy2lonlat_per_zone(self, zone_index, x, y):
+        """
+        Internal function: converts projected coordinates to lon-lat,
+        with one transformation per zone.
+
+        Parameters
+        ----------
+        zone_index : numpy.ndarray
+            index of the zones (in _static_subgrid_ids) of the coordinates
+        x, y : numpy.ndarray
+            projected coordinates, in the projection of their zone
+
+        Returns
+        -------
+        lon, lat : numpy.ndarray
+            lon-lat coordinates
+        """
+        return self._transform_per_subgrid(self._static_subgrid_ids,
+                                           np.asarray(zone_index).reshape(-1),
+                                           x, y, to_geog=True)
+
+
+    def tilenames2lonlat(self, tilenames, anchor='center'):
+        """
+        Returns the lon-lat coordinates of an anchor point of tiles,
+        vectorised over many tilenames (of any sampling),
+        without creating UTMTile objects.
+
+        Parameters
+        ----------
+        tilenames : list of str
+            names of the tiles in longform, e.g. 'Z33N010M_E004N052T1'
+        anchor : str, optional
+            'center' (default), or the corner 'll', 'lr', 'ul', 'ur'
+
+        Returns
+        -------
+        lon, lat : numpy.ndarray
+            lon-lat coordinates of the anchors
+        """
+        offsets = {'center': (0.5, 0.5), 'll': (0, 0), 'lr': (1, 0),
+                   'ul': (0, 1), 'ur': (1, 1)}
+        if anchor not in offsets:
+            raise ValueError('anchor must be one of {}!'.format(sorted(offsets)))
 
-        if lat < -80:
-            letter = 'A' if lon < 0 else 'B'
-        if lat < 0.0 and lat >= -80.0:
-            letter = ['C', 'D', 'E', 'F', 'G', 'H', 'J', 'K', 'L', 'M'][
-                int(np.floor((lat + 80) / 8))]
-        if lat >= 0.0 and lat <= 84.0:
-            letter = ['N', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'X'][
-                int(np.floor((lat) / 8))]
-        if lat > 84.0:
-            letter = 'X' if lon < 0 else 'Z'
+        sizes, unit = tileset.get_tilecode_sizes(self)
+        zone_index, tilecode, cols, rows = tileset.decode_footprint_ids(
+            self.tilenames2ids(tilenames))
+        dx, dy = offsets[anchor]
+        x = (cols + dx * sizes[tilecode]) * float(unit)
+        y = (rows + dy * sizes[tilecode]) * float(unit)
+        return self._xy2lonlat_per_zone(zone_index, x, y)
 
-        zone_code = subgrid[0:3] + letter
 
-        return zone_code
+    def MGRS2lonlat(self, mgrs, anchor='center'):
+        """
+        Returns the lon-lat coordinates of MGRS references, computed in bulk.
+        see lonlat2MGRS()
+
+        Parameters
+        ----------
+        mgrs : str or list of str
+            MGRS strings, e.g. '31UDQ4825211954' or '31U DQ 48252 11954'
+            (of any precision, with or without leading zero of the zone number)
+        anchor : str, optional
+            'center' (default) for the centre of the cell referenced by the
+            string (e.g. of the 10 m cell for a precision of 4 digits),
+            or 'll' for its lower-left corner
+
+        Returns
+        -------
+        lon, lat : float or numpy.ndarray
+            lon-lat coordinates, floats for a single string
+        """
+        if anchor not in ['center', 'll']:
+            raise ValueError('anchor must be one of "center", "ll"!')
+
+        scalar = isinstance(mgrs, str)
+        refs = np.char.upper(np.char.replace(np.atleast_1d(np.asarray(mgrs, dtype=str)), ' ', ''))
+        # number of digits of the zone number; none for the polar regions
+        n_lead = np.char.str_len(refs) - np.char.str_len(np.char.lstrip(refs, '0123456789'))
+        refs = np.where(n_lead == 1, np.char.add('0', refs), refs)
+
+        zone_index = np.zeros(len(refs), dtype=np.int64)
+        x = np.zeros(len(refs), dtype=np.float64)
+        y = np.zeros(len(refs), dtype=np.float64)
+        polar = n_lead == 0
+        lengths = np.char.str_len(refs) - np.where(polar, 3, 5)
+        if np.any((lengths < 0) | (lengths % 2 == 1) | (lengths > 10)):
+            raise ValueError('"{}" is not a valid MGRS reference!'.format(
+                refs[(lengths < 0) | (lengths % 2 == 1) | (lengths > 10)][0]))
+
+        for is_polar in [False, True]:
+            for n_digits in np.unique(lengths[polar == is_polar]):
+                sel = np.nonzero((polar == is_polar) & (lengths == n_digits))[0]
+                n_head = 3 if is_polar else 5
+                chars = refs[sel].astype('S{}'.format(n_head + n_digits)).view(
+                    np.uint8).reshape(len(sel), -1)
+                precision = n_digits // 2
+                cell = 10.0 ** (5 - precision)
+                powers = 10 ** np.arange(precision - 1, -1, -1, dtype=np.int64)
+                digits = chars[:, n_head:].astype(np.int64) - 48
+                if np.any((digits < 0) | (digits > 9)):
+                    raise ValueError('"{}" is not a valid MGRS reference!'.format(
+                        refs[sel][np.any((digits < 0) | (digits > 9), axis=1)][0]))
+                easting = (digits[:, :precision] * powers).sum(axis=1) * cell
+                northing = (digits[:, precision:] * powers).sum(axis=1) * cell
+                if anchor == 'center':
+                    easting = easting + cell / 2.0
+                    northing = northing + cell / 2.0
+                if is_polar:
+                    zone_index[sel], x[sel], y[sel] = self._decode_MGRS_UPS(
+                        refs[sel], chars, easting, northing)
+                else:
+                    zone_index[sel], x[sel], y[sel] = self._decode_MGRS_UTM(
+                        refs[sel], chars, easting, northing)
+
+        lon, lat = self._xy2lonlat_per_zone(zone_index, x, y)
+        if scalar:
+            return float(lon[0]), float(lat[0])
+        return lon, lat
+
+
+    def _decode_MGRS_UTM(self, refs, chars, easting, northing):
+        """
+        Internal function: decodes the zone and the projected coordinates
+        of MGRS references in the UTM zones. The 100 km row letters repeat
+        every 2000 km, hence the northing is taken as the first one above
+        the southern edge of the latitude band.
+        """
+        number = (chars[:, 0].astype(np.int64) - 48) * 10 + chars[:, 1] - 48
+        band_index = _letter_lookup(_MGRS_BANDS)[chars[:, 2]]
+        col = _letter_lookup('ABCDEFGHJKLMNPQRSTUVWXYZ')[chars[:, 3]]
+        row = _letter_lookup('ABCDEFGHJKLMNPQRSTUV')[chars[:, 4]]
+
+        group = (number - 1) % 6
+        invalid = (number < 1) | (number > 60) | (band_index < 0) | (row < 0)
+        invalid |= (col < (group % 3) * 8) | (col >= (group % 3) * 8 + 8)
+        col = col - (group % 3) * 8
+        row = (row - np.where(group % 2 == 1, 5, 0)) % 20
+        if np.any(invalid):
+            raise ValueError('"{}" is not a valid MGRS reference!'.format(refs[invalid][0]))
+
+        north = band_index >= _MGRS_BANDS.index('N')
+        zones = np.char.add(np.char.add('Z', np.char.zfill(number.astype(str), 2)),
+                            np.where(north, 'N', 'S'))
+        zone_index = np.searchsorted(self._static_subgrid_ids, zones)
+
+        # northing of the southern band edge at the central meridian
+        band_lat = _MGRS_BAND_EDGES[band_index]
+        band_lon = (number - 1) * 6.0 - 180.0 + 3.0
+        band_y = np.empty(len(refs), dtype=np.float64)
+        for index in np.unique(zone_index):
+            sel = zone_index == index
+            proj4 = self.subgrids[self._static_subgrid_ids[index]].core.projection.proj4
+            band_y[sel] = get_transformer('EPSG:4326', proj4).transform(
+                band_lon[sel], band_lat[sel])[1]
+
+        x = (col + 1) * 100000.0 + easting
+        base = band_y - 100000.0
+        y = base + (row * 100000.0 + northing - base) % 2000000.0
+        return zone_index, x, y
+
+
+    def _decode_MGRS_UPS(self, refs, chars, easting, northing):
+        """
+        Internal function: decodes the zone and the projected coordinates
+        of MGRS references in the polar zones (UPS).
+        """
+        zone_index = np.zeros(len(refs), dtype=np.int64)
+        x = np.zeros(len(refs), dtype=np.float64)
+        y = np.zeros(len(refs), dtype=np.float64)
+        invalid = np.zeros(len(refs), dtype=bool)
+        for i, band in enumerate('ABYZ'):
+            sel = chars[:, 0] == ord(band)
+            col_letters, min_col = _UPS_COLUMNS[i]
+            row_letters, min_row = _UPS_ROWS[i // 2]
+            col = _letter_lookup(col_letters.decode())[chars[sel, 1]]
+            row = _letter_lookup(row_letters.decode())[chars[sel, 2]]
+            invalid[sel] = (col < 0) | (row < 0)
+            zone_index[sel] = self._static_subgrid_ids.index('Z00' + band)
+            x[sel] = (min_col + col) * 100000.0 + easting[sel]
+            y[sel] = (min_row + row) * 100000.0 + northing[sel]
+        invalid |= ~np.isin(chars[:, 0], np.frombuffer(b'ABYZ', dtype=np.uint8))
+        if np.any(invalid):
+            raise ValueError('"{}" is not a valid MGRS reference!'.format(refs[invalid][0]))
+        return zone_index, x, y
 
 
     def lonlat2ij_in_tile(self, lon, lat, lowerleft=False):
@@ -472,8 +1150,36 @@ class UTMTilingSystem(TilingSystem):
                     'must be multiples of {}00km!'.format(
             self.core.tile_ysize_m // 100000)
         self.msg3 = 'Tilecode must be one of T6, T3, T1!'
+        self.msg4 = 'No land information for {}{} in the static data! ' \
+                    'Rebuild utmgrid.dat with make_utmdata(..., ' \
+                    'landmask=...).'.format(self.core.tag, self.core.tiletype)
+
+        # land fractions of the tiles as uint8 (0...255), rows from bottom
+        # to top (None if not available); a tile covers land if > 0
+        data = UTMGrid._static_data[self.core.tag]
+        landfraction = data.get('landfraction', {}).get(self.core.tiletype)
+        if landfraction is not None:
+            landfraction = np.frombuffer(landfraction['fraction'], dtype=np.uint8)\
+                .reshape(landfraction['shape'])
+        self._landfraction = landfraction
+
+        # run-length encoded zone masks of tiles, by (llx, lly, decimation)
+        self._zone_masks = dict()
+
+        # neighbours in other zones of the tiles at the zone edge,
+        # built on first use
+        self._adjacency = None
+
 
+    @property
+    def has_land_data(self):
+        """
+        True if the static data holds the land information of the tiles.
+        """
+        return self._landfraction is not None
 
+
+    @timed('create_tile', vertices=None)
     def create_tile(self, name=None, x=None, y=None):
         """
         Returns a UTMTile object
@@ -511,10 +1217,16 @@ class UTMTilingSystem(TilingSystem):
         # get name of tile (assures long-form of tilename, even if short-form
         # is given)
         name = self._encode_tilename(llx, lly)
-        # set True if land in the tile
-        covers_land = self.check_tile_covers_land(tilename=name)
+        # set True if land in the tile, None if unknown
+        if self.has_land_data:
+            covers_land = self._check_lowerleft_covers_land(llx, lly)
+            land_fraction = self._get_lowerleft_land_fraction(llx, lly)
+        else:
+            covers_land = None
+            land_fraction = None
 
-        return UTMTile(self.core, name, llx, lly, covers_land=covers_land)
+        return UTMTile(self.core, name, llx, lly, covers_land=covers_land,
+                       land_fraction=land_fraction, tilesys=self)
 
 
     def point2tilename(self, x, y, shortform=False):
@@ -621,7 +1333,7 @@ class UTMTilingSystem(TilingSystem):
             shortform of the tilename
 
         """
-        self.check_tilename(longform)
+        self.decode_tilename(longform)
         if len(longform) == 19:
             shortform = longform[9:]
         return shortform
@@ -668,6 +1380,27 @@ class UTMTilingSystem(TilingSystem):
         return check
 
 
+    def check_tile_is_valid(self, tilename):
+        """
+        checks if the tile with the given tilename intersects the zone
+        (see valid_tiles)
+
+        Parameters
+        ----------
+        tilename : str
+            the tilename in longform e.g. 'Z17S500M_E000N018T6'
+            or in shortform e.g. 'E000N018T6'.
+
+        Returns
+        -------
+        Boolean
+            result of the check; False for tiles outside of the zone
+        """
+
+        _, _, _, llx, lly, _ = self.decode_tilename(tilename)
+        return bool(self.check_lowerleft_is_valid(llx, lly))
+
+
     def decode_tilename(self, tilename):
         """
         Returns the information assigned to the tilename
@@ -842,16 +1575,97 @@ class UTMTilingSystem(TilingSystem):
         Returns
         -------
         Boolean
+            True if the tile covers land
+
+        Raises
+        ------
+        ValueError
+            if no land information is available in the static data
         """
+        llx, lly = self.tilename2lowerleft(tilename)
+        return self._check_lowerleft_covers_land(llx, lly)
 
+
+    def _check_lowerleft_covers_land(self, llx, lly):
         """
-        land_tiles = self.list_tiles_covering_land()
-        if self.check_tilename(tilename):
-            tilename = self.tilename2short(tilename)
-            return tilename in land_tiles
+        checks if the tile with the given lower-left coordinates covers land,
+        i.e. has a land fraction > 0.
+
+        Parameters
+        ----------
+        llx, lly : int
+            lower-left coordinates of the tile
+
+        Returns
+        -------
+        Boolean
+        """
+        return self._get_lowerleft_land_byte(llx, lly) > 0
+
+
+    def get_tile_land_fraction(self, tilename):
+        """
+        returns the fraction of the tile's area covered by land
+
+        Parameters
+        ----------
+        tilename : str
+            the tilename in longform e.g. 'Z17S500M_E000N018T6'
+
+        Returns
+        -------
+        float
+            land fraction between 0.0 and 1.0 (with a resolution of 1/255)
+
+        Raises
+        ------
+        ValueError
+            if no land information is available in the static data
+        """
+        llx, lly = self.tilename2lowerleft(tilename)
+        return self._get_lowerleft_land_fraction(llx, lly)
+
+
+    def _get_lowerleft_land_fraction(self, llx, lly):
+        """
+        looks up the land fraction of the tile with the given lower-left
+        coordinates.
+
+        Parameters
+        ----------
+        llx, lly : int
+            lower-left coordinates of the tile
+
+        Returns
+        -------
+        float
+        """
+        return self._get_lowerleft_land_byte(llx, lly) / 255.0
+
+
+    def _get_lowerleft_land_byte(self, llx, lly):
         """
-        # TODO check_tile_covers_land() not implemented!"
-        return True
+        looks up the land fraction (0...255) of the tile with the given
+        lower-left coordinates in the static data, 0 if outside.
+
+        Parameters
+        ----------
+        llx, lly : int
+            lower-left coordinates of the tile
+
+        Returns
+        -------
+        int
+        """
+        if not self.has_land_data:
+            raise ValueError(self.msg4)
+
+        n_rows, n_cols = self._landfraction.shape
+        row = lly // self.core.tile_ysize_m
+        col = llx // self.core.tile_xsize_m
+        if not (0 <= row < n_rows and 0 <= col < n_cols):
+            return 0
+        return int(self._landfraction[row, col])
 
 
     def list_tiles_covering_land(self):
@@ -861,16 +1675,261 @@ class UTMTilingSystem(TilingSystem):
         Returns
         -------
         list
-            list containing land tiles
+            list containing land tiles (in longform)
+
+        Raises
+        ------
+        ValueError
+            if no land information is available in the static data
+        """
+        if not self.has_land_data:
+            raise ValueError(self.msg4)
+
+        rows, cols = np.nonzero(self._landfraction)
+        llxs = cols * self.core.tile_xsize_m
+        llys = rows * self.core.tile_ysize_m
+
+        return [self._encode_tilename(int(llx), int(lly))
+                for llx, lly in zip(llxs, llys)]
+
+
+    def _get_neighbour_offsets(self):
+        """
+        Internal function: returns the offsets of the lower-left coordinates
+        of the 8 neighbours of a tile, clockwise from the upper-left.
+        """
+        xsize = self.core.tile_xsize_m
+        ysize = self.core.tile_ysize_m
+        dx = np.array([-1, 0, 1, 1, 1, 0, -1, -1], dtype=np.int64) * xsize
+        dy = np.array([1, 1, 1, 0, -1, -1, -1, 0], dtype=np.int64) * ysize
+        return dx, dy
+
+
+    def _get_tile_keys(self, llx, lly):
+        """
+        Internal function: packs the lower-left coordinates of tiles to int64 keys.
+        """
+        offset = 2 ** 20
+        cols = np.asarray(llx, dtype=np.int64) // self.core.tile_xsize_m + offset
+        rows = np.asarray(lly, dtype=np.int64) // self.core.tile_ysize_m + offset
+        return (cols << 32) | rows
+
+
+    @property
+    def adjacency(self):
+        """
+        adjacency table of the tiles at the zone edge, holding their
+        neighbours in other zones. built on first use.
+
+        Returns
+        -------
+        keys : numpy.ndarray
+            sorted int64 keys of the edge tiles (see _get_tile_keys())
+        offsets : numpy.ndarray
+            the neighbours of the edge tile keys[i] are found at
+            [offsets[i]:offsets[i + 1]] in the following arrays
+        subgrid_codes, llx, lly : numpy.ndarray
+            subgrid codes (see TileSet) and lower-left coordinates
+            of the neighbours
+        """
+        if self._adjacency is None:
+            self._adjacency = self._build_adjacency()
+        return self._adjacency
+
+
+    def _build_adjacency(self):
         """
+        Internal function: finds the neighbours in other zones of the tiles
+        at the zone edge, i.e. of the tiles having neighbour positions outside
+        the zone. The neighbours at such a position are the tiles of other
+        zones whose footprint overlaps the footprint of the position and
+        intersects the footprint of the edge tile; the (projected) bounding
+        box of the position only preselects them.
 
+        Returns
+        -------
+        tuple
+            see adjacency
         """
-        land_tiles = UTMGrid._static_data[
-            self.core.tag]["coverland"][self.core.tiletype]
-        return list(land_tiles)
+        xsize = self.core.tile_xsize_m
+        ysize = self.core.tile_ysize_m
+        llx0, lly0, n_rows, n_cols = self._get_valid_tiles_layout()
+        valid = np.pad(self.valid_tiles, 1, mode='constant', constant_values=False)
+
+        # tiles with neighbour positions outside the zone, and these positions
+        dx, dy = self._get_neighbour_offsets()
+        rows, cols = np.nonzero(self.valid_tiles)
+        missing = ~valid[rows[:, np.newaxis] + 1 + dy // ysize,
+                         cols[:, np.newaxis] + 1 + dx // xsize]
+        edge_index, offset_index = np.nonzero(missing)
+        edge_llx = cols * xsize + llx0
+        edge_lly = rows * ysize + lly0
+        cell_llx = edge_llx[edge_index] + dx[offset_index]
+        cell_lly = edge_lly[edge_index] + dy[offset_index]
+
+        cell_keys, cell_index = np.unique(self._get_tile_keys(cell_llx, cell_lly),
+                                          return_inverse=True)
+        cell_index = cell_index.reshape(-1)
+        first = np.zeros(len(cell_keys), dtype=np.int64)
+        first[cell_index] = np.arange(len(cell_index))
+        cell_llx, cell_lly = cell_llx[first], cell_lly[first]
+
+        # tiles of the other zones overlapping the cells
+        grid = self._get_grid()
+        subgrid_codes = dict(zip(grid.subgrids.keys(), range(len(grid.subgrids))))
+        found = list()
+        neighbour_polygons = list()
+        if len(cell_keys) > 0:
+            (lon, lat), bbox = self.get_tiles_footprint_geog(cell_llx, cell_lly)
+            polygons, _ = self._footprints2geometries(lon, lat, bbox, as_geometry=True)
+            for subgrid_id, subgrid in grid.subgrids.items():
+                if subgrid_id == self.core.tag:
+                    continue
+                lonmin, lonmax, latmin, latmax = subgrid.polygon_geog.GetEnvelope()
+                candidates = np.nonzero((bbox[:, 1] <= latmax) & (bbox[:, 3] >= latmin))[0]
+                candidates = [i for i in candidates
+                              if polygons[i].Intersects(subgrid.polygon_geog)]
+                if not candidates:
+                    continue
+
+                x, y = get_transformer('EPSG:4326', subgrid.core.projection.proj4).transform(
+                    lon[candidates], lat[candidates])
+                col_min = np.floor(x.min(axis=1) / xsize).astype(np.int64)
+                col_max = np.ceil(x.max(axis=1) / xsize).astype(np.int64)
+                row_min = np.floor(y.min(axis=1) / ysize).astype(np.int64)
+                row_max = np.ceil(y.max(axis=1) / ysize).astype(np.int64)
+                c_cell, c_llx, c_lly = list(), list(), list()
+                for i, c0, c1, r0, r1 in zip(candidates, col_min, col_max, row_min, row_max):
+                    nllx, nlly = np.meshgrid(np.arange(c0, c1) * xsize,
+                                             np.arange(r0, r1) * ysize)
+                    nllx, nlly = nllx.ravel(), nlly.ravel()
+                    is_valid = subgrid.tilesys.check_lowerleft_is_valid(nllx, nlly)
+                    c_cell.append(np.full(is_valid.sum(), i, dtype=np.int64))
+                    c_llx.append(nllx[is_valid])
+                    c_lly.append(nlly[is_valid])
+                c_cell, c_llx, c_lly = [np.concatenate(a) for a in (c_cell, c_llx, c_lly)]
+                if len(c_cell) == 0:
+                    continue
+
+                # the tiles overlapping the bounding box must overlap the cell,
+                # touching it is not sufficient
+                c_polygons, _ = subgrid.tilesys.get_tiles_footprint_geog(c_llx, c_lly,
+                                                                         as_geometry=True)
+                overlaps = np.array([polygons[i].Intersects(c) and not polygons[i].Touches(c)
+                                     for i, c in zip(c_cell, c_polygons)], dtype=bool)
+                found.append((c_cell[overlaps],
+                              np.full(overlaps.sum(), subgrid_codes[subgrid_id],
+                                      dtype=np.int64),
+                              c_llx[overlaps], c_lly[overlaps]))
+                neighbour_polygons.extend(c for c, o in zip(c_polygons, overlaps) if o)
+
+        if found:
+            n_cell, n_code, n_llx, n_lly = [np.concatenate(a) for a in zip(*found)]
+        else:
+            n_cell, n_code, n_llx, n_lly = [np.array([], dtype=np.int64)] * 4
+
+        # join edge tiles -> cells -> neighbours
+        order = np.argsort(n_cell, kind='stable')
+        n_cell, n_code, n_llx, n_lly = n_cell[order], n_code[order], n_llx[order], n_lly[order]
+        cell_start = np.searchsorted(n_cell, np.arange(len(cell_keys)))
+        cell_count = np.bincount(n_cell, minlength=len(cell_keys))
+        counts = cell_count[cell_index]
+        pair_tile = np.repeat(edge_index, counts)
+        starts = np.repeat(cell_start[cell_index] - (np.cumsum(counts) - counts), counts)
+        entry = starts + np.arange(counts.sum(), dtype=np.int64)
+
+        # the neighbours must intersect the edge tile as well, which drops
+        # the tiles overlapping only the far side of the cell
+        if len(entry) > 0:
+            pair_edges, pair_index = np.unique(pair_tile, return_inverse=True)
+            edge_polygons, _ = self.get_tiles_footprint_geog(edge_llx[pair_edges],
+                                                             edge_lly[pair_edges],
+                                                             as_geometry=True)
+            adjacent = np.array([edge_polygons[t].Intersects(neighbour_polygons[order[e]])
+                                for t, e in zip(pair_index.reshape(-1), entry)], dtype=bool)
+            pair_tile, entry = pair_tile[adjacent], entry[adjacent]
+
+        tile_keys = self._get_tile_keys(edge_llx, edge_lly)
+        table = np.unique(np.stack((tile_keys[pair_tile], n_code[entry],
+                                    n_llx[entry], n_lly[entry]), axis=1), axis=0)
+        keys, first = np.unique(table[:, 0], return_index=True)
+        offsets = np.append(first, len(table)).astype(np.int64)
+
+        return (keys, offsets, table[:, 1].astype(np.int16),
+                table[:, 2].astype(np.int32), table[:, 3].astype(np.int32))
+
+
+    def get_neighbours_batch(self, llx, lly):
+        """
+        Returns the neighbours of many tiles of the zone, including the
+        neighbours in other zones (for tiles at the zone edge).
+        Neighbours within the zone are found arithmetically, neighbours in
+        other zones by the adjacency table.
+
+        Parameters
+        ----------
+        llx, lly : array_like of int
+            lower-left coordinates of the tiles
+
+        Returns
+        -------
+        index : numpy.ndarray
+            index of the tile (in llx, lly) to which the neighbour belongs
+        neighbours : TileSet
+            the neighbours, grouped by index
+        """
+        llx = np.asarray(llx, dtype=np.int64).reshape(-1)
+        lly = np.asarray(lly, dtype=np.int64).reshape(-1)
+        grid = self._get_grid()
+
+        # neighbours within the zone
+        dx, dy = self._get_neighbour_offsets()
+        nllx = llx[:, np.newaxis] + dx
+        nlly = lly[:, np.newaxis] + dy
+        inside = self.check_lowerleft_is_valid(nllx, nlly)
+        index = np.nonzero(inside)[0]
+        code = TileSet.encode_subgrid_ids(grid, [self.core.tag])[0]
+        codes = np.full(len(index), code, dtype=np.int64)
+        nllx, nlly = nllx[inside], nlly[inside]
+
+        # neighbours in other zones
+        keys, offsets, adj_codes, adj_llx, adj_lly = self.adjacency
+        if len(keys) > 0:
+            tile_keys = self._get_tile_keys(llx, lly)
+            pos = np.minimum(np.searchsorted(keys, tile_keys), len(keys) - 1)
+            is_edge = keys[pos] == tile_keys
+            tiles = np.nonzero(is_edge)[0]
+            counts = offsets[pos[tiles] + 1] - offsets[pos[tiles]]
+            starts = np.repeat(offsets[pos[tiles]] - (np.cumsum(counts) - counts), counts)
+            entry = starts + np.arange(counts.sum(), dtype=np.int64)
+            index = np.concatenate((index, np.repeat(tiles, counts)))
+            codes = np.concatenate((codes, adj_codes[entry]))
+            nllx = np.concatenate((nllx, adj_llx[entry]))
+            nlly = np.concatenate((nlly, adj_lly[entry]))
+
+        order = np.argsort(index, kind='stable')
+        return index[order], TileSet(grid, codes[order], nllx[order], nlly[order])
+
+
+    def get_neighbours(self, tilename):
+        """
+        Returns the names of the (up to 8) neighbours of a tile, including
+        the tiles of other zones bordering the tile at the zone edge.
+
+        Parameters
+        ----------
+        tilename : str
+            the tilename in longform e.g. 'Z33N500M_E000N054T6'
+            or in shortform e.g. 'E000N054T6'.
+
+        Returns
+        -------
+        list of str
+            tilenames of the neighbours (in longform)
         """
-        # TODO list_tiles_covering_land() not implemented!"
-        return True
+        llx, lly = self.tilename2lowerleft(tilename)
+        _, neighbours = self.get_neighbours_batch([llx], [lly])
+        return neighbours.tilenames
 
 
 class UTMTile(Tile):
@@ -880,9 +1939,224 @@ class UTMTile(Tile):
     A tile in the UTMGrid system, holding characteristics of the tile.
     """
 
-    def __init__(self, core, name, xll, yll, covers_land):
+    __slots__ = ('covers_land', 'land_fraction', 'tilesys')
+
+    def __init__(self, core, name, xll, yll, covers_land, land_fraction=None,
+                 tilesys=None):
         super(UTMTile, self).__init__(core, name, xll, yll)
         self.covers_land = covers_land
+        self.land_fraction = land_fraction
+        # the tiling system of the zone, holding the zone's extent
+        self.tilesys = tilesys
+
+    def get_zone_mask(self, decimation=1, rle=False):
+        """
+        returns the mask of the tile's pixels inside the zone,
+        i.e. the zone's polygon_proj rasterized onto the pixel grid.
+        the masks are cached (run-length encoded) by the tiling system.
+
+        Parameters
+        ----------
+        decimation : int, optional
+            factor reducing the pixel grid, e.g. 10 for a mask of
+            blocks of 10x10 pixels. default is 1 (full resolution).
+        rle : bool, optional
+            if True, the mask is returned run-length encoded
+            (see geometry.rle_decode()). default is False.
+
+        Returns
+        -------
+        numpy.ndarray
+            boolean mask of shape (ceil(y_size_px / decimation),
+            ceil(x_size_px / decimation)), ordered from top to bottom,
+            or the lengths of the runs if rle is True
+        """
+        if self.tilesys is None:
+            raise ValueError('Tile has no tiling system, create it with '
+                             'UTMTilingSystem.create_tile()!')
+
+        shape = (int(math.ceil(self.y_size_px / float(decimation))),
+                 int(math.ceil(self.x_size_px / float(decimation))))
+
+        key = (self.llx, self.lly, decimation)
+        runs = self.tilesys._zone_masks.get(key)
+        if runs is None:
+            zone = self.tilesys.polygon_proj
+            if zone.Contains(self.polygon_proj):
+                mask = np.ones(shape, dtype=bool)
+            elif not zone.Intersects(self.polygon_proj):
+                mask = np.zeros(shape, dtype=bool)
+            else:
+                pixelsize = self.core.sampling * decimation
+                geotransform = [self.llx, pixelsize, 0,
+                                self.lly + self.core.tile_ysize_m, 0, -pixelsize]
+                mask = rasterize_geometry(zone, geotransform, shape)
+            runs = rle_encode(mask)
+            runs.setflags(write=False)
+            self.tilesys._zone_masks[key] = runs
+            if rle:
+                return runs
+            return mask
+
+        if rle:
+            return runs
+        return rle_decode(runs, shape)
+
+    @timed('warp_lut', vertices=None)
+    def get_warp_lut(self, target_tile, decimation=16, use_cache=True):
+        """
+        returns the lookup table (LUT) of the pixel coordinates of this tile
+        (the source) at the pixels of a target tile, e.g. of a neighbouring
+        zone, on a pixel grid of the target decimated by the given factor.
+        the LUT is cached on disk (see pytileproj.cache) by tile pair and
+        decimation, and returned memory-mapped. LUTs larger than the
+        bound of the cache size are returned in memory.
+
+        Parameters
+        ----------
+        target_tile : Tile
+            tile to which this tile's pixels are warped
+        decimation : int, optional
+            spacing of the LUT nodes in target pixels. default is 16.
+        use_cache : bool, optional
+            if False, the LUT is computed without using the disk cache.
+
+        Returns
+        -------
+        numpy.ndarray
+            array of shape (2, (y_size_px - 1) // decimation + 2,
+            (x_size_px - 1) // decimation + 2) of the target, holding the
+            fractional column and row (from top to bottom) coordinates in
+            this tile at the centres of the target pixels
+            (0, 0), (0, decimation), ..., (decimation, 0), ...
+            the floored coordinates are the pixel indices.
+        """
+        name = 'warplut_{}_{}_{}'.format(
+            self.name, target_tile.name,
+            cache.get_cache_key(self.core.projection.proj4,
+                                target_tile.core.projection.proj4, decimation))
+        if use_cache:
+            lut = cache.load_array(name, mmap_mode='r')
+            if lut is not None:
+                return lut
+
+        # target pixel centres of the nodes
+        rows = np.arange((target_tile.y_size_px - 1) // decimation + 2) * decimation
+        cols = np.arange((target_tile.x_size_px - 1) // decimation + 2) * decimation
+        x = target_tile.llx + (cols + 0.5) * target_tile.core.sampling
+        y = target_tile.lly + target_tile.core.tile_ysize_m - \
+            (rows + 0.5) * target_tile.core.sampling
+        x, y = np.meshgrid(x, y)
+
+        src_proj4 = self.core.projection.proj4
+        dst_proj4 = target_tile.core.projection.proj4
+        if src_proj4 != dst_proj4:
+            x, y = get_transformer(dst_proj4, src_proj4).transform(x, y)
+
+        lut = np.stack([(x - self.llx) / self.core.sampling,
+                        (self.lly + self.core.tile_ysize_m - y) / self.core.sampling])
+
+        if use_cache and cache.save_array(name, lut):
+            # evicted by a concurrent process, if None
+            lut_cached = cache.load_array(name, mmap_mode='r')
+            if lut_cached is not None:
+                return lut_cached
+        return lut
+
+    def get_warp_indices(self, target_tile, decimation=16, rows=None, use_cache=True):
+        """
+        returns the pixel indices of this tile (the source) at the pixels
+        of a target tile, interpolated bilinearly from the warp LUT
+        (see get_warp_lut()).
+
+        Parameters
+        ----------
+        target_tile : Tile
+            tile to which this tile's pixels are warped
+        decimation : int, optional
+            spacing of the LUT nodes in target pixels. default is 16.
+        rows : slice, optional
+            block of target rows (from top to bottom) to return,
+            limiting the memory use for large tiles. default are all rows.
+        use_cache : bool, optional
+            if False, the LUT is computed without using the disk cache.
+
+        Returns
+        -------
+        i, j : numpy.ndarray
+            pixel column and row (from top to bottom) numbers in this tile,
+            of shape (n_rows, x_size_px) of the target
+        valid : numpy.ndarray
+            boolean mask of the target pixels lying within this tile
+        """
+        lut = self.get_warp_lut(target_tile, decimation=decimation, use_cache=use_cache)
+        return self._interpolate_warp_lut(lut, target_tile, decimation, rows=rows)
+
+    def _interpolate_warp_lut(self, lut, target_tile, decimation, rows=None):
+        """
+        Internal function: interpolates a warp LUT to the pixel indices of
+        a block of target rows, see get_warp_indices().
+        """
+        if rows is None:
+            rows = slice(None)
+        rows = np.arange(target_tile.y_size_px)[rows]
+        cols = np.arange(target_tile.x_size_px)
+
+        # interpolate along the rows, then along the columns
+        node, weight = np.divmod(rows, decimation)
+        weight = (weight / float(decimation))[:, np.newaxis]
+        lut = lut[:, node] * (1.0 - weight) + lut[:, node + 1] * weight
+        node, weight = np.divmod(cols, decimation)
+        weight = weight / float(decimation)
+        lut = lut[:, :, node] * (1.0 - weight) + lut[:, :, node + 1] * weight
+
+        i = np.floor(lut[0]).astype(np.int64)
+        j = np.floor(lut[1]).astype(np.int64)
+        valid = (i >= 0) & (i < self.x_size_px) & (j >= 0) & (j < self.y_size_px)
+        return i, j, valid
+
+    def warp(self, data, target_tile, decimation=16, nodata=0, block_rows=1024,
+             use_cache=True):
+        """
+        warps a pixel array of this tile onto the pixel grid of a target tile,
+        e.g. of a neighbouring zone, with nearest-neighbour resampling.
+        with a cached warp LUT (see get_warp_lut()) this is a gather operation.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            pixel array of this tile, with the rows (from top to bottom) and
+            columns as the last two dimensions
+        target_tile : Tile
+            tile to which the pixel array is warped
+        decimation : int, optional
+            spacing of the LUT nodes in target pixels. default is 16.
+        nodata : number, optional
+            value of the target pixels outside this tile. default is 0.
+        block_rows : int, optional
+            number of target rows processed at once. default is 1024.
+        use_cache : bool, optional
+            if False, the LUT is computed without using the disk cache.
+
+        Returns
+        -------
+        numpy.ndarray
+            pixel array of the target tile, with the leading dimensions of data
+        """
+        data = np.asarray(data)
+        if data.shape[-2:] != (self.y_size_px, self.x_size_px):
+            raise ValueError('data of shape {} does not match the tile shape {}'.format(
+                data.shape[-2:], (self.y_size_px, self.x_size_px)))
+
+        warped = np.full(data.shape[:-2] + (target_tile.y_size_px, target_tile.x_size_px),
+                         nodata, dtype=data.dtype)
+        lut = self.get_warp_lut(target_tile, decimation=decimation, use_cache=use_cache)
+        for start in range(0, target_tile.y_size_px, block_rows):
+            rows = slice(start, start + block_rows)
+            i, j, valid = self._interpolate_warp_lut(lut, target_tile, decimation, rows=rows)
+            block = warped[..., rows, :]
+            block[..., valid] = data[..., j[valid], i[valid]]
+        return warped
 
     @property
     def shortname(self):
@@ -19,7 +19,11 @@ Tests for the geometry module of pytielproj.
 """
 import unittest
 
+from osgeo import osr
+
+from pytileproj import instrument
 from pytileproj.geometry import split_polygon_by_antimeridian
+from pytileproj.geometry import transform_geometry
 from pytileproj.geometry import setup_test_geom_siberia_alaska
 from pytileproj.geometry import setup_test_geom_spitzbergen
 
@@ -47,4 +51,51 @@ class TestGeometry(unittest.TestCase):
         self.assertAlmostEqual(geom_spitzbergen.Area() * 2,
                                result.GetGeometryRef(0).Area() +
                                result.Area(),
-                               places=6)
\ No newline at end of file
+                               places=6)
+
+
+    def test_transform_geometry_adaptive(self):
+
+        geom_spitzbergen = setup_test_geom_spitzbergen()
+        utm_sr = osr.SpatialReference()
+        utm_sr.ImportFromProj4('+proj=utm +zone=33 +datum=WGS84 +units=m +no_defs')
+
+        # reference with very dense fixed segments
+        reference = transform_geometry(geom_spitzbergen, utm_sr, segment=0.001)
+        adaptive = transform_geometry(geom_spitzbergen, utm_sr, tolerance=1.0)
+
+        n_reference = reference.GetGeometryRef(0).GetPointCount()
+        n_adaptive = adaptive.GetGeometryRef(0).GetPointCount()
+
+        assert n_adaptive < n_reference / 10
+        self.assertAlmostEqual(adaptive.Area() / reference.Area(), 1.0, places=4)
+
+        # a coarser tolerance needs less vertices
+        coarse = transform_geometry(geom_spitzbergen, utm_sr, tolerance=1000.0)
+        assert coarse.GetGeometryRef(0).GetPointCount() < n_adaptive
+
+
+    def test_instrument_record(self):
+
+        geom_spitzbergen = setup_test_geom_spitzbergen()
+        utm_sr = osr.SpatialReference()
+        utm_sr.ImportFromProj4('+proj=utm +zone=33 +datum=WGS84 +units=m +no_defs')
+
+        calls = list()
+        hook = lambda stage, elapsed, vertices: calls.append(stage)
+        instrument.add_hook(hook)
+        with instrument.record() as stats:
+            result = transform_geometry(geom_spitzbergen, utm_sr, segment=0.1)
+        instrument.remove_hook(hook)
+
+        assert not instrument.is_enabled()
+        assert stats['transform_geometry']['calls'] == 1
+        assert stats['segmentize']['calls'] == 1
+        assert stats['transform_geometry']['time'] >= stats['segmentize']['time']
+        assert stats['transform_geometry']['vertices'] == \
+            result.GetGeometryRef(0).GetPointCount()
+        assert calls == ['segmentize', 'transform_geometry']
+
+        # nothing is recorded when disabled
+        transform_geometry(geom_spitzbergen, utm_sr, segment=0.1)
+        assert stats['transform_geometry']['calls'] == 1
@@ -18,13 +18,33 @@
 """
 Tests for the UTMGrid().
 """
+import os
+import pickle
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 import numpy as np
 import numpy.testing as nptest
+from osgeo import ogr
+from osgeo import osr
 
+try:
+    import mgrs
+except ImportError:
+    mgrs = None
+
+from pytileproj import cache
 from pytileproj.utmgrid import UTMGrid
+from pytileproj.tileset import TileSet, get_curve_order
 from pytileproj.geometry import setup_test_geom_spitzbergen
 from pytileproj.geometry import setup_geom_kamchatka
+from pytileproj.geometry import get_geog_spatial_ref
+from pytileproj.geometry import iter_geometries
+from pytileproj.geometry import write_features
+from pytileproj.geometry import rle_decode
+from pytileproj.geometry import bbox2polygon
+from pytileproj.data.utm.make_utmdata import compute_land_fractions
 
 
 # ### for testing at BBM machine
@@ -37,6 +57,26 @@ from pytileproj.geometry import setup_geom_kamchatka
 # os.environ["GDAL_DATA"] = r"C:\Program Files\GDAL\gdal-data"
 # os.environ["GDAL_DRIVER_PAT"] = r"C:\Program Files\GDAL\gdalplugins"
 
+# cache directory of the tests, keeping the user's cache untouched
+_cache_dir = None
+_environ_cache_dir = None
+
+
+def setUpModule():
+    global _cache_dir, _environ_cache_dir
+    _cache_dir = tempfile.mkdtemp()
+    _environ_cache_dir = os.environ.get('PYTILEPROJ_CACHE_DIR')
+    os.environ['PYTILEPROJ_CACHE_DIR'] = _cache_dir
+
+
+def tearDownModule():
+    if _environ_cache_dir is None:
+        del os.environ['PYTILEPROJ_CACHE_DIR']
+    else:
+        os.environ['PYTILEPROJ_CACHE_DIR'] = _environ_cache_dir
+    shutil.rmtree(_cache_dir)
+
+
 class TestBaseViaUTMGrid(unittest.TestCase):
 
     def test_lonlat2xy_doubles(self):
@@ -70,7 +110,7 @@ class TestBaseViaUTMGrid(unittest.TestCase):
         nptest.assert_allclose(y_should, y)
 
 
-    def ctest_lonlat2xy_MGRS_numpy_array(self):
+    def test_lonlat2xy_MGRS_numpy_array(self):
         """
         Tests lonlat to xy projection using numpy arrays.
         """
@@ -402,5 +442,850 @@ class TestBaseViaUTMGrid(unittest.TestCase):
         assert sorted(coarse_tiles_longform) == ['Z33N500M_E000N054T6', 'Z33N500M_E000N060T6']
 
 
+    def test_tile_geometry_adaptive(self):
+        """
+        Tests the tile extent in lonlat-space derived with the
+        adaptive segmentization.
+        """
+        utm = UTMGrid(500)
+        utm_adaptive = UTMGrid(500, tolerance=10)
+
+        tile = utm.Z33N.tilesys.create_tile('Z33N500M_E000N054T6')
+        tile_adaptive = utm_adaptive.Z33N.tilesys.create_tile('Z33N500M_E000N054T6')
+
+        nptest.assert_allclose(tile.bbox_geog, tile_adaptive.bbox_geog, atol=1e-3)
+        assert tile_adaptive.bbox_proj == tile.bbox_proj
+
+
+    def test_get_tiles_footprint_geog(self):
+        """
+        Tests the fast path to the tile extents in lonlat-space against
+        the extents of the tile objects.
+        """
+        utm = UTMGrid(500)
+
+        tilenames = ['Z33N500M_E000N054T6', 'Z60N500M_E006N060T6',
+                     'Z13S500M_E000N060T6']
+        (lons, lats), bboxes = utm.get_tiles_footprint_geog(tilenames)
+
+        assert lons.shape == lats.shape
+        assert bboxes.shape == (3, 4)
+        for tilename, bbox in zip(tilenames, bboxes):
+            nptest.assert_allclose(bbox, utm.get_tile_bbox_geog(tilename), atol=1e-3)
+
+        polygons, _ = utm.get_tiles_footprint_geog(tilenames, as_geometry=True)
+        tile = utm.create_tile('Z33N500M_E000N054T6')
+        self.assertAlmostEqual(polygons[0].Area(), tile.polygon_geog.Area(), places=3)
+
+
+    def test_export_tiles(self):
+        """
+        Tests the export of the tile footprints to a vector file.
+        """
+        utm = UTMGrid(500)
+        tmpdir = tempfile.mkdtemp()
+        fname = os.path.join(tmpdir, 'utm_tiles.geojson')
+
+        try:
+            n_tiles = utm.export_tiles(fname, format='geojson',
+                                       subgrid_ids=['Z33N', 'Z60N'], batch_size=5)
+
+            llx, _ = utm.Z33N.tilesys.identify_tiles_in_subgrid()
+            assert n_tiles > len(llx)
+
+            ds = ogr.Open(fname)
+            layer = ds.GetLayer(0)
+            assert layer.GetFeatureCount() == n_tiles
+            names = [feature.GetField('name') for feature in layer]
+            assert 'Z33N500M_E000N054T6' in names
+            assert 'Z60N500M_E006N060T6' in names
+            ds = None
+
+            # the default FlatGeobuf is written without spatial index,
+            # which keeps the memory bounded
+            fname = os.path.join(tmpdir, 'utm_tiles.fgb')
+            n_tiles = utm.export_tiles(fname, subgrid_ids='Z33N')
+            ds = ogr.Open(fname)
+            layer = ds.GetLayer(0)
+            assert layer.GetFeatureCount() == n_tiles
+            assert not layer.TestCapability(ogr.OLCFastSpatialFilter)
+            ds = None
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    def test_search_tiles_streamed_geometries(self):
+        """
+        Tests the tile searching with geometries streamed from a vector file.
+        """
+        grid = UTMGrid(500)
+        tmpdir = tempfile.mkdtemp()
+        fname = os.path.join(tmpdir, 'rois.geojson')
+
+        features = [(setup_test_geom_spitzbergen(), {'id': 1}),
+                    (setup_geom_kamchatka(), {'id': 2})]
+
+        try:
+            write_features(fname, features, [('id', 'int')], get_geog_spatial_ref(),
+                           format='geojson', geometry_type='POLYGON')
+
+            ids = [attributes['id'] for _, attributes in iter_geometries(fname)]
+            assert ids == [1, 2]
+
+            tiles = grid.search_tiles_in_roi(iter_geometries(fname), batch_size=1)
+            tiles_batch = grid.search_tiles_in_roi(iter_geometries(fname, attributes=False))
+        finally:
+            shutil.rmtree(tmpdir)
+
+        tiles_should = grid.search_tiles_in_roi(setup_test_geom_spitzbergen()) + \
+                       grid.search_tiles_in_roi(setup_geom_kamchatka())
+
+        assert sorted(tiles) == sorted(tiles_should)
+        assert sorted(tiles_batch) == sorted(tiles_should)
+
+
+    def test_coverland(self):
+        """
+        Tests the lookup of tiles covering land, derived from the land fractions.
+        """
+        # a private grid (not shared through UTMGrid.get_cached()),
+        # whose land information is replaced below
+        grid = UTMGrid(500)
+        tilesys = grid.Z33N.tilesys
+        landfraction = tilesys._landfraction
+
+        try:
+            # without land information the lookup fails
+            tilesys._landfraction = None
+            assert not tilesys.has_land_data
+            with self.assertRaises(ValueError):
+                tilesys.check_tile_covers_land('Z33N500M_E006N054T6')
+            with self.assertRaises(ValueError):
+                tilesys.list_tiles_covering_land()
+            assert tilesys.create_tile('E006N054T6').covers_land is None
+            with self.assertWarns(UserWarning):
+                tiles = grid.search_tiles_in_roi(bbox=[(14.0, 48.0), (16.0, 52.0)],
+                                                 subgrid_ids='Z33N', coverland=True)
+            assert sorted(tiles) == ['Z33N500M_E000N048T6', 'Z33N500M_E000N054T6']
+
+            fraction = np.zeros((16, 2), dtype=np.uint8)
+            fraction[9, 0] = 1
+            tilesys._landfraction = fraction
+
+            assert tilesys.has_land_data
+            assert tilesys.check_tile_covers_land('Z33N500M_E000N054T6')
+            assert not tilesys.check_tile_covers_land('Z33N500M_E006N054T6')
+            assert tilesys.create_tile('E000N054T6').covers_land
+            assert not tilesys.create_tile('E006N054T6').covers_land
+            assert tilesys.list_tiles_covering_land() == ['Z33N500M_E000N054T6']
+        finally:
+            tilesys._landfraction = landfraction
+
+
+    def test_land_fraction(self):
+        """
+        Tests the land fractions of tiles and the search with a minimum coverage.
+        """
+        # a private grid (not shared through UTMGrid.get_cached()),
+        # whose land information is replaced below
+        grid = UTMGrid(500)
+        tilesys = grid.Z33N.tilesys
+        landfraction = tilesys._landfraction
+        bbox = [(14.0, 48.0), (16.0, 52.0)]
+
+        try:
+            # without land information the lookup fails
+            tilesys._landfraction = None
+            with self.assertRaises(ValueError):
+                tilesys.get_tile_land_fraction('Z33N500M_E000N048T6')
+            assert tilesys.create_tile('E000N048T6').land_fraction is None
+            with self.assertRaises(ValueError):
+                grid.search_tiles_in_roi(bbox=bbox, subgrid_ids='Z33N',
+                                         min_coverage=0.5)
+
+            fraction = np.zeros((16, 2), dtype=np.uint8)
+            fraction[9, 0] = 255
+            fraction[9, 1] = 51
+            tilesys._landfraction = fraction
+
+            assert tilesys.get_tile_land_fraction('Z33N500M_E000N054T6') == 1.0
+            self.assertAlmostEqual(tilesys.create_tile('E006N054T6').land_fraction, 0.2)
+            assert tilesys.get_tile_land_fraction('Z33N500M_E000N048T6') == 0.0
+
+            tiles = grid.search_tiles_in_roi(bbox=bbox, subgrid_ids='Z33N')
+            assert sorted(tiles) == ['Z33N500M_E000N048T6', 'Z33N500M_E000N054T6']
+
+            tiles = grid.search_tiles_in_roi(bbox=bbox, subgrid_ids='Z33N',
+                                             min_coverage=0.5)
+            assert tiles == ['Z33N500M_E000N054T6']
+        finally:
+            tilesys._landfraction = landfraction
+
+
+    def test_compute_land_fractions(self):
+        """
+        Tests that the land fractions relate to the part of the tiles within the zone.
+        """
+        sr = osr.SpatialReference()
+        sr.ImportFromEPSG(32633)
+        # L-shaped zone: 2x2 tiles of 100km, the right column only half inside,
+        # the upper left tile only touching the zone
+        zone = ogr.CreateGeometryFromWkt(
+            'POLYGON ((0 0, 150000 0, 150000 200000, 100000 200000, '
+            '100000 100000, 0 100000, 0 0))')
+        zone.AssignSpatialReference(sr)
+        land = bbox2polygon([(50000, 0), (150000, 200000)], sr)
+        land_in_zone = zone.Intersection(land)
+        land_in_zone.AssignSpatialReference(sr)
+
+        fraction = compute_land_fractions(zone, [land_in_zone], 100000)
+
+        assert fraction.dtype == np.uint8
+        assert fraction.shape == (2, 2)
+        # half of a tile within the zone
+        assert fraction[0, 0] == 128
+        # the land covers the whole valid part of the tiles
+        assert fraction[0, 1] == 255
+        assert fraction[1, 1] == 255
+        # no valid part, although the land touches the tile
+        assert fraction[1, 0] == 0
+
+
+    def test_valid_tiles(self):
+        """
+        Tests the index of valid tiles and the rejection of phantom tiles.
+        """
+        grid = UTMGrid(500)
+        tilesys = grid.Z33N.tilesys
+
+        assert tilesys.check_tilename('Z33N500M_E000N054T6')
+        assert tilesys.check_tilename('E006N054T6')
+        assert tilesys.check_tile_is_valid('Z33N500M_E000N054T6')
+        assert tilesys.check_tile_is_valid('E006N054T6')
+        # tile far outside of the zone: a well-formed name, but not valid
+        assert tilesys.check_tilename('Z33N500M_E036N054T6')
+        assert not tilesys.check_tile_is_valid('Z33N500M_E036N054T6')
+        # malformed tilenames are rejected by both
+        with self.assertRaises(ValueError):
+            tilesys.check_tilename('Z33N500M_E001N054T6')
+        with self.assertRaises(ValueError):
+            tilesys.check_tile_is_valid('Z33N500M_E001N054T6')
+
+        llx, lly = tilesys.identify_tiles_in_subgrid()
+        assert np.all(tilesys.check_lowerleft_is_valid(llx, lly))
+        assert tilesys.valid_tiles.sum() == len(llx)
+
+        # the index is taken from the cache by a new grid
+        assert any(f.startswith('validtiles_Z33N_')
+                   for f in os.listdir(cache.get_version_dir()))
+        nptest.assert_array_equal(UTMGrid(500).Z33N.tilesys.valid_tiles,
+                                  tilesys.valid_tiles)
+
+
+    def test_zone_mask(self):
+        """
+        Tests the masks of the tiles' pixels inside the zone.
+        """
+        grid = UTMGrid(500)
+        tile = grid.Z33N.tilesys.create_tile('Z33N500M_E000N054T6')
+
+        mask = tile.get_zone_mask(decimation=10)
+        assert mask.shape == (120, 120)
+        # the zone's western border crosses the tile
+        assert not mask[:, 0].any()
+        assert mask[:, 100].all()
+
+        runs = tile.get_zone_mask(decimation=10, rle=True)
+        nptest.assert_array_equal(rle_decode(runs, mask.shape), mask)
+        nptest.assert_array_equal(tile.get_zone_mask(decimation=10), mask)
+
+        full_mask = tile.get_zone_mask()
+        assert full_mask.shape == (1200, 1200)
+        self.assertAlmostEqual(full_mask.mean(), mask.mean(), places=2)
+
+
+    def test_pickle(self):
+        """
+        Tests pickling of grids, subgrids, tiling systems and tiles.
+        """
+        grid = UTMGrid.get_cached(500)
+        assert UTMGrid.get_cached(500) is grid
+
+        assert pickle.loads(pickle.dumps(grid)) is grid
+        assert pickle.loads(pickle.dumps(grid.Z33N)) is grid.Z33N
+        assert pickle.loads(pickle.dumps(grid.Z33N.tilesys)) is grid.Z33N.tilesys
+
+        tile = UTMGrid(500).create_tile('Z33N500M_E000N054T6')
+        tile.active_subset_px = (10, 20, 30, 40)
+        tile_unpickled = pickle.loads(pickle.dumps(tile))
+        assert tile_unpickled.name == tile.name
+        assert tile_unpickled.active_subset_px == (10, 20, 30, 40)
+        assert tile_unpickled.geotransform() == tile.geotransform()
+        assert tile_unpickled.tilesys is grid.Z33N.tilesys
+
+        # a grid with a different definition is rebuilt
+        grid_t1 = pickle.loads(pickle.dumps(UTMGrid(10)))
+        assert grid_t1.core.sampling == 10
+        assert grid_t1.core.tiletype == 'T1'
+
+        with self.assertRaises(AttributeError):
+            grid.not_an_attribute
+
+
+    def test_grid_cache(self):
+        """
+        Tests that only get_cached() shares grids, and that tiling systems
+        work on the grid holding them.
+        """
+        grid = UTMGrid(500)
+        assert UTMGrid.get_cached(500) is not grid
+        assert grid.Z33N.grid is grid
+        assert grid.Z33N.tilesys.grid is grid
+
+        _, neighbours = grid.Z33N.tilesys.get_neighbours_batch([0], [5400000])
+        assert neighbours.grid is grid
+        tileset = grid.Z33N.tilesys.create_tileset_overlapping_xybbox(
+            [0, 5400000, 600000, 6000000])
+        assert tileset.grid is grid
+
+        cached = UTMGrid.get_cached(500)
+        UTMGrid.clear_cached()
+        assert UTMGrid.get_cached(500) is not cached
+
+
+    def test_core_attributes(self):
+        """
+        Tests the read-only shortcuts to the core properties and the slots of tiles.
+        """
+        grid = UTMGrid(500)
+        tile = grid.create_tile('Z33N500M_E000N054T6')
+
+        assert grid.tag == 'UTM'
+        assert grid.Z33N.tag == 'Z33N'
+        assert grid.Z33N.tile_xsize_m == 600000
+        assert grid.Z33N.tilesys.tiletype == 'T6'
+        assert tile.sampling == 500
+
+        with self.assertRaises(AttributeError):
+            tile.sampling = 10
+        assert not hasattr(tile, '__dict__')
+
+        # the geographic extent is computed on first use
+        assert tile._polygon_geog is None
+        lonmin, latmin, lonmax, latmax = tile.bbox_geog
+        assert tile._polygon_geog is not None
+        assert lonmin < 15.0 < lonmax
+
+
+    def test_tileset(self):
+        """
+        Tests the columnar TileSet.
+        """
+        grid = UTMGrid(500)
+        tilenames = ['Z33N500M_E000N054T6', 'Z33N500M_E006N054T6',
+                     'Z34N500M_E000N054T6']
+        tileset = TileSet.from_tilenames(grid, tilenames)
+
+        assert len(tileset) == 3
+        assert tileset.tilenames == tilenames
+        assert list(tileset.subgrid_ids) == ['Z33N', 'Z33N', 'Z34N']
+        assert 'Z34N500M_E000N054T6' in tileset
+        assert 'Z34N500M_E006N054T6' not in tileset
+
+        tile = tileset[1]
+        assert tile.name == 'Z33N500M_E006N054T6'
+        nptest.assert_array_equal(tileset.geotransforms()[1], tile.geotransform())
+
+        other = TileSet.from_tilenames(grid, ['Z34N500M_E000N054T6',
+                                              'Z35N500M_E000N054T6'])
+        assert sorted((tileset | other).tilenames) == sorted(tilenames + ['Z35N500M_E000N054T6'])
+        assert (tileset & other).tilenames == ['Z34N500M_E000N054T6']
+        assert (tileset - other).tilenames == tilenames[:2]
+        assert tileset.filter_subgrids('Z33N').tilenames == tilenames[:2]
+        assert tileset.sort().tilenames == tilenames
+
+        with self.assertRaises(ValueError):
+            TileSet.from_tilenames(grid, ['Z33N500M_E001N054T6'])
+
+        # same tiles and subsets as create_tiles_overlapping_xybbox()
+        bbox = [500100, 5300000, 700500, 6100000]
+        tilesys = grid.Z33N.tilesys
+        tiles = tilesys.create_tiles_overlapping_xybbox(bbox)
+        tiles_set = tilesys.create_tileset_overlapping_xybbox(bbox)
+        assert tiles_set.tilenames == [t.name for t in tiles.flatten()]
+        nptest.assert_array_equal(tiles_set.subsets,
+                                  [t.active_subset_px for t in tiles.flatten()])
+        assert tiles_set[0].active_subset_px == tiles.flatten()[0].active_subset_px
+
+        roi_tiles = grid.search_tiles_in_roi(bbox=[(14.0, 48.0), (16.0, 52.0)])
+        roi_tileset = grid.search_tiles_in_roi(bbox=[(14.0, 48.0), (16.0, 52.0)],
+                                               as_tileset=True)
+        assert sorted(roi_tileset.tilenames) == sorted(roi_tiles)
+
+
+    def test_tileset_footprints(self):
+        """
+        Tests the set operations of TileSets across samplings.
+        """
+        grid_t6 = UTMGrid(500)
+        grid_t1 = UTMGrid(10)
+        coarse = TileSet.from_tilenames(grid_t6, ['Z33N500M_E000N054T6'])
+        fine = TileSet.from_tilenames(grid_t1, ['Z33N010M_E001N055T1',
+                                                'Z33N010M_E007N055T1'])
+
+        assert len(coarse.convert(grid_t1)) == 36
+        assert coarse.convert(grid_t1).convert(grid_t6).tilenames == coarse.tilenames
+        assert fine.convert(grid_t6).tilenames == ['Z33N500M_E000N054T6',
+                                                   'Z33N500M_E006N054T6']
+
+        assert (coarse & fine).tilenames == ['Z33N010M_E001N055T1']
+        assert len(coarse - fine) == 35
+        assert 'Z33N010M_E001N055T1' not in (coarse - fine)
+        assert len(coarse | fine) == 37
+        assert len(fine - coarse) == 1
+
+        # footprint IDs do not depend on the sampling
+        same = TileSet.from_tilenames(UTMGrid(250), ['Z33N250M_E000N054T6'])
+        nptest.assert_array_equal(same.footprint_ids, coarse.footprint_ids)
+
+
+    def test_tile_ids(self):
+        """
+        Tests the conversion between tilenames and tile IDs.
+        """
+        grid = UTMGrid(500)
+        tilenames = ['Z33N010M_E004N052T1', 'Z33N500M_E000N054T6',
+                     'Z01S1K0M_E006N012T6', 'Z00Z020M_E021N030T3']
+        ids = grid.tilenames2ids(tilenames)
+
+        assert ids.dtype == np.int64
+        assert len(np.unique(ids)) == 4
+        assert grid.ids2tilenames(ids) == tilenames
+        assert grid.ids2tilenames(grid.tilenames2ids(tilenames[1:2])) == tilenames[1:2]
+
+        # the tile IDs extend the footprint IDs by the sampling
+        tiles = TileSet.from_tilenames(grid, tilenames[1:2])
+        nptest.assert_array_equal(TileSet.from_footprint_ids(grid, ids[1:2]).footprint_ids,
+                                  tiles.footprint_ids)
+        fine = TileSet.from_footprint_ids(UTMGrid(10), ids[0:1])
+        assert fine.tilenames == tilenames[0:1]
+
+        with self.assertRaises(ValueError):
+            grid.tilenames2ids(['Z33N010M_E004N052T6'])
+        with self.assertRaises(ValueError):
+            grid.tilenames2ids(['Z33N500M_E001N054T6'])
+        with self.assertRaises(ValueError):
+            grid.ids2tilenames([0])
+
+
+    def test_tileset_curve_order(self):
+        """
+        Tests the ordering of tiles along space-filling curves,
+        and the partitioning into chunks.
+        """
+        cols, rows = [a.ravel() for a in np.meshgrid(np.arange(8), np.arange(8))]
+        for curve in ['hilbert', 'morton']:
+            order = get_curve_order(np.zeros(64), cols, rows, curve=curve)
+            assert sorted(order) == list(range(64))
+        # successive cells of the Hilbert curve are neighbours
+        order = get_curve_order(np.zeros(64), cols, rows, curve='hilbert')
+        steps = np.abs(np.diff(cols[order])) + np.abs(np.diff(rows[order]))
+        assert np.all(steps == 1)
+
+        grid = UTMGrid(10)
+        tileset = grid.Z33N.tilesys.create_tileset_overlapping_xybbox(
+            [0, 5000000, 799999, 5799999])
+        ordered = tileset.sort(curve='hilbert')
+        assert sorted(ordered.tilenames) == sorted(tileset.tilenames)
+
+        chunks = tileset.partition(4)
+        assert len(chunks) == 4
+        assert sum(len(c) for c in chunks) == len(tileset)
+        assert [len(c) for c in chunks] == [16, 16, 16, 16]
+        # each chunk of the 8x8 tiles is a compact 4x4 block
+        for chunk in chunks:
+            assert np.ptp(chunk.llx) == 300000
+            assert np.ptp(chunk.lly) == 300000
+
+        tiles = grid.search_tiles_in_roi(bbox=[(14.0, 48.0), (16.0, 50.0)],
+                                         sort='hilbert')
+        assert tiles == grid.search_tiles_in_roi(bbox=[(14.0, 48.0), (16.0, 50.0)],
+                                                 sort='hilbert')
+
+
+    def test_get_neighbours(self):
+        """
+        Tests the neighbours of tiles, within the zone and across zones.
+        """
+        grid = UTMGrid(500)
+        tilesys = grid.Z33N.tilesys
+
+        neighbours = tilesys.get_neighbours('Z33N500M_E006N054T6')
+        assert 'Z33N500M_E000N054T6' in neighbours
+        assert 'Z33N500M_E006N048T6' in neighbours
+        assert 'Z33N500M_E006N054T6' not in neighbours
+
+        # the western neighbours are in zone 32
+        neighbours = tilesys.get_neighbours('Z33N500M_E000N054T6')
+        assert 'Z33N500M_E006N054T6' in neighbours
+        assert any(n.startswith('Z32N') for n in neighbours)
+        assert not any(n.startswith('Z34N') for n in neighbours)
+        assert len(neighbours) == len(set(neighbours))
+        # the neighbours in other zones touch or overlap the tile
+        polygon = tilesys.create_tile('E000N054T6').polygon_geog
+        for name in neighbours:
+            if name.startswith('Z32N'):
+                assert grid.create_tile(name).polygon_geog.Intersects(polygon)
+
+        index, tileset = tilesys.get_neighbours_batch([0, 600000], [5400000, 5400000])
+        assert tileset[index == 0].tilenames == neighbours
+        assert tileset[index == 1].tilenames == tilesys.get_neighbours('Z33N500M_E006N054T6')
+
+
+    def test_plan_halo_windows(self):
+        """
+        Tests the planning of windows with a halo.
+        """
+        grid = UTMGrid(500)
+        tilesys = grid.Z33N.tilesys
+        plans = tilesys.plan_halo_windows(10, tilenames=['Z33N500M_E006N054T6'])
+        assert len(plans) == 1
+        plan = plans[0]
+        assert plan['tilename'] == 'Z33N500M_E006N054T6'
+        assert plan['shape'] == (1220, 1220)
+        assert plan['geotransform'] == [595000, 500, 0, 6005000, 0, -500]
+        # the tile and its neighbours within the zone
+        reads = dict((name, (src, dst)) for name, src, dst in plan['reads'])
+        for name in ['Z33N500M_E000N060T6', 'Z33N500M_E006N060T6',
+                     'Z33N500M_E000N054T6', 'Z33N500M_E000N048T6',
+                     'Z33N500M_E006N048T6']:
+            assert name in reads
+        src, dst = reads['Z33N500M_E006N054T6']
+        assert src == (slice(0, 1200), slice(0, 1200))
+        assert dst == (slice(10, 1210), slice(10, 1210))
+        src, dst = reads['Z33N500M_E000N060T6']
+        assert src == (slice(1190, 1200), slice(1190, 1200))
+        assert dst == (slice(0, 10), slice(0, 10))
+
+        # the reads do not overlap, and cover the tile and the western halo
+        coverage = np.zeros(plan['shape'], dtype=int)
+        for _, src, dst in plan['reads']:
+            coverage[dst] += 1
+        assert coverage.max() == 1
+        assert np.all(coverage[:, :1210] == 1)
+
+        # blocks clipped to a bounding box
+        plans = tilesys.plan_halo_windows(2, bbox=[601000, 5401000, 602000, 5402000])
+        assert len(plans) == 1
+        assert plans[0]['subset'] == (2, 2, 4, 4)
+        assert plans[0]['shape'] == (6, 6)
+        assert len(plans[0]['reads']) == 1
+
+
+    def test_search_tiles_windows(self):
+        """
+        Tests the pixel windows of the tiles covering a ROI.
+        """
+        grid = UTMGrid(500)
+        bbox = [(15.0, 50.0), (15.5, 50.5)]
+        windows = grid.search_tiles_in_roi(bbox=bbox, return_windows=True)
+        assert sorted(windows.keys()) == sorted(grid.search_tiles_in_roi(bbox=bbox))
+
+        for name, (xmin, ymin, xmax, ymax) in windows.items():
+            # ~36km x ~56km at 500m
+            assert 65 <= xmax - xmin <= 80
+            assert 105 <= ymax - ymin <= 118
+            tile = grid.create_tile(name)
+            tile.active_subset_px = (xmin, ymin, xmax, ymax)
+
+        rasterized = grid.search_tiles_in_roi(bbox=bbox, return_windows=True,
+                                              rasterize=True)
+        for name, window in rasterized.items():
+            assert window[0] >= windows[name][0]
+            assert window[1] >= windows[name][1]
+            assert window[2] <= windows[name][2]
+            assert window[3] <= windows[name][3]
+
+        tileset = grid.search_tiles_in_roi(bbox=bbox, return_windows=True,
+                                           as_tileset=True)
+        for name, subset in zip(tileset.tilenames, tileset.subsets):
+            assert tuple(subset) == windows[name]
+
+        with self.assertRaises(ValueError):
+            grid.search_tiles_in_roi([setup_test_geom_spitzbergen()],
+                                     return_windows=True)
+
+
+    def test_lonlat2zone(self):
+        """
+        Tests the arithmetic zone lookup, including the zone exceptions.
+        """
+        utm = UTMGrid(500)
+        lon = np.array([14.1, 15.1, 3.6, 5.0, 10.0, 25.0, -30.0, 30.0, 179.99])
+        lat = np.array([48.2, -45.3, 61.4, 75.0, 78.0, 80.0, 87.0, -85.0, 10.0])
+        should = ['Z33N', 'Z33S', 'Z32N', 'Z31N', 'Z33N', 'Z35N', 'Z00Y', 'Z00B', 'Z60N']
+        nptest.assert_array_equal(utm.lonlat2zone(lon, lat), should)
+        nptest.assert_array_equal(utm.get_latitude_bands(lon, lat),
+                                  ['U', 'G', 'V', 'X', 'X', 'X', 'Y', 'B', 'P'])
+
+
+    def test_lonlat2zone_against_polygons(self):
+        """
+        Tests the arithmetic zone lookup against the zone polygons, at the
+        latitude limits of the zone exceptions and of the polar zones, and at
+        the edges of the Svalbard zones 31X ... 37X.
+        """
+        utm = UTMGrid(500)
+        lons, lats = [], []
+        for lat in [56.0, 64.0, 72.0, 84.0, -80.0]:
+            for dlat in [-1e-6, 0.0, 1e-6]:
+                lon = np.arange(-178.5, 180.0, 3.0)
+                lons.append(lon)
+                lats.append(np.full_like(lon, lat + dlat))
+        for lon in [0.0, 3.0, 9.0, 12.0, 21.0, 33.0, 42.0]:
+            for dlon in [-1e-6, 0.0, 1e-6]:
+                lat = np.array([60.0, 72.5, 78.0, 83.5])
+                lons.append(np.full_like(lat, lon + dlon))
+                lats.append(lat)
+        lons, lats = np.concatenate(lons), np.concatenate(lats)
+
+        zones = utm.lonlat2zone(lons, lats)
+        geog_sr = get_geog_spatial_ref()
+        for lon, lat, zone in zip(lons, lats, zones):
+            point = ogr.Geometry(ogr.wkbPoint)
+            point.AddPoint_2D(float(lon), float(lat))
+            point.AssignSpatialReference(geog_sr)
+            located = utm.locate_geometry_in_subgrids(point)
+            # points on the edge between zones are located in both
+            assert zone in located, (lon, lat, zone, located)
+            if len(located) == 1:
+                assert located == [zone]
+
+        # scalar input gives 0-d arrays, as the former per-point lookup
+        sgrid_id, x, y = utm.lonlat2xy(14.1, 48.2)
+        for value in (sgrid_id, x, y):
+            assert isinstance(value, np.ndarray) and value.ndim == 0
+        assert sgrid_id.dtype.kind == 'U'
+
+
+    def test_lonlat2MGRS(self):
+        """
+        Tests the conversion of lon-lat coordinates to MGRS strings.
+        """
+        utm = UTMGrid(500)
+        assert utm.lonlat2MGRS(2.2945, 48.8584) == '31UDQ4825211954'
+        assert utm.lonlat2MGRS(2.2945, 48.8584, precision=2) == '31UDQ4811'
+        assert utm.lonlat2MGRS(2.2945, 48.8584, precision=0) == '31UDQ'
+
+        lon = np.array([15.1, 3.564943, 90.0, -30.0])
+        lat = np.array([-45.3, 61.405307, -86.45, 87.0])
+        nptest.assert_array_equal(utm.lonlat2MGRS(lon, lat),
+                                  ['33GWK0784083717', '32VKP1002920022',
+                                   'BFN9425500000', 'YYE3342711488'])
+
+
+    @unittest.skipIf(mgrs is None, 'the mgrs package is not installed')
+    def test_lonlat2MGRS_against_mgrs(self):
+        """
+        Cross-validates the MGRS strings against the mgrs package.
+        """
+        utm = UTMGrid(500)
+        rng = np.random.RandomState(42)
+        lon = rng.uniform(-179.9, 179.9, 500)
+        lat = rng.uniform(-79.9, 83.9, 500)
+
+        converter = mgrs.MGRS()
+        should = [converter.toMGRS(y, x, MGRSPrecision=5) for x, y in zip(lon, lat)]
+        nptest.assert_array_equal(utm.lonlat2MGRS(lon, lat), should)
+
+
+    def test_tilenames2lonlat(self):
+        """
+        Tests the lon-lat anchors of tilenames.
+        """
+        utm = UTMGrid(500)
+        tilenames = ['Z33N500M_E000N054T6', 'Z33S010M_E004N052T1']
+        lon, lat = utm.tilenames2lonlat(tilenames, anchor='ll')
+        lon_should, lat_should = utm.Z33N.xy2lonlat(0, 5400000)
+        nptest.assert_allclose([lon[0], lat[0]], [lon_should, lat_should])
+        lon_should, lat_should = utm.Z33S.xy2lonlat(400000, 5200000)
+        nptest.assert_allclose([lon[1], lat[1]], [lon_should, lat_should])
+
+        lon, lat = utm.tilenames2lonlat(tilenames, anchor='center')
+        lon_should, lat_should = utm.Z33N.xy2lonlat(300000, 5700000)
+        nptest.assert_allclose([lon[0], lat[0]], [lon_should, lat_should])
+
+        with self.assertRaises(ValueError):
+            utm.tilenames2lonlat(tilenames, anchor='top')
+
+
+    def test_MGRS2lonlat(self):
+        """
+        Tests the conversion of MGRS strings to lon-lat coordinates.
+        """
+        utm = UTMGrid(500)
+        lon, lat = utm.MGRS2lonlat('31UDQ4825211954', anchor='ll')
+        nptest.assert_allclose([lon, lat], [2.2945, 48.8584], atol=0.00002)
+        lon, lat = utm.MGRS2lonlat('31U DQ 48 11')
+        nptest.assert_allclose([lon, lat], [2.2945, 48.8584], atol=0.01)
+
+        lon_should = np.array([15.1, 3.564943, 90.0, -30.0])
+        lat_should = np.array([-45.3, 61.405307, -86.45, 87.0])
+        lon, lat = utm.MGRS2lonlat(utm.lonlat2MGRS(lon_should, lat_should))
+        nptest.assert_allclose(lon, lon_should, atol=0.0001)
+        nptest.assert_allclose(lat, lat_should, atol=0.0001)
+
+        with self.assertRaises(ValueError):
+            utm.MGRS2lonlat('31UIQ4825211954')
+
+
+    def test_xy2lonlat_grid(self):
+        """
+        Tests the grid-level conversion of projected coordinates
+        of different zones back to lon-lat.
+        """
+        utm = UTMGrid(1000)
+        lon = np.array([[14.1, -70.3, 120.0], [14.5, 5.0, 179.9]])
+        lat = np.array([[48.2, -33.4, 10.0], [47.1, 60.5, -45.0]])
+
+        sgrid_ids, x, y = utm.lonlat2xy(lon, lat)
+        lon_back, lat_back = utm.xy2lonlat(sgrid_ids, x, y)
+        self.assertEqual(lon_back.shape, lon.shape)
+        nptest.assert_allclose(lon_back, lon, atol=1e-7)
+        nptest.assert_allclose(lat_back, lat, atol=1e-7)
+
+        # one subgrid ID for all coordinates
+        lon_z33, lat_z33 = utm.xy2lonlat('Z33N', x[0, 0], y[0, 0])
+        nptest.assert_allclose([lon_z33, lat_z33], [14.1, 48.2], atol=1e-7)
+
+        with self.assertRaises(ValueError):
+            utm.xy2lonlat(['Z33N', 'Z99X'], [500000, 500000], [5300000, 5300000])
+
+
+    def test_transfer_xy(self):
+        """
+        Tests the direct transfer of coordinates between zones,
+        and the identification of the target tiles and pixels.
+        """
+        utm = UTMGrid(10)
+        x = np.array([800000.0, 810000.0, 795432.1])
+        y = np.array([5300000.0, 5310000.0, 5401234.5])
+
+        # reference via lon-lat
+        lon, lat = utm.xy2lonlat('Z32N', x, y)
+        _, x_should, y_should = utm.lonlat2xy(lon, lat, subgrid='Z33N')
+
+        x_is, y_is = utm.transfer_xy('Z32N', 'Z33N', x, y)
+        nptest.assert_allclose(x_is, x_should, atol=1e-6)
+        nptest.assert_allclose(y_is, y_should, atol=1e-6)
+
+        # no transformation within a zone
+        x_same, y_same = utm.transfer_xy('Z33N', 'Z33N', x, y)
+        nptest.assert_array_equal(x_same, x)
+        nptest.assert_array_equal(y_same, y)
+
+        tilenames, i, j = utm.transfer_xy2ij_in_tile('Z32N', 'Z33N', x, y)
+        for k in range(len(x)):
+            tilename_should, i_should, j_should = \
+                utm.Z33N.tilesys.xy2ij_in_tile(x_should[k], y_should[k])
+            self.assertEqual(tilenames[k], tilename_should)
+            self.assertEqual(i[k], i_should)
+            self.assertEqual(j[k], j_should)
+
+        with self.assertRaises(ValueError):
+            utm.transfer_xy('Z32N', 'Z99X', x, y)
+
+
+    def test_warp_lut(self):
+        """
+        Tests the warping of a tile onto a tile of the neighbouring zone
+        with the cached lookup table.
+        """
+        grid = UTMGrid(100)
+        src = grid.create_tile('Z32N100M_E007N053T1')
+        dst = grid.create_tile('Z33N100M_E002N053T1')
+
+        lut = src.get_warp_lut(dst, decimation=16)
+        assert lut.shape == (2, 64, 64)
+        assert len([f for f in os.listdir(cache.get_version_dir())
+                    if f.startswith('warplut_')]) == 1
+        # the second call reads the memory-mapped LUT
+        assert isinstance(src.get_warp_lut(dst, decimation=16), np.memmap)
+
+        # interpolated indices against the exact transfer of the pixel centres
+        i, j, valid = src.get_warp_indices(dst, rows=slice(500, 501))
+        x, y = dst.ij2xy(np.arange(dst.x_size_px), 500)
+        x, y = grid.transfer_xy('Z33N', 'Z32N', x, y)
+        i_should = np.floor((x - src.llx) / 100.0)
+        j_should = np.floor((src.lly + 100000 - y) / 100.0)
+        assert np.mean(i[0] == i_should) > 0.99
+        assert np.mean(j[0] == j_should) > 0.99
+        assert 0 < valid.sum() < dst.x_size_px
+
+        data = np.arange(src.y_size_px * src.x_size_px).reshape(src.y_size_px,
+                                                                src.x_size_px)
+        warped = src.warp(data, dst, nodata=-1, block_rows=300)
+        assert warped.shape == (dst.y_size_px, dst.x_size_px)
+        nptest.assert_array_equal(warped[500][valid[0]], data[j[0][valid[0]],
+                                                              i[0][valid[0]]])
+        assert np.all(warped[500][~valid[0]] == -1)
+
+        # a LUT larger than the cache bound is not cached, but returned
+        with mock.patch.dict(os.environ, {'PYTILEPROJ_CACHE_SIZE_MB': '0.01'}):
+            lut = src.get_warp_lut(dst, decimation=4)
+            assert lut.shape == (2, 251, 251)
+            assert not isinstance(lut, np.memmap)
+            assert np.mean(src.warp(data, dst, decimation=4, nodata=-1)[500]
+                           == warped[500]) > 0.99
+
+
+    def test_disk_cache(self):
+        """
+        Tests the reuse of the zone polygons, tile footprints and ROI search
+        results from the disk cache, and its eviction.
+        """
+        grid = UTMGrid(500)
+        fnames = os.listdir(cache.get_version_dir())
+        assert any(f.startswith('subgrid_Z33N_') for f in fnames)
+
+        # a new grid takes the zone polygons from the cache
+        grid_cached = UTMGrid(500)
+        assert grid_cached.Z33N.polygon_proj.Equals(grid.Z33N.polygon_proj)
+        assert grid_cached.Z33N.bbox_proj == grid.Z33N.bbox_proj
+        assert grid_cached.Z33N.polygon_proj.GetSpatialReference().IsSame(
+            grid.Z33N.core.projection.osr_spref)
+
+        # footprints of many tiles are cached
+        tilesys = grid.Z33N.tilesys
+        llx, lly = np.meshgrid(np.arange(8) * 100000, np.arange(50, 58) * 100000)
+        llx, lly = llx.ravel(), lly.ravel()
+        (lon, lat), bbox = tilesys.get_tiles_footprint_geog(llx, lly)
+        fnames = os.listdir(cache.get_version_dir())
+        assert any(f.startswith('footprints_Z33N_') for f in fnames)
+        (lon_cached, lat_cached), bbox_cached = \
+            grid_cached.Z33N.tilesys.get_tiles_footprint_geog(llx, lly)
+        nptest.assert_array_equal(lon_cached, lon)
+        nptest.assert_array_equal(lat_cached, lat)
+        nptest.assert_array_equal(bbox_cached, bbox)
+
+        bbox_roi = [(14.0, 47.0), (16.0, 48.0)]
+        tiles = grid.search_tiles_in_roi(bbox=bbox_roi, use_cache=True)
+        fnames = os.listdir(cache.get_version_dir())
+        assert any(f.startswith('roi_UTM500_') for f in fnames)
+        assert sorted(grid_cached.search_tiles_in_roi(bbox=bbox_roi, use_cache=True)) \
+            == sorted(tiles)
+
+        # the cache is bounded by evicting the least recently used arrays,
+        # foreign files in the cache directory are left untouched
+        foreign = os.path.join(cache.get_cache_dir(), 'foreign.npy')
+        np.save(foreign, np.zeros(10))
+        n_arrays = len(os.listdir(cache.get_version_dir()))
+        assert cache.evict(max_size=0) == n_arrays
+        assert len(os.listdir(cache.get_version_dir())) == 0
+        assert os.path.isfile(foreign)
+        os.remove(foreign)
+
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file